@@ -3,9 +3,9 @@
 
 这个应用程序包含两个主要的类：`Worker` 和 `CtfileUrlDecoder`。
 
-`Worker` 类是一个QThread的子类，它用于在一个单独的线程中运行代码以避免阻塞主线程。`Worker` 类中的 `run` 方法是线程的入口点，它循环处理每个链接，如果遇到任何错误，会打印错误日志。此外，这个类还包含一些方法用于处理链接，包括筛选正确的链接，获取文件信息，请求下载链接，并处理下载结果。
+`Worker` 类是一个QThread的子类，它用于在一个单独的线程中运行代码以避免阻塞主线程。`Worker` 类中的 `run` 方法是线程的入口点，它通过 `LinkResolver` 解析引擎并发处理链接，并按输入顺序处理下载结果。打开的大文件不会载入文本框，而是由 `Worker` 逐行读取后交给解析引擎，如果遇到任何错误，会打印错误日志。
 
-`CtfileUrlDecoder` 类是QMainWindow的子类，它是应用程序的主窗口。在这个类中，我们创建了一个用户界面，包括文本编辑器，动作，菜单栏，工具栏和状态栏。此外，这个类还定义了一些方法用于开始和停止Worker线程，更新进度条和标签，以及更新输出。
+`CtfileUrlDecoder` 类是QMainWindow的子类，它是应用程序的主窗口。在这个类中，我们创建了一个用户界面，包括文本编辑器，结果表格，动作，菜单栏，工具栏和状态栏。此外，这个类还定义了一些方法用于开始和停止Worker线程，更新进度条和标签，以及把结果追加到结果表格。
 
 最后，我们在 `main` 函数中创建了一个 `CtfileUrlDecoder` 实例并启动了Qt的事件循环。
 
@@ -16,9 +16,11 @@
 
 import logging
 import sys
+import threading
+import time
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QIcon, QTextOption, QTextCharFormat, QBrush, QTextCursor
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon, QTextOption
 from PyQt5.QtWidgets import (QMainWindow, QAction, QApplication, QLabel, QProgressBar,
                              QSplitter, QVBoxLayout, QWidget, QMessageBox)
 
@@ -33,127 +35,118 @@ logging_config(console_output=True, log_level='DEBUG')
 # noinspection PyMethodMayBeStatic
 class Worker(QThread):
     """
-    Worker类继承自QThread，主要用于在后台处理任务，避免阻塞主线程。该类中定义了一系列的函数来处理城通网盘链接，包括链接的过滤，获取文件信息，请求下载链接和处理下载结果等。
+    Worker类继承自QThread，主要用于在后台处理任务，避免阻塞主线程。该类使用链接解析引擎并发处理城通网盘链接，并按输入顺序处理下载结果。
 
     :param links: 待处理的城通网盘链接列表。
     :param user_token: 用户的token。
     :param user_delay: 用户设置的延迟。
+    :param user_concurrency: 用户设置的并发数。
+    :param recheck: 是否忽略失效链接缓存。
+    :param user_proxies: 用户设置的出口代理。
+    :param input_file: 逐行读取的大文件路径。
+    :param resume: 是否继续上次中断的任务。
+    :param profiler: 性能分析器。
+    :param retry: 是否为重试任务。
     """
 
-    signal = pyqtSignal(str)
+    total = pyqtSignal(int)
 
-    def __init__(self, links, user_token, user_delay):
+    def __init__(self, links, user_token, user_delay, user_concurrency, recheck=False, user_proxies='', input_file=None, resume=False, profiler=None,
+                 retry=False):
         """
-        Worker类的初始化函数，定义了要处理的城通网盘链接，用户token和延迟。
+        Worker类的初始化函数，定义了要处理的城通网盘链接，用户token、延迟和并发数。
 
         :param links: 待处理的城通网盘链接列表。
         :param user_token: 用户的token。
         :param user_delay: 用户设置的延迟。
+        :param user_concurrency: 用户设置的并发数。
+        :param recheck: 是否忽略失效链接缓存，强制重新请求已知的失效链接。
+        :param user_proxies: 用户设置的出口代理，多个代理用英文逗号分隔。
+        :param input_file: 逐行读取的大文件路径。设置后忽略 links 参数，读取完毕时通过 total 信号发出实际链接数。
+        :param resume: 是否继续上次中断的任务，为 True 时跳过任务日志中已完成的链接，否则清空任务日志。
+        :param profiler: 性能分析器，设置后在线程开始时分析该线程。
+        :param retry: 是否为重试任务，为 True 时结果追加到任务日志末尾，不清空上次任务的记录。
         """
 
         super().__init__()
         self.links = links
         self.user_token = user_token
         self.user_delay = user_delay
+        self.user_concurrency = user_concurrency
+        self.recheck = recheck
+        self.user_proxies = user_proxies
+        self.input_file = input_file
+        self.resume = resume
+        self.profiler = profiler
+        self.retry = retry
         self.running = True
+        self.results = []
+        self.results_lock = threading.Lock()
 
     def run(self):
         """
-        Worker线程的主函数。在这个函数中进行链接的处理，包括获取文件信息，请求下载链接和处理结果。
+        Worker线程的主函数。在这个函数中使用解析引擎并发处理链接，并按输入顺序处理结果。解析前会先查询磁盘上的下载链接和失效链接缓存，每条链接的结果都会追加到任务日志。
 
         """
 
-        logger.debug(f'输入列表：{self.links}\n输入令牌：{self.user_token}\n输入延迟：{self.user_delay}')
+        if self.profiler:
+            self.profiler.profile_current_thread()
+        logger.debug(f'输入列表：{self.input_file or self.links}\n输入令牌：{self.user_token}\n输入延迟：{self.user_delay}\n输入并发：{self.user_concurrency}')
         try:
-            for link in self.links:
-                if not self.running:
-                    break
-
-                self.process_link(link)
+            cache = LinkCache(CACHE_PATH)
+            journal = JobJournal(JOURNAL_PATH, self.resume, self.retry)
+            try:
+                resolver = LinkResolver(self.user_token, self.user_delay, int(self.user_concurrency), cache, self.recheck, self.user_proxies, journal)
+                links = self.count_links(iter_links(self.input_file)) if self.input_file else self.links
+                for link, result in resolver.resolve_links(links, lambda: self.running):
+                    self.handle_download_result(result, link)
+            finally:
+                journal.close()
+                cache.close()
 
         except Exception as e:
             logger.error(e)
 
-    def process_link(self, link):
-        """
-        处理链接的函数。首先进行链接的过滤，然后获取文件信息，请求下载链接并处理下载结果。
-
-        :param link: 需要处理的城通网盘链接。
-        """
-
-        link_ok = self.filter_correct_link(link)
-        if not link_ok:
-            self.signal.emit(f'不支持的链接：{link}')
-            return
-
-        file_name, passwd = self.get_file_info(link_ok)
-
-        result = self.request_download_link(file_name, passwd)
-        self.handle_download_result(result, link)
-
-    def filter_correct_link(self, link):
-        """
-        过滤链接的函数。使用特定的规则来判断城通网盘链接是否可以处理。
-
-        :param link: 需要过滤的城通网盘链接。
-        :return: 如果链接可以处理，返回处理后的链接，否则返回None。
-        """
-
-        link_ok = filter_correct_link(link)
-        logger.debug(f'筛选链接：{link}，结果：{link_ok}')
-        return link_ok
-
-    def get_file_info(self, link_ok):
+    def count_links(self, links):
         """
-        获取文件信息的函数。使用城通网盘链接来获取对应文件的信息。
+        逐个传递链接，全部读取完毕后通过 total 信号发出链接总数。
 
-        :param link_ok: 已过滤的城通网盘链接。
-        :return: 返回获取的文件信息，包括文件名和密码。
+        :param links: 链接迭代器。
+        :return: 原样传递的链接。
         """
 
-        file_name, passwd = get_file_info(link_ok)
-        logger.debug(f'处理链接：{link_ok}，得到文件名：{file_name}，得到密码：{passwd}')
-        return file_name, passwd
+        count = 0
+        for link in links:
+            count += 1
+            yield link
+        self.total.emit(count)
 
-    def request_download_link(self, file_name, passwd):
+    def handle_download_result(self, result, link):
         """
-        请求下载链接的函数。使用文件名，密码，用户token和用户设置的延迟来获取下载链接。
+        处理下载结果的函数。把链接、下载结果和完成时间放入缓冲区，由主线程定时取走，避免每条结果都发出一次跨线程信号。
 
-        :param file_name: 文件名。
-        :param passwd: 文件密码。
-        :return: 返回请求到的下载链接。
+        :param result: 下载结果。
+        :param link: 对应的城通网盘链接。
         """
 
-        result = request_download_link(file_name, passwd, self.user_token, self.user_delay)
-        logger.info(f'请求链接：{file_name}，返回结果：{result}')
-        return result
+        row = (link, result, time.time())
+        with self.results_lock:
+            self.results.append(row)
 
-    def handle_download_result(self, result, link):
+    def take_results(self):
         """
-        处理下载结果的函数。根据下载结果的情况，发出不同的信号。
+        取走缓冲区中的全部结果，由主线程调用。
 
-        :param result: 下载结果。
-        :param link: 对应的城通网盘链接。
+        :return: 按输入顺序排列的结果列表，每条结果由链接、下载结果和完成时间组成。
         """
 
-        if not result:
-            self.signal.emit(f'获取下载失败：{link}')
-        elif result.startswith("https://"):
-            self.signal.emit(result)
-        elif result == '-1':
-            self.signal.emit(f'没获取到高速链接，请重新登录获取 token：{link}')
-        elif result == '401':
-            self.signal.emit(f'访问密码缺失或不正确：{link}')
-        elif result == '404':
-            self.signal.emit(f'文件已删除：{link}')
-        elif result == '503':
-            self.signal.emit(f'文件已失效：{link}')
-        else:
-            self.signal.emit(f'错误代码 {result}：{link}')
+        with self.results_lock:
+            results, self.results = self.results, []
+        return results
 
     def stop(self):
         """
-        停止线程的函数。设置线程的运行状态为False，从而使线程在完成当前任务后停止。
+        停止线程的函数。设置线程的运行状态为False，从而使线程在完成在途请求后停止。
 
         """
 
@@ -197,9 +190,14 @@ class CtfileUrlDecoder(QMainWindow):
         # 主窗口配置
         self.configure_main_window()
 
+        # 定时把子线程的结果批量写入结果表格
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(RESULT_FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush_results)
+
     def create_text_editor(self):
         """
-        创建输入和输出文本框，并使用QSplitter将文本框分为左右两栏。文本框的滚动条会同步。
+        创建输入文本框和结果表格，并使用QSplitter分为左右两栏。结果表格逐行滚动，与文本框的滚动条同步时行号保持对齐。
         """
 
         # 输入文本框
@@ -208,27 +206,22 @@ class CtfileUrlDecoder(QMainWindow):
         self.text_input.setStyleSheet("border: none; font-size: 14px;")
         self.text_input.setPlaceholderText("请输入城通链接，格式为：\nhttps://url1.ctfile.com/f/34628125-771711816-13fa54 0000\n或者：\nhttps://url01.ctfile.com/f/13660405-878244288-582bbf?p=AA00AA")
 
-        # 输出文本框
-        self.text_output = CodeEditor()
-        self.text_output.setWordWrapMode(QTextOption.NoWrap)
-        self.text_output.setReadOnly(True)
-        self.text_output.setStyleSheet("border: none; font-size: 14px;")
-        self.text_output.setPlaceholderText("获取到的会员高速下载地址，可以直接复制粘贴到下载软件批量下载")
+        # 结果表格
+        self.result_table = ResultTable()
+        self.result_table.setStyleSheet("border: none; font-size: 14px;")
+        self.result_table.setPlaceholderText("获取到的会员高速下载地址，选中后按 Ctrl+C 复制，可以直接粘贴到下载软件批量下载")
 
         # 使用 QSplitter 将文本框分为左右两栏
         splitter = QSplitter(Qt.Horizontal)
         splitter.addWidget(self.text_input)
-        splitter.addWidget(self.text_output)
+        splitter.addWidget(self.result_table)
 
         # 创建一个垂直布局，并添加splitter
         main_text_area = QVBoxLayout()
         main_text_area.addWidget(splitter)
 
-        # 获取每个文本框的滚动条并同步
-        scrollbar_input = self.text_input.verticalScrollBar()
-        scrollbar_output = self.text_output.verticalScrollBar()
-        scrollbar_input.valueChanged.connect(scrollbar_output.setValue)
-        scrollbar_output.valueChanged.connect(scrollbar_input.setValue)
+        # 获取文本框和表格的滚动条并同步，限制同步频率，滚动时两边不会每一步都一起重绘
+        self.scroll_sync = ScrollSync(self.text_input.verticalScrollBar(), self.result_table.verticalScrollBar())
 
         # 创建一个 QWidget，将布局应用于此小部件，然后将其设置为主窗口的中心部件
         central_widget = QWidget()
@@ -238,14 +231,26 @@ class CtfileUrlDecoder(QMainWindow):
 
     def create_action(self):
         """
-        创建程序中所有的动作。这些动作包括开始、停止、打开、保存、退出、设置、过滤、帮助、更新和关于。
+        创建程序中所有的动作。这些动作包括开始、继续、重试、停止、重新检查失效链接、性能分析、打开、保存、退出、设置、过滤、提取链接、帮助、更新和关于。
         """
 
         # 开始动作
         self.action_start = QAction(QIcon(get_resource_path('media/icons8-start-26.png')), '开始', self)
         self.action_start.setShortcut('F10')
         self.action_start.setStatusTip('开始运行')
-        self.action_start.triggered.connect(self.start_worker)
+        self.action_start.triggered.connect(lambda: self.start_worker())
+
+        # 继续动作
+        self.action_resume = QAction('继续上次任务', self)
+        self.action_resume.setShortcut('F8')
+        self.action_resume.setStatusTip('继续上次中断的任务，跳过已经完成的链接')
+        self.action_resume.triggered.connect(lambda: self.start_worker(resume=True))
+
+        # 重试动作
+        self.action_retry = QAction('重试筛选的失败链接', self)
+        self.action_retry.setShortcut('F9')
+        self.action_retry.setStatusTip('重新请求结果表格中当前显示的失败链接，成功的结果保持不变')
+        self.action_retry.triggered.connect(self.retry_failures)
 
         # 停止动作
         self.action_stop = QAction(QIcon(get_resource_path('media/icons8-stop-26.png')), '停止', self)
@@ -254,12 +259,24 @@ class CtfileUrlDecoder(QMainWindow):
         self.action_stop.triggered.connect(self.stop_worker)
         self.action_stop.setEnabled(False)
 
+        # 重新检查失效链接动作
+        self.action_recheck = QAction('重新检查失效链接', self)
+        self.action_recheck.setCheckable(True)
+        self.action_recheck.setStatusTip('忽略失效链接缓存，重新请求已删除、已失效或密码错误的链接')
+
+        # 性能分析动作
+        self.action_profile = QAction('性能分析', self)
+        self.action_profile.setCheckable(True)
+        self.action_profile.setStatusTip(f'分析下一次运行的性能，报告保存到 {PROFILE_DIR} 目录')
+        self.profiler = None
+
         # 其他动作
         self.ActionOpen = ActionOpen(self, self.text_input)
-        self.ActionSave = ActionSave(self, self.text_output)
+        self.ActionSave = ActionSave(self, self.result_table)
         self.ActionExit = ActionExit(self)
         self.ActionSetting = ActionSetting(self)
-        self.ActionFilter = ActionFilter(self, self.text_output)
+        self.ActionFilter = ActionFilter(self, self.result_table)
+        self.ActionExtract = ActionExtract(self, self.text_input, self.ActionOpen)
         self.ActionHelp = ActionHelp(self)
         self.ActionUpdate = ActionUpdate(self)
         self.ActionAbout = ActionAbout(self)
@@ -277,10 +294,17 @@ class CtfileUrlDecoder(QMainWindow):
         menu_file.addAction(self.ActionExit.action_exit)
         menu_run = menubar.addMenu('运行(&R)')
         menu_run.addAction(self.action_start)
+        menu_run.addAction(self.action_resume)
+        menu_run.addAction(self.action_retry)
         menu_run.addAction(self.action_stop)
+        menu_run.addSeparator()
+        menu_run.addAction(self.action_recheck)
+        menu_run.addAction(self.action_profile)
         menu_option = menubar.addMenu('选项(&O)')
         menu_option.addAction(self.ActionSetting.action_setting)
         menu_option.addAction(self.ActionFilter.action_filter)
+        menu_option.addMenu(self.ActionFilter.menu_filter)
+        menu_option.addAction(self.ActionExtract.action_extract)
         menu_help = menubar.addMenu('帮助(&H)')
         menu_help.addAction(self.ActionHelp.action_help)
         menu_help.addAction(self.ActionUpdate.action_update)
@@ -307,9 +331,15 @@ class CtfileUrlDecoder(QMainWindow):
 
     def create_statusbar(self):
         """
-        创建状态栏，状态栏中包括一个标签和一个进度条，用于显示任务的运行状态和进度。
+        创建状态栏，状态栏中包括一个指标标签、一个进度标签和一个进度条，用于显示运行指标、任务的运行状态和进度。指标标签每秒刷新一次。
         """
         self.status_bar = self.statusBar()
+        self.metrics_label = QLabel()
+        self.status_bar.addPermanentWidget(self.metrics_label)
+        self.metrics_requests = 0
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics_label)
+        self.metrics_timer.start(1000)
         self.progress_label = QLabel('准备就绪：')
         self.status_bar.addPermanentWidget(self.progress_label)
         self.progress_bar = QProgressBar()
@@ -332,44 +362,88 @@ class CtfileUrlDecoder(QMainWindow):
         y = (screenGeometry.height() - self.height()) / 2
         self.move(int(x), int(y))
 
-    def start_worker(self):
+    def start_worker(self, resume=False, retry=None):
         """
         开始执行后台任务。这个方法会创建一个Worker实例，并将它放到一个新的线程中执行。
+
+        :param resume: 是否继续上次中断的任务。继续时已完成的链接直接输出任务日志中的结果，不再请求。
+        :param retry: 需要重试的结果在结果集中的行号。重试时保留其他结果，只请求这些行的链接，并忽略失效链接缓存。
         """
 
         try:
-            self.text_output.clear()
-            # 初步处理用户输入，删除空行，去重
-            processed_text = process_input(self.text_input.toPlainText())
-            self.text_input.setPlainText(processed_text)
-            if not processed_text:
-                self.progress_label.setText(f"准备就绪：")
-                self.progress_bar.setValue(0)
-                return
-
-            # 获取链接列表、token、延迟参数
-            links = processed_text.split("\n")
-            user_token, user_delay = init_config()
+            model = self.result_table.result_model
+            recheck = self.action_recheck.isChecked()
+            input_file = None if retry else self.ActionOpen.input_file
+            if retry:
+                links = model.store.links_at(retry)
+                total = len(links)
+                recheck = True
+            elif input_file:
+                model.clear()
+                # 大文件由子线程逐行读取，先按文件行数估算进度
+                links = []
+                total = count_lines(input_file)
+            else:
+                model.clear()
+                # 初步处理用户输入，删除空行，去重
+                input_text = self.text_input.toPlainText()
+                processed_text = process_input(input_text)
+                # 内容没有变化时不重新设置，避免大文档重新排版
+                if processed_text != input_text:
+                    self.text_input.setPlainText(processed_text)
+                if not processed_text:
+                    self.progress_label.setText(f"准备就绪：")
+                    self.progress_bar.setValue(0)
+                    return
+                links = processed_text.split("\n")
+                total = len(links)
+
+            # 获取token、延迟、并发和代理参数
+            user_token, user_delay, user_concurrency, user_proxies = init_config()
             if not bool(user_token):
                 QMessageBox(QMessageBox.Warning, '检查设置', '请先设置帐号 token！', QMessageBox.Ok, self).show()
                 return
 
+            # 性能分析从主线程开始，包括界面的信号处理
+            self.profiler = RunProfiler() if self.action_profile.isChecked() else None
+            if self.profiler:
+                self.profiler.start()
+
             # 丢到子线程运行
-            self.worker = Worker(links, user_token, user_delay)
-            self.worker.signal.connect(self.update_output)
-            self.worker.signal.connect(self.update_progress_bar_and_label)
+            self.worker = Worker(links, user_token, user_delay, user_concurrency, recheck, user_proxies, input_file, resume, self.profiler, bool(retry))
+            self.worker.total.connect(self.update_progress_total)
             self.worker.start()
+            if retry:
+                # Worker启动后再移除需要重试的行，新的结果追加到末尾
+                retried = set(retry)
+                model.set_store(model.store.select(index for index in range(len(model.store)) if index not in retried))
+            self.flush_timer.start()
+            self.worker.finished.connect(self.flush_results)
+            self.worker.finished.connect(self.flush_timer.stop)
             self.worker.finished.connect(self.enable_start_button)
-            self.worker.finished.connect(self.finalize_output)
+            self.worker.finished.connect(self.finish_profiling)
             self.disable_start_button()
 
-            self.progress_bar.setMaximum(len(links))
+            self.progress_bar.setMaximum(total)
             self.progress_bar.setValue(0)
-            self.update_progress_label(0, len(links))
+            self.update_progress_label(0, total)
 
         except Exception as e:
             logger.error(f'运行解析发生错误：{e}')
 
+    def retry_failures(self):
+        """
+        重试结果表格中当前显示的失败结果，不支持的链接不会重试。
+        """
+
+        model = self.result_table.result_model
+        skipped = (ResultStatus.OK, ResultStatus.UNSUPPORTED)
+        retry = [index for index in model.visible_indices() if model.store.statuses[index] not in skipped]
+        if not retry:
+            self.status_bar.showMessage('没有需要重试的失败链接')
+            return
+        self.start_worker(retry=retry)
+
     def stop_worker(self):
         """
         停止执行后台任务。这个方法会调用Worker实例的stop方法来停止任务。
@@ -378,54 +452,73 @@ class CtfileUrlDecoder(QMainWindow):
         self.worker.stop()
         self.disable_start_button()
 
-    def update_progress_bar_and_label(self):
+    def flush_results(self):
+        """
+        取走Worker缓冲区中的结果，一次性追加到结果表格并更新进度。由定时器每隔 RESULT_FLUSH_INTERVAL 毫秒调用，Worker结束时再调用一次。
+        """
+
+        rows = self.worker.take_results()
+        if rows:
+            self.result_table.result_model.append_rows(rows)
+            self.update_progress_bar_and_label(len(rows))
+
+    def update_progress_bar_and_label(self, count=1):
         """
-        更新进度条和进度标签。每次收到Worker发出的信号时，都会调用这个方法，将进度条的值增加1。
+        更新进度条和进度标签，将进度条的值增加已完成的任务数量。
+
+        :param count: 新完成的任务数量。
         """
 
-        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        self.progress_bar.setValue(self.progress_bar.value() + count)
         self.update_progress_label(self.progress_bar.value(), self.progress_bar.maximum())
 
-    def update_progress_label(self, completed, total):
+    def update_progress_total(self, total):
         """
-        更新进度标签的文字。
+        更新进度条的总数。大文件读取完毕后，用去除空行和重复行后的实际链接数替换按行数估算的总数。
 
-        :param completed: 已完成的任务数量。
         :param total: 总的任务数量。
         """
 
-        self.progress_label.setText(f"进度：{completed}/{total}")
+        self.progress_bar.setMaximum(total)
+        self.update_progress_label(self.progress_bar.value(), total)
 
-    def update_output(self, text):
+    def update_progress_label(self, completed, total):
         """
-        更新输出文本框中的内容。
+        更新进度标签的文字，同时显示结果表格中成功的数量。
 
-        :param text: 要插入到输出文本框的文字。
+        :param completed: 已完成的任务数量。
+        :param total: 总的任务数量。
         """
 
-        cursor = self.text_output.textCursor()
-        char_format = QTextCharFormat()
-
-        if text.startswith('https://'):
-            char_format.setForeground(QBrush(Qt.darkGreen))
-        else:
-            char_format.setForeground(QBrush(Qt.darkRed))
+        succeeded = self.result_table.result_model.store.counts[ResultStatus.OK]
+        self.progress_label.setText(f"进度：{completed}/{total}  成功：{succeeded}")
 
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertText(text, char_format)
-        cursor.insertText('\n')
+    def update_metrics_label(self):
+        """
+        更新指标标签，显示每秒请求数、错误率和请求耗时的 p95，鼠标悬停时显示缓存命中、重试和限流次数。
+        """
 
-        char_format.setForeground(QBrush(Qt.darkGreen))
-        cursor.setCharFormat(char_format)
+        summary = get_metrics().summary()
+        rate = summary['requests'] - self.metrics_requests
+        self.metrics_requests = summary['requests']
+        results = summary['ok'] + summary['failed']
+        error_rate = summary['failed'] / results * 100 if results else 0.0
+        self.metrics_label.setText(f"{rate:.0f} 请求/秒  错误率：{error_rate:.1f}%  p95：{summary['p95'] * 1000:.0f} 毫秒")
+        self.metrics_label.setToolTip(f"请求：{summary['requests']:.0f}\n成功：{summary['ok']:.0f}\n失败：{summary['failed']:.0f}\n"
+                                      f"缓存命中：{summary['cache_hits']:.0f}\n重试：{summary['retries']:.0f}\n限流：{summary['throttles']:.0f}")
 
-    def finalize_output(self):
+    def finish_profiling(self):
         """
-        在所有任务完成后，调用这个方法来进行一些清理工作，比如删除多余的空行。
+        在任务完成后停止性能分析并写出报告。
         """
 
-        cursor = self.text_output.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.deletePreviousChar()
+        if not self.profiler:
+            return
+        self.profiler.stop()
+        report = self.profiler.write(PROFILE_DIR)
+        self.profiler = None
+        if report:
+            self.status_bar.showMessage(f'性能分析报告已保存：{report}')
 
     def enable_start_button(self):
         """
@@ -435,8 +528,10 @@ class CtfileUrlDecoder(QMainWindow):
         self.ActionSave.action_save.setEnabled(True)
         self.ActionOpen.action_open.setEnabled(True)
         self.ActionSetting.action_setting.setEnabled(True)
-        self.ActionFilter.action_filter.setEnabled(True)
+        self.ActionExtract.action_extract.setEnabled(True)
         self.action_start.setEnabled(True)
+        self.action_resume.setEnabled(True)
+        self.action_retry.setEnabled(True)
         self.action_stop.setEnabled(False)
 
     def disable_start_button(self):
@@ -447,8 +542,10 @@ class CtfileUrlDecoder(QMainWindow):
         self.ActionSave.action_save.setEnabled(False)
         self.ActionOpen.action_open.setEnabled(False)
         self.ActionSetting.action_setting.setEnabled(False)
-        self.ActionFilter.action_filter.setEnabled(False)
+        self.ActionExtract.action_extract.setEnabled(False)
         self.action_start.setEnabled(False)
+        self.action_resume.setEnabled(False)
+        self.action_retry.setEnabled(False)
         self.action_stop.setEnabled(True)
 
 
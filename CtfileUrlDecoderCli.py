@@ -0,0 +1,188 @@
+"""
+这是 CtfileUrlDecoder 的命令行入口，用于在没有图形界面的服务器或定时任务中批量解析城通网盘链接。
+
+程序从文件或标准输入逐行读取链接，跳过空行和重复行；使用 `--extract` 时则从网页、论坛帖子或聊天记录等任意文本中提取链接和提取码。然后程序使用与图形界面相同的 `LinkResolver` 解析引擎（筛选链接、分割文件信息、请求下载链接），每解析完一条就按输入顺序写出一条结果，输出可以是标准输出或文件。未指定的 token、延迟、并发数和出口代理从配置文件读取。本文件不会导入 PyQt5，可以在没有图形环境的机器上快速启动。
+
+使用示例：
+
+```bash
+python CtfileUrlDecoderCli.py links.txt -o result.txt
+cat links.txt | python CtfileUrlDecoderCli.py -t TOKEN -c 8 -f json
+```
+
+输出格式：
+- `text`：与图形界面相同，成功时为下载链接，失败时为提示信息。
+- `json`：每行一个 JSON 对象，包含 `link`、`result` 和 `message` 三个字段。
+- `csv`：两列，分别是原始链接和解析结果。
+
+使用 `--metrics-file` 时，程序运行期间定期把请求耗时、HTTP 状态码、结果代码、重试、缓存命中和限流次数等指标以 Prometheus 文本格式写到文件，可以交给 node_exporter 的 textfile 收集器读取。使用 `--profile` 时对整个解析过程做性能分析，按读取链接、网络请求、JSON 解析、日志等阶段输出 pstats 和折叠栈报告。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+import threading
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from module import *
+
+logger = logging.getLogger(__name__)
+
+
+def read_input(source: TextIO, extract: bool = False) -> Iterator[str]:
+    """
+    读取输入的链接。提取模式下扫描整个输入，从任意文本中提取链接和提取码，文件输入使用内存映射。
+
+    :param source: 输入流
+    :type source: TextIO
+    :param extract: 是否从任意文本中提取链接
+    :type extract: bool
+    :rtype: Iterator[str]
+    :return: 待解析的链接
+    """
+    if not extract:
+        return iter_links(source)
+    records = extract_links(source.read()) if source is sys.stdin else extract_links_from_file(source.name)
+    return (record.line for record in records)
+
+
+def write_results(results: Iterable, target: TextIO, output_format: str) -> int:
+    """
+    把解析结果逐条写入输出流。
+
+    :param results: 由链接和解析结果组成的元组
+    :type results: Iterable
+    :param target: 输出流
+    :type target: TextIO
+    :param output_format: 输出格式，可选 text、json、csv
+    :type output_format: str
+    :rtype: int
+    :return: 写出的结果数量
+    """
+    writer = csv.writer(target) if output_format == 'csv' else None
+    count = 0
+    for link, result in results:
+        message = format_result(result, link)
+        if output_format == 'json':
+            target.write(json.dumps({'link': link, 'result': result, 'message': message}, ensure_ascii=False) + '\n')
+        elif writer:
+            writer.writerow([link, result or ''])
+        else:
+            target.write(message + '\n')
+        target.flush()
+        count += 1
+    return count
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    :param argv: 命令行参数，为 None 时使用 sys.argv
+    :type argv: Optional[List[str]]
+    :rtype: argparse.Namespace
+    :return: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(description='城通网盘批量解析工具（命令行版）')
+    parser.add_argument('input', nargs='?', default='-', help='链接文件路径，一行一个链接，省略或为 - 时从标准输入读取')
+    parser.add_argument('-o', '--output', default='-', help='结果文件路径，省略或为 - 时写到标准输出')
+    parser.add_argument('-t', '--token', help='账号 token，多个 token 用英文逗号分隔，默认读取配置文件')
+    parser.add_argument('-d', '--delay', help='初始请求间隔（毫秒），默认读取配置文件')
+    parser.add_argument('-c', '--concurrency', type=int, help=f'并发数（1~{MAX_CONCURRENCY}），默认读取配置文件')
+    parser.add_argument('-p', '--proxies', help='出口代理，多个代理用英文逗号分隔，默认读取配置文件')
+    parser.add_argument('-f', '--format', choices=['text', 'json', 'csv'], default='text', help='输出格式，默认为 text')
+    parser.add_argument('-x', '--extract', action='store_true', help='输入为网页、论坛帖子或聊天记录等任意文本，从中提取链接和提取码')
+    parser.add_argument('--no-cache', action='store_true', help='不使用下载链接缓存')
+    parser.add_argument('--recheck', action='store_true', help='忽略失效链接缓存，重新请求')
+    parser.add_argument('--journal', default=CLI_JOURNAL_PATH, help=f'任务日志路径，记录每条链接的结果，默认为 {CLI_JOURNAL_PATH}，与图形界面的任务日志分开')
+    parser.add_argument('--resume', action='store_true', help='继续上次中断的任务，跳过任务日志中已完成的链接')
+    parser.add_argument('--metrics-file', help=f'把运行指标以 Prometheus 文本格式写到文件，每 {METRICS_INTERVAL:g} 秒更新一次')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, metavar='DIR', help=f'开启性能分析，把报告写到目录，省略目录时为 {PROFILE_DIR}')
+    parser.add_argument('--log-level', default='WARNING', help='日志等级，默认为 WARNING，日志输出到标准错误')
+    return parser.parse_args(argv)
+
+
+def write_metrics_periodically(target_path: str, stopped: threading.Event) -> None:
+    """
+    每隔 METRICS_INTERVAL 秒把运行指标写到文件，直到收到停止信号。
+
+    :param target_path: 指标文件路径
+    :type target_path: str
+    :param stopped: 停止信号
+    :type stopped: threading.Event
+    :rtype: None
+    """
+    while not stopped.wait(METRICS_INTERVAL):
+        write_metrics_file(target_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行程序的主入口。
+
+    :param argv: 命令行参数，为 None 时使用 sys.argv
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码
+    """
+    args = parse_args(argv)
+    logging_config(console_output=True, log_level=args.log_level)
+
+    token, delay, concurrency, proxies = merge_config(args.token, args.delay, args.concurrency, args.proxies)
+    if not token or token == '0':
+        logger.error('No token configured, use --token or set it in the GUI first.')
+        return 2
+
+    try:
+        source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    except OSError as e:
+        logger.error(f"Unable to open input file '{args.input}': {e}")
+        return 2
+    try:
+        target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    except OSError as e:
+        logger.error(f"Unable to open output file '{args.output}': {e}")
+        if source is not sys.stdin:
+            source.close()
+        return 2
+    cache = None if args.no_cache else LinkCache(CACHE_PATH)
+    journal = JobJournal(args.journal, args.resume)
+    stopped = threading.Event()
+    if args.metrics_file:
+        threading.Thread(target=write_metrics_periodically, args=(args.metrics_file, stopped), daemon=True).start()
+    profiler = RunProfiler() if args.profile else None
+    if profiler:
+        profiler.start()
+    try:
+        resolver = LinkResolver(token, delay, concurrency, cache, args.recheck, proxies, journal)
+        count = write_results(resolver.resolve_links(read_input(source, args.extract)), target, args.format)
+        logger.info(f'Resolved {count} links')
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if profiler:
+            profiler.stop()
+            report = profiler.write(args.profile)
+            if report:
+                logger.warning(f'Profile report written to {report}.*')
+        stopped.set()
+        if args.metrics_file:
+            write_metrics_file(args.metrics_file)
+        journal.close()
+        if cache:
+            cache.close()
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
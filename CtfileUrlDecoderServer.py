@@ -0,0 +1,291 @@
+"""
+这是 CtfileUrlDecoder 的本地 HTTP 服务入口，用于让其他内部工具通过 HTTP 调用链接解析引擎。
+
+服务启动时创建一个 `LinkResolver` 解析引擎和一个 `JobQueue` 任务队列，所有提交的任务共用同一组连接池、令牌限速器、限流检测器和下载链接缓存，按提交顺序逐个执行。多个工具共用一个服务，不会像各自运行图形界面那样争抢同一个账号的请求限制。未指定的 token、延迟、并发数和出口代理从配置文件读取。本文件不会导入 PyQt5。
+
+接口说明（请求和响应均为 JSON，`<id>` 为任务编号）：
+- `POST /jobs`：提交任务。请求体为 `{"links": [...]}`、链接数组，或者一行一个链接的纯文本，返回任务概况。
+- `GET /jobs`：列出保留的任务概况。
+- `GET /jobs/<id>?offset=N`：查询任务概况和第 N 条之后的结果，用于轮询。
+- `GET /jobs/<id>/events?offset=N`：以 Server-Sent Events 推送结果，每条结果一个 `result` 事件，任务结束时发送 `end` 事件。断线重连时可以用 `Last-Event-ID` 请求头代替 `offset`。
+- `DELETE /jobs/<id>`：取消任务。
+- `GET /metrics`：以 Prometheus 文本格式输出运行指标，包括请求耗时、HTTP 状态码、结果代码、重试、缓存命中和限流次数。
+
+使用示例：
+
+```bash
+python CtfileUrlDecoderServer.py --port 8765
+curl -X POST --data-binary @links.txt http://127.0.0.1:8765/jobs
+curl -N http://127.0.0.1:8765/jobs/<id>/events
+```
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import io
+import json
+import logging
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from module import *
+
+logger = logging.getLogger(__name__)
+
+SSE_HEARTBEAT = 15.0
+
+
+class ResolveRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP 请求处理类。
+
+    该类把 HTTP 请求转换成任务队列的操作，任务队列保存在 server.queue 属性中。
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def send_json(self, status: int, body: object) -> None:
+        """
+        发送 JSON 响应。
+
+        :param status: HTTP 状态码
+        :type status: int
+        :param body: 响应内容
+        :type body: object
+        :rtype: None
+        """
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_metrics(self) -> None:
+        """
+        以 Prometheus 文本格式发送运行指标。
+
+        :rtype: None
+        """
+        data = get_metrics().render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def route(self) -> Optional[tuple]:
+        """
+        解析请求路径。
+
+        :rtype: Optional[tuple]
+        :return: 由任务编号、子路径和查询参数组成的元组，路径不是 /jobs 开头时返回 None
+        """
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if not parts or parts[0] != 'jobs' or len(parts) > 3:
+            return None
+        job_id = parts[1] if len(parts) > 1 else None
+        action = parts[2] if len(parts) > 2 else None
+        return job_id, action, parse_qs(url.query)
+
+    def find_job(self, job_id: str) -> Optional[ResolveJob]:
+        """
+        查询任务，不存在时发送 404 响应。
+
+        :param job_id: 任务编号
+        :type job_id: str
+        :rtype: Optional[ResolveJob]
+        :return: 对应的任务，不存在时返回 None
+        """
+        job = self.server.queue.get(job_id)
+        if job is None:
+            self.send_json(404, {'error': f'job not found: {job_id}'})
+        return job
+
+    def do_GET(self) -> None:
+        """
+        处理 GET 请求：列出任务、查询任务、推送结果或输出运行指标。
+
+        :rtype: None
+        """
+        if urlparse(self.path).path == '/metrics':
+            self.send_metrics()
+            return
+        route = self.route()
+        if route is None:
+            self.send_json(404, {'error': 'not found'})
+            return
+        job_id, action, query = route
+        if job_id is None:
+            self.send_json(200, [job.summary() for job in self.server.queue.all_jobs()])
+            return
+
+        job = self.find_job(job_id)
+        if job is None:
+            return
+        try:
+            offset = max(int(self.headers.get('Last-Event-ID') or query.get('offset', ['0'])[0]), 0)
+        except ValueError:
+            self.send_json(400, {'error': 'offset must be an integer'})
+            return
+
+        if action is None:
+            self.send_json(200, {**job.summary(), 'offset': offset, 'results': job.result_items(offset)})
+        elif action == 'events':
+            self.stream_events(job, offset)
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def stream_events(self, job: ResolveJob, offset: int) -> None:
+        """
+        以 Server-Sent Events 推送任务结果，直到任务结束或客户端断开。
+
+        :param job: 任务
+        :type job: ResolveJob
+        :param offset: 起始位置
+        :type offset: int
+        :rtype: None
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while True:
+                if not job.wait(offset, SSE_HEARTBEAT):
+                    self.wfile.write(b': ping\n\n')
+                    self.wfile.flush()
+                    continue
+                finished = job.finished
+                for item in job.result_items(offset):
+                    offset += 1
+                    self.wfile.write(f'id: {offset}\nevent: result\ndata: {json.dumps(item, ensure_ascii=False)}\n\n'.encode('utf-8'))
+                self.wfile.flush()
+                if finished and offset >= job.summary()['completed']:
+                    self.wfile.write(f'event: end\ndata: {json.dumps(job.summary(), ensure_ascii=False)}\n\n'.encode('utf-8'))
+                    self.wfile.flush()
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug(f'Event stream of job {job.id} closed by client')
+
+    def do_POST(self) -> None:
+        """
+        处理 POST 请求：提交任务。
+
+        :rtype: None
+        """
+        route = self.route()
+        if route is None or route[0] is not None:
+            self.send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8', errors='replace')
+            if 'json' in (self.headers.get('Content-Type') or '') or body.lstrip().startswith(('{', '[')):
+                data = json.loads(body)
+                lines = data.get('links', []) if isinstance(data, dict) else data
+                if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+                    raise ValueError('links must be a list of strings')
+            else:
+                lines = io.StringIO(body)
+        except ValueError as e:
+            self.send_json(400, {'error': f'invalid request body: {e}'})
+            return
+
+        links = list(iter_links(lines))
+        if not links:
+            self.send_json(400, {'error': 'no links submitted'})
+            return
+        self.send_json(201, self.server.queue.submit(links).summary())
+
+    def do_DELETE(self) -> None:
+        """
+        处理 DELETE 请求：取消任务。
+
+        :rtype: None
+        """
+        route = self.route()
+        if route is None or route[0] is None or route[1] is not None:
+            self.send_json(404, {'error': 'not found'})
+            return
+        job = self.server.queue.cancel(route[0])
+        if job is None:
+            self.send_json(404, {'error': f'job not found: {route[0]}'})
+            return
+        self.send_json(200, job.summary())
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        把访问日志写到日志系统，而不是标准错误。
+
+        :rtype: None
+        """
+        logger.debug(f'{self.address_string()} - {format % args}')
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    :param argv: 命令行参数，为 None 时使用 sys.argv
+    :type argv: Optional[List[str]]
+    :rtype: argparse.Namespace
+    :return: 解析后的参数
+    """
+    parser = argparse.ArgumentParser(description='城通网盘批量解析工具（本地 HTTP 服务）')
+    parser.add_argument('--host', default=SERVER_HOST, help=f'监听地址，默认为 {SERVER_HOST}')
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help=f'监听端口，默认为 {SERVER_PORT}')
+    parser.add_argument('-t', '--token', help='账号 token，多个 token 用英文逗号分隔，默认读取配置文件')
+    parser.add_argument('-d', '--delay', help='初始请求间隔（毫秒），默认读取配置文件')
+    parser.add_argument('-c', '--concurrency', type=int, help=f'并发数（1~{MAX_CONCURRENCY}），默认读取配置文件')
+    parser.add_argument('-p', '--proxies', help='出口代理，多个代理用英文逗号分隔，默认读取配置文件')
+    parser.add_argument('--no-cache', action='store_true', help='不使用下载链接缓存')
+    parser.add_argument('--log-level', default='INFO', help='日志等级，默认为 INFO')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    HTTP 服务的主入口。
+
+    :param argv: 命令行参数，为 None 时使用 sys.argv
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码
+    """
+    args = parse_args(argv)
+    logging_config(console_output=True, log_level=args.log_level)
+
+    token, delay, concurrency, proxies = merge_config(args.token, args.delay, args.concurrency, args.proxies)
+    if not token or token == '0':
+        logger.error('No token configured, use --token or set it in the GUI first.')
+        return 2
+
+    cache = None if args.no_cache else LinkCache(CACHE_PATH)
+    queue = JobQueue(LinkResolver(token, delay, concurrency, cache, False, proxies))
+    server = ThreadingHTTPServer((args.host, args.port), ResolveRequestHandler)
+    server.daemon_threads = True
+    server.queue = queue
+    logger.info(f'Serving on http://{args.host}:{server.server_address[1]}/jobs')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        queue.close()
+        if cache:
+            cache.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+性能测试工具，包括本地模拟的 getfile.php 服务和端到端吞吐量测试
+"""
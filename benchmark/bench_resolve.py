@@ -0,0 +1,233 @@
+"""
+这是一个Python文件，用于对链接解析流程做端到端的吞吐量测试。
+
+测试使用真实的解析流程：`LinkResolver` 的线程池、链接解析、令牌池、限速器、限流检测器和 `request_download_link`，只把 `getfile.php` 接口换成 `benchmark.mock_server` 提供的本地替身。程序先在子进程中启动模拟服务，然后对每一组参数（链接数量、并发数、请求间隔）单独启动一个子进程运行测试，子进程把 `request_download_link` 和 `resolve_many` 模块中的接口地址 `GETFILE_URL` 替换成模拟服务的地址。每组测试都在独立进程中运行，测得的峰值内存互不影响。
+
+每组测试报告以下指标：
+- `links/s`：每秒解析的链接数。
+- `p50`、`p95`、`p99`：单条链接从开始解析到得到结果的耗时，单位是毫秒，包含限速等待。
+- `peak RSS`：测试进程的峰值内存，单位是 MB。
+- `ok`：成功得到下载地址的链接数。
+
+每条请求路径（token 和出口代理的组合）的限速器最高速率为 `RATE_LIMIT_MAX`，因此测试默认使用 50 个虚拟 token，避免限速器成为唯一的瓶颈。
+
+使用示例：
+
+```bash
+python -m benchmark.bench_resolve
+python -m benchmark.bench_resolve --sizes 1000 10000 --concurrency 4 16 --delays 0 20 --output result.json
+python -m benchmark.bench_resolve --sizes 2000 --codes 404=0.05 --throttle-after 500 --throttle-for 3 --reset-rate 0.01
+```
+
+无法识别的参数会原样传给模拟服务，因此可以直接使用 `benchmark.mock_server` 的故障注入参数，在限流、连接重置和格式错误等条件下测试重试、退避和并发逻辑。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BENCH_TOKENS = 50
+
+
+def peak_rss() -> Optional[float]:
+    """
+    获取当前进程的峰值内存。
+
+    :rtype: Optional[float]
+    :return: 峰值内存，单位是 MB，无法获取时返回 None
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+    except (ImportError, AttributeError):
+        return None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    计算已排序数据的百分位数。
+
+    :param values: 已排序的数据
+    :type values: List[float]
+    :param q: 百分位，范围为 0 到 1
+    :type q: float
+    :rtype: float
+    :return: 对应的百分位数，没有数据时返回 0
+    """
+    if not values:
+        return 0.0
+    return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+
+
+def make_links(size: int) -> List[str]:
+    """
+    生成互不相同的测试链接。
+
+    :param size: 链接数量
+    :type size: int
+    :rtype: List[str]
+    :return: 测试链接
+    """
+    return [f'https://url{i % 99 + 1}.ctfile.com/f/{10000000 + i}-{(i * 7919) % 1000000007}-b{i:x} 0000' for i in range(size)]
+
+
+def run_scenario(url: str, size: int, concurrency: int, delay: int, tokens: int) -> Dict[str, object]:
+    """
+    在当前进程中运行一组测试。
+
+    :param url: 模拟服务的接口地址
+    :type url: str
+    :param size: 链接数量
+    :type size: int
+    :param concurrency: 并发数
+    :type concurrency: int
+    :param delay: 每个 token 的初始请求间隔，单位是毫秒
+    :type delay: int
+    :param tokens: 虚拟 token 数量
+    :type tokens: int
+    :rtype: Dict[str, object]
+    :return: 测试结果
+    """
+    from module import LinkResolver
+
+    for name in ('module.request_download_link', 'module.resolve_many'):
+        importlib.import_module(name).GETFILE_URL = url
+    # 故障注入时每个失败请求都会记录错误日志，大量输出会拖慢测试
+    logging.disable(logging.CRITICAL)
+    links = make_links(size)
+    resolver = LinkResolver(','.join(f'bench-{i}' for i in range(tokens)), str(delay), concurrency)
+    latencies = []
+    resolve = resolver.resolve
+
+    def timed_resolve(link, is_running=None):
+        start = time.perf_counter()
+        try:
+            return resolve(link, is_running)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    resolver.resolve = timed_resolve
+    start = time.perf_counter()
+    ok = sum(1 for _, result in resolver.resolve_links(links) if result and result.startswith('https://'))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'size': size,
+        'concurrency': concurrency,
+        'delay': delay,
+        'tokens': tokens,
+        'ok': ok,
+        'seconds': round(elapsed, 3),
+        'links_per_second': round(size / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'peak_rss_mb': round(peak_rss() or 0.0, 1),
+    }
+
+
+def start_mock(latency: float, jitter: float, extra_args: Sequence[str] = ()) -> Tuple[subprocess.Popen, str]:
+    """
+    在子进程中启动模拟服务。
+
+    :param latency: 平均响应延迟，单位是毫秒
+    :type latency: float
+    :param jitter: 延迟抖动范围，单位是毫秒
+    :type jitter: float
+    :param extra_args: 传给模拟服务的其他参数，例如故障注入参数
+    :type extra_args: Sequence[str]
+    :rtype: Tuple[subprocess.Popen, str]
+    :return: 子进程和接口地址
+    """
+    process = subprocess.Popen([sys.executable, '-m', 'benchmark.mock_server', '--latency', str(latency), '--jitter', str(jitter), *extra_args],
+                               stdout=subprocess.PIPE, text=True)
+    return process, process.stdout.readline().strip()
+
+
+def run_child(url: str, size: int, concurrency: int, delay: int, tokens: int) -> Dict[str, object]:
+    """
+    在独立子进程中运行一组测试。
+
+    :param url: 模拟服务的接口地址
+    :type url: str
+    :param size: 链接数量
+    :type size: int
+    :param concurrency: 并发数
+    :type concurrency: int
+    :param delay: 每个 token 的初始请求间隔，单位是毫秒
+    :type delay: int
+    :param tokens: 虚拟 token 数量
+    :type tokens: int
+    :rtype: Dict[str, object]
+    :return: 测试结果
+    """
+    output = subprocess.run([sys.executable, '-m', 'benchmark.bench_resolve', '--url', url, '--child', str(size), str(concurrency), str(delay), str(tokens)],
+                            stdout=subprocess.PIPE, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    性能测试的命令行入口。
+
+    :param argv: 命令行参数，为 None 时使用 sys.argv
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(description='链接解析端到端吞吐量测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='每组测试的链接数量，默认为 1000 10000 100000')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[4, 16, 32], help='并发数，默认为 4 16 32')
+    parser.add_argument('--delays', type=int, nargs='+', default=[0, 20], help='每个 token 的初始请求间隔（毫秒），默认为 0 20')
+    parser.add_argument('--tokens', type=int, default=BENCH_TOKENS, help=f'虚拟 token 数量，默认为 {BENCH_TOKENS}')
+    parser.add_argument('--latency', type=float, default=20, help='模拟服务的平均响应延迟（毫秒），默认为 20')
+    parser.add_argument('--jitter', type=float, default=5, help='模拟服务的延迟抖动范围（毫秒），默认为 5')
+    parser.add_argument('--url', help='使用已经运行的模拟服务，不再自动启动')
+    parser.add_argument('--output', help='把全部结果以 JSON 格式保存到文件')
+    parser.add_argument('--child', type=int, nargs=4, help=argparse.SUPPRESS)
+    args, mock_args = parser.parse_known_args(argv)
+
+    if args.child:
+        print(json.dumps(run_scenario(args.url, *args.child)), flush=True)
+        return 0
+
+    process, url = (None, args.url) if args.url else start_mock(args.latency, args.jitter, mock_args)
+    results = []
+    try:
+        print(f'{"links":>8} {"conc":>5} {"delay":>6} {"links/s":>9} {"p50":>9} {"p95":>9} {"p99":>9} {"peak RSS":>9} {"ok":>8}')
+        for size in args.sizes:
+            for concurrency in args.concurrency:
+                for delay in args.delays:
+                    result = run_child(url, size, concurrency, delay, args.tokens)
+                    results.append(result)
+                    print(f'{size:>8} {concurrency:>5} {delay:>6} {result["links_per_second"]:>9} {result["p50_ms"]:>9} {result["p95_ms"]:>9} '
+                          f'{result["p99_ms"]:>9} {result["peak_rss_mb"]:>9} {result["ok"]:>8}', flush=True)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
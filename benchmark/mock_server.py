@@ -0,0 +1,354 @@
+"""
+这是一个Python文件，其中包含两个类 `FaultPlan`、`MockGetfileHandler` 和三个函数 `parse_code_rates`、`start_mock_server`、`main`。
+
+这个模块是城通 `webapi.ctfile.com/getfile.php` 接口的本地替身，供性能测试和故障测试使用。服务只实现解析链接用到的那一个接口，返回与真实接口格式相同的 JSON：`code` 为 200 时 `file.vip_dx_url` 为根据文件名生成的下载地址，否则只有错误代码。
+
+类 `FaultPlan` 描述要注入的故障，所有随机数都来自同一个带种子的随机数生成器，相同参数下每次运行的故障分布相同：
+- 响应延迟：支持固定（fixed）、均匀（uniform）、正态（normal）、对数正态（lognormal）和指数（exponential）分布。
+- 错误代码：按比例返回 401、404、503 等代码。代码由文件名的哈希值决定，同一个链接无论请求多少次、以什么顺序请求，结果都相同，方便校验缓存和重试逻辑；指定的 token 总是返回 -1，用于测试令牌池剔除失效 token。
+- 限流：累计收到 N 个请求后，接下来 M 秒内全部返回指定的 HTTP 状态码（默认 429），之后重新计数，循环往复。
+- 连接重置：按比例不返回响应，直接以 RST 关闭连接。
+- 格式错误：按比例返回无法解析的 JSON。
+
+故障注入计划在 `stats` 属性中统计每种响应的数量，服务退出时打印到标准错误。
+
+函数 `start_mock_server` 在后台线程中启动服务并返回接口地址，函数 `main` 是命令行入口，启动后把接口地址打印到标准输出的第一行，方便其他进程读取。
+
+使用示例：
+
+```bash
+python -m benchmark.mock_server --port 8800 --latency 20 --jitter 5
+python -m benchmark.mock_server --latency-dist lognormal --codes 404=0.05,401=0.02 --throttle-after 500 --throttle-for 5 --reset-rate 0.01
+```
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import argparse
+import json
+import math
+import random
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal', 'exponential')
+
+
+class FaultPlan:
+    """
+    故障注入计划类。
+
+    该类根据参数决定每个请求的延迟和响应方式，可以被多个线程同时使用。
+    """
+
+    def __init__(self, latency: float = 0.02, jitter: float = 0.005, distribution: str = 'uniform', codes: Optional[Dict[str, float]] = None,
+                 bad_tokens: Sequence[str] = (), throttle_after: int = 0, throttle_for: float = 0.0, throttle_status: int = 429,
+                 reset_rate: float = 0.0, malformed_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        初始化故障注入计划。
+
+        :param latency: 平均响应延迟，单位是秒
+        :type latency: float
+        :param jitter: 延迟的离散程度，单位是秒。均匀分布时为抖动范围，正态和对数正态分布时为标准差
+        :type jitter: float
+        :param distribution: 延迟分布，可选 fixed、uniform、normal、lognormal、exponential
+        :type distribution: str
+        :param codes: 错误代码及其比例，例如 {'404': 0.05}
+        :type codes: Optional[Dict[str, float]]
+        :param bad_tokens: 总是返回 -1 的 token
+        :type bad_tokens: Sequence[str]
+        :param throttle_after: 累计收到多少个请求后开始限流，为 0 时不限流
+        :type throttle_after: int
+        :param throttle_for: 每次限流的持续时间，单位是秒
+        :type throttle_for: float
+        :param throttle_status: 限流期间返回的 HTTP 状态码
+        :type throttle_status: int
+        :param reset_rate: 连接重置的比例
+        :type reset_rate: float
+        :param malformed_rate: 返回格式错误 JSON 的比例
+        :type malformed_rate: float
+        :param seed: 随机数种子，为 None 时每次运行结果不同
+        :type seed: Optional[int]
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f'unknown latency distribution: {distribution}')
+        self.latency = latency
+        self.jitter = jitter
+        self.distribution = distribution
+        self.codes = dict(codes or {})
+        self.bad_tokens = set(bad_tokens)
+        self.throttle_after = throttle_after
+        self.throttle_for = throttle_for
+        self.throttle_status = throttle_status
+        self.reset_rate = reset_rate
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+        self.seed = seed if seed is not None else 0
+        self.lock = threading.Lock()
+        self.count = 0
+        self.throttled_until = 0.0
+        self.stats = Counter()
+
+    def sample_latency(self) -> float:
+        """
+        按延迟分布抽取一个延迟。
+
+        :rtype: float
+        :return: 延迟，单位是秒，不小于 0
+        """
+        with self.lock:
+            if self.distribution == 'fixed':
+                value = self.latency
+            elif self.distribution == 'uniform':
+                value = self.latency + self.random.uniform(-self.jitter, self.jitter)
+            elif self.distribution == 'normal':
+                value = self.random.gauss(self.latency, self.jitter)
+            elif self.distribution == 'exponential':
+                value = self.random.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+            else:
+                # 对数正态分布：按期望的均值和标准差换算出底层正态分布的参数
+                if self.latency <= 0:
+                    value = 0.0
+                else:
+                    sigma2 = math.log(1 + (self.jitter / self.latency) ** 2)
+                    mu = math.log(self.latency) - sigma2 / 2
+                    value = self.random.lognormvariate(mu, sigma2 ** 0.5)
+        return max(value, 0.0)
+
+    def throttled(self) -> bool:
+        """
+        累计请求数量并判断当前是否处于限流期。
+
+        :rtype: bool
+        :return: 处于限流期时返回 True
+        """
+        if not self.throttle_after:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            if now < self.throttled_until:
+                return True
+            self.count += 1
+            if self.count > self.throttle_after:
+                self.count = 0
+                self.throttled_until = now + self.throttle_for
+                return True
+            return False
+
+    def chance(self, rate: float) -> bool:
+        """
+        按比例随机决定是否发生某种故障。
+
+        :param rate: 发生的比例
+        :type rate: float
+        :rtype: bool
+        :return: 发生时返回 True
+        """
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def code_for(self, file: str, token: str) -> str:
+        """
+        决定一个链接的返回代码。同一个文件名总是得到相同的代码。
+
+        :param file: 文件名
+        :type file: str
+        :param token: 用户 token
+        :type token: str
+        :rtype: str
+        :return: 返回代码，成功时为 '200'
+        """
+        if token in self.bad_tokens:
+            return '-1'
+        position = zlib.crc32(f'{self.seed}:{file}'.encode('utf-8')) / 2 ** 32
+        for code, rate in self.codes.items():
+            if position < rate:
+                return code
+            position -= rate
+        return '200'
+
+    def decide(self, file: str, token: str) -> Tuple[float, str]:
+        """
+        决定一个请求的延迟和响应方式。
+
+        :param file: 文件名
+        :type file: str
+        :param token: 用户 token
+        :type token: str
+        :rtype: Tuple[float, str]
+        :return: 延迟和响应方式。响应方式为 'throttle'、'reset'、'malformed' 或返回代码
+        """
+        if self.throttled():
+            outcome = 'throttle'
+        elif self.chance(self.reset_rate):
+            outcome = 'reset'
+        elif self.chance(self.malformed_rate):
+            outcome = 'malformed'
+        else:
+            outcome = self.code_for(file, token)
+        with self.lock:
+            self.stats[outcome] += 1
+        return self.sample_latency(), outcome
+
+
+class MockGetfileHandler(BaseHTTPRequestHandler):
+    """
+    模拟 getfile.php 接口的请求处理类。
+
+    故障注入计划保存在 server.plan 属性中。
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # 响应头和响应体分两次写出，不关闭 Nagle 算法时每个请求会额外等待约 40 毫秒的延迟确认
+    disable_nagle_algorithm = True
+
+    def send_body(self, status: int, body: bytes) -> None:
+        """
+        发送响应。
+
+        :param status: HTTP 状态码
+        :type status: int
+        :param body: 响应体
+        :type body: bytes
+        :rtype: None
+        """
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        """
+        处理 GET 请求，按故障注入计划等待并返回响应。
+
+        :rtype: None
+        """
+        query = parse_qs(urlparse(self.path).query)
+        file = query.get('f', [''])[0]
+        token = query.get('token', [''])[0]
+        delay, outcome = self.server.plan.decide(file, token)
+        if delay > 0:
+            time.sleep(delay)
+
+        if outcome == 'reset':
+            # SO_LINGER 设为 0 后关闭连接，客户端收到 RST
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            self.close_connection = True
+            return
+        if outcome == 'throttle':
+            self.send_body(self.server.plan.throttle_status, b'{"code": 429, "message": "too many requests"}')
+        elif outcome == 'malformed':
+            self.send_body(200, b'{"code": 200, "file": {"vip_dx_url": ')
+        elif outcome == '200':
+            self.send_body(200, json.dumps({'code': 200, 'file': {'vip_dx_url': f'https://mock.ctfile.local/dl/{file}'}}).encode('utf-8'))
+        else:
+            self.send_body(200, json.dumps({'code': int(outcome), 'message': 'mock error'}).encode('utf-8'))
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        不输出访问日志，避免影响测试结果。
+
+        :rtype: None
+        """
+
+
+def parse_code_rates(text: str) -> Dict[str, float]:
+    """
+    解析错误代码比例参数。
+
+    :param text: 形如 "404=0.05,401=0.02" 的字符串
+    :type text: str
+    :rtype: Dict[str, float]
+    :return: 错误代码及其比例
+    """
+    codes = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        code, _, rate = item.partition('=')
+        codes[code.strip()] = float(rate)
+    if sum(codes.values()) > 1:
+        raise ValueError('the sum of code rates must not exceed 1')
+    return codes
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, latency: float = 0.02, jitter: float = 0.005,
+                      plan: Optional[FaultPlan] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    在后台线程中启动模拟服务。
+
+    :param host: 监听地址
+    :type host: str
+    :param port: 监听端口，为 0 时随机选择
+    :type port: int
+    :param latency: 平均响应延迟，单位是秒，提供 plan 时忽略
+    :type latency: float
+    :param jitter: 延迟抖动范围，单位是秒，提供 plan 时忽略
+    :type jitter: float
+    :param plan: 故障注入计划，为 None 时只有均匀分布的延迟，没有故障
+    :type plan: Optional[FaultPlan]
+    :rtype: Tuple[ThreadingHTTPServer, str]
+    :return: 服务实例和接口地址
+    """
+    server = ThreadingHTTPServer((host, port), MockGetfileHandler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    server.plan = plan or FaultPlan(latency, jitter)
+    threading.Thread(target=server.serve_forever, name='MockGetfile', daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/getfile.php'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    模拟服务的命令行入口。
+
+    :param argv: 命令行参数，为 None 时使用 sys.argv
+    :type argv: Optional[List[str]]
+    :rtype: int
+    :return: 退出码
+    """
+    parser = argparse.ArgumentParser(description='本地模拟的 getfile.php 服务，支持故障注入')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址，默认为 127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='监听端口，默认随机选择')
+    parser.add_argument('--latency', type=float, default=20, help='平均响应延迟（毫秒），默认为 20')
+    parser.add_argument('--jitter', type=float, default=5, help='延迟抖动范围或标准差（毫秒），默认为 5')
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='uniform', help='延迟分布，默认为 uniform')
+    parser.add_argument('--codes', type=parse_code_rates, default={}, help='错误代码比例，例如 404=0.05,401=0.02,503=0.01。-1 表示 token 失效，解析引擎会换用其他 token 并剔除连续失败的 token，通常应使用 --bad-tokens')
+    parser.add_argument('--bad-tokens', default='', help='总是返回 -1 的 token，多个用英文逗号分隔')
+    parser.add_argument('--throttle-after', type=int, default=0, help='累计收到多少个请求后开始限流，默认不限流')
+    parser.add_argument('--throttle-for', type=float, default=5, help='每次限流的持续时间（秒），默认为 5')
+    parser.add_argument('--throttle-status', type=int, default=429, help='限流期间返回的 HTTP 状态码，默认为 429')
+    parser.add_argument('--reset-rate', type=float, default=0.0, help='连接重置的比例，默认为 0')
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help='返回格式错误 JSON 的比例，默认为 0')
+    parser.add_argument('--seed', type=int, default=0, help='随机数种子，默认为 0')
+    args = parser.parse_args(argv)
+
+    plan = FaultPlan(args.latency / 1000, args.jitter / 1000, args.latency_dist, args.codes, [token for token in args.bad_tokens.split(',') if token],
+                     args.throttle_after, args.throttle_for, args.throttle_status, args.reset_rate, args.malformed_rate, args.seed)
+    server, url = start_mock_server(args.host, args.port, plan=plan)
+    print(url, flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(json.dumps(dict(plan.stats), ensure_ascii=False), file=sys.stderr, flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
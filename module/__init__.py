@@ -5,10 +5,29 @@ from .settings import *
 from .process_input import process_input
 from .logging_config import logging_config
 from .read_file_to_list import read_file_to_list
+from .iter_links import iter_links, count_lines
 from .write_list_to_file import write_list_to_file
 from .init_config import init_config
+from .merge_config import merge_config
+from .metrics import Metrics, get_metrics, write_metrics_file
+from .run_profiler import RunProfiler, classify_stack
+from .http_client import get_http_client, create_async_client
+from .rate_limiter import RateLimiter
+from .throttle_detector import ThrottleDetector
+from .token_pool import TokenPool
 from .request_url import request_url
 from .filter_correct_link import filter_correct_link
 from .get_file_info import get_file_info
+from .parse_link import LinkRecord, RejectReason, LinkRejection, parse_link, parse_many
+from .canonical_key import canonical_key
+from .extract_links import extract_links, extract_links_from_file, extract_links_to_file
+from .format_result import format_result
+from .result_store import ResultStatus, ResultRecord, ResultStore
 from .request_download_link import request_download_link
 from .get_resource_path import get_resource_path
+from .link_cache import LinkCache
+from .job_journal import JobJournal
+from .proxy_pool import ProxyPool
+from .link_resolver import LinkResolver
+from .job_queue import ResolveJob, JobQueue
+from .resolve_many import resolve_many
@@ -0,0 +1,29 @@
+"""
+这是一个Python文件，其中包含一个函数：canonical_key。
+
+函数 canonical_key 用于计算城通网盘链接的规范键。同一个文件常常以不同的形式出现在输入中，例如 `url1` 和 `url99` 等不同的子域名、首尾多余的空白，或者 `?p=` 和空格两种密码写法。这些链接在字符串上各不相同，但解析出的文件名和访问密码是一样的。函数用 `parse_link` 解析出文件名和访问密码，以二者组成的元组作为规范键，解析引擎据此合并重复的请求。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from .parse_link import LinkRecord, parse_link
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_key(link: str) -> Optional[Tuple[str, str]]:
+    """
+    计算链接的规范键。
+
+    :param link: 城通网盘链接
+    :type link: str
+    :rtype: Optional[Tuple[str, str]]
+    :return: 由文件名和访问密码组成的元组，不支持的链接返回 None
+    """
+    record = parse_link(link)
+    return (record.file, record.passwd) if isinstance(record, LinkRecord) else None
@@ -0,0 +1,152 @@
+"""
+这是一个Python文件，其中包含三个函数：`extract_links`、`extract_links_from_file` 和 `extract_links_to_file`。
+
+函数 `extract_links` 用于从任意文本中批量提取城通网盘链接，例如论坛网页、HTML 导出文件和聊天记录。这些文档中的链接往往夹在一行文字中间，访问密码写在链接附近，形如 "提取码: xxxx"。函数使用一个预先编译的字节正则表达式，一次扫描同时匹配链接和密码提示，不需要先按行切分文档。函数 `extract_links_from_file` 扫描文件时使用内存映射，几百 MB 的文档也不会整体读入内存。
+
+每个链接的访问密码按以下顺序确定：链接自带的 `?p=` 参数；链接之后 `EXTRACT_PASSCODE_WINDOW` 字节以内、下一个链接之前出现的密码提示。HTML 中同一个链接常常在 href 属性和显示文字里连续出现两次，文件名相同的相邻链接会合并为一条。
+
+提取结果是 `LinkRecord`，其中的 `line` 是整理后的标准链接，可以直接交给解析引擎。
+
+函数 `extract_links_to_file` 把提取结果逐行写入文本文件，用于处理不适合载入文本框的大文件。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import mmap
+import os
+import re
+import string
+from typing import Iterator, Optional, Union
+
+from .parse_link import LinkRecord
+from .settings import EXTRACT_PASSCODE_WINDOW
+
+logger = logging.getLogger(__name__)
+
+PASSCODE_KEYWORDS = ['提取码', '提取密码', '访问码', '访问密码', '密码', '口令']
+PASSCODE_KEYWORDS_ASCII = ['passcode', 'password', 'pwd']
+
+# 先用前瞻检查首字节，跳过不可能匹配的位置，比直接尝试每个分支快得多
+FIRST_BYTES = {b'c'[0]} | {keyword.encode('utf-8')[0] for keyword in PASSCODE_KEYWORDS} | \
+              {ord(char) for keyword in PASSCODE_KEYWORDS_ASCII for char in (keyword[0].lower(), keyword[0].upper())}
+TOKEN_PATTERN = re.compile(
+    rb'(?=[' + b''.join(re.escape(bytes([byte])) for byte in sorted(FIRST_BYTES)) + rb'])'
+    rb'(?:ctfile\.com/f/(\d+-\d+-\w+)(?:\?p=(\w+))?'
+    rb'|(?:' + b'|'.join(re.escape(keyword.encode('utf-8')) for keyword in PASSCODE_KEYWORDS) +
+    rb'|(?i:' + '|'.join(PASSCODE_KEYWORDS_ASCII).encode('ascii') + rb'))'
+    rb'\s*(?:[:=]|\xef\xbc\x9a)?\s*([A-Za-z0-9]{2,12})(?![A-Za-z0-9./]))'
+)
+HOST_BYTES = (string.ascii_letters + string.digits + '_.-').encode('ascii')
+HOST_LOOKBEHIND = 64
+
+
+def make_record(host: bytes, file: bytes, passwd: Optional[bytes]) -> LinkRecord:
+    """
+    根据匹配结果生成标准链接记录。
+
+    :param host: 域名
+    :type host: bytes
+    :param file: 文件名
+    :type file: bytes
+    :param passwd: 访问密码，没有时为 None
+    :type passwd: Optional[bytes]
+    :rtype: LinkRecord
+    :return: 链接记录
+    """
+    host_text, file_text = host.decode('ascii').lower(), file.decode('ascii')
+    passwd_text = passwd.decode('ascii') if passwd else ''
+    line = f'https://{host_text}/f/{file_text}' + (f'?p={passwd_text}' if passwd_text else '')
+    return LinkRecord(host_text, file_text, passwd_text, line)
+
+
+def scan(data: Union[bytes, mmap.mmap]) -> Iterator[LinkRecord]:
+    """
+    扫描字节数据，按出现顺序产出链接记录。
+
+    :param data: 文档内容
+    :type data: Union[bytes, mmap.mmap]
+    :rtype: Iterator[LinkRecord]
+    :return: 链接记录
+    """
+    pending = None
+    for match in TOKEN_PATTERN.finditer(data):
+        file, inline_passwd, hint_passwd = match.groups()
+        if file is None:
+            # 密码提示只属于前面最近的、还没有密码的链接
+            if pending and not pending[2] and match.start() - pending[3] <= EXTRACT_PASSCODE_WINDOW:
+                yield make_record(pending[0], pending[1], hint_passwd)
+                pending = None
+            continue
+
+        # 正则从 ctfile.com 开始匹配，避免在每个字符上尝试匹配域名，找到后再向前取出子域名
+        start = match.start()
+        chunk = data[max(start - HOST_LOOKBEHIND, 0):start]
+        prefix = chunk[len(chunk.rstrip(HOST_BYTES)):]
+        if prefix and not prefix.endswith(b'.'):
+            continue
+        host = prefix + b'ctfile.com'
+
+        if pending and pending[1] == file:
+            # 相邻的同一个链接只保留一条，后出现的密码补充到前面
+            if inline_passwd and not pending[2]:
+                pending = (pending[0], file, inline_passwd, match.end())
+            continue
+        if pending:
+            yield make_record(*pending[:3])
+        pending = (host, file, inline_passwd, match.end())
+    if pending:
+        yield make_record(*pending[:3])
+
+
+def extract_links(text: str) -> Iterator[LinkRecord]:
+    """
+    从文本中提取城通网盘链接。
+
+    :param text: 要扫描的文本
+    :type text: str
+    :rtype: Iterator[LinkRecord]
+    :return: 按出现顺序排列的链接记录
+    """
+    return scan(text.encode('utf-8', errors='replace'))
+
+
+def extract_links_from_file(source_path: Union[str, os.PathLike]) -> Iterator[LinkRecord]:
+    """
+    使用内存映射扫描文件，提取城通网盘链接。
+
+    :param source_path: 待扫描的文件路径
+    :type source_path: Union[str, os.PathLike]
+    :rtype: Iterator[LinkRecord]
+    :return: 按出现顺序排列的链接记录
+    """
+    with open(source_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from scan(data)
+
+
+def extract_links_to_file(source_path: Union[str, os.PathLike], target_path: Union[str, os.PathLike]) -> Optional[int]:
+    """
+    从文件中提取城通网盘链接，逐行写入文本文件。
+
+    :param source_path: 待扫描的文件路径
+    :type source_path: Union[str, os.PathLike]
+    :param target_path: 输出文件路径
+    :type target_path: Union[str, os.PathLike]
+    :rtype: Optional[int]
+    :return: 写出的链接数量，出错时返回 None
+    """
+    try:
+        count = 0
+        with open(target_path, 'w', encoding='utf-8') as file:
+            for record in extract_links_from_file(source_path):
+                file.write(record.line + '\n')
+                count += 1
+        return count
+    except (OSError, ValueError) as e:
+        logger.error(f"An error occurred while extracting links from '{source_path}': {e}")
+        return None
@@ -0,0 +1,45 @@
+"""
+这是一个Python文件，其中包含一个函数：format_result。
+
+函数 format_result 用于把解析结果转换成显示给用户的文字。解析成功时直接返回下载链接，否则根据错误代码返回对应的提示信息，并在末尾附上原始链接。图形界面和命令行使用同一套提示信息。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Optional
+
+from .settings import RESULT_UNSUPPORTED
+
+logger = logging.getLogger(__name__)
+
+
+def format_result(result: Optional[str], link: str) -> str:
+    """
+    把解析结果转换成提示信息。
+
+    :param result: 解析结果
+    :type result: Optional[str]
+    :param link: 对应的城通网盘链接
+    :type link: str
+    :rtype: str
+    :return: 下载链接或提示信息
+    """
+    if result == RESULT_UNSUPPORTED:
+        return f'不支持的链接：{link}'
+    elif not result:
+        return f'获取下载失败：{link}'
+    elif result.startswith("https://"):
+        return result
+    elif result == '-1':
+        return f'没获取到高速链接，请重新登录获取 token：{link}'
+    elif result == '401':
+        return f'访问密码缺失或不正确：{link}'
+    elif result == '404':
+        return f'文件已删除：{link}'
+    elif result == '503':
+        return f'文件已失效：{link}'
+    else:
+        return f'错误代码 {result}：{link}'
@@ -0,0 +1,243 @@
+"""
+这是一个Python文件，其中包含一个类 `DnsCache` 和两个函数：`get_http_client`、`create_async_client`。
+
+所有访问城通服务器和检查更新的请求都通过本模块提供的客户端发出。函数 `get_http_client` 返回进程内共享的同步 `httpx.Client`，它带有连接池和长连接，第一次调用时才会创建，之后所有线程复用同一个实例，因此只有第一次请求需要进行 TCP 和 TLS 握手。指定出口代理时，每个代理各有一个共享客户端。函数 `create_async_client` 使用相同的配置创建异步客户端，供异步解析使用。如果安装了 `h2` 库并且开启了 `HTTP2_ENABLED`，客户端会使用 HTTP/2 在同一条连接上复用多个请求。
+
+类 `DnsCache` 把域名解析结果缓存 `DNS_CACHE_TTL` 秒。缓存只装在访问城通服务器的客户端的连接层上：客户端建立新连接时先查缓存，再依次连接解析出的地址，TLS 仍然使用原来的域名校验证书。缓存不会替换 `socket.getaddrinfo`，检查更新和其他库的请求不受影响。连接失败或连接超时时会删除对应的缓存并尝试下一个地址，下次建立连接时重新解析。
+
+httpx 没有公开连接层的参数，缓存通过替换连接池的 `_network_backend` 装上，这依赖 httpx 0.28 和 httpcore 1.0 的内部结构，版本在 `requirements.txt` 中固定。连接池的结构不符合预期时会记录警告并跳过缓存，请求照常发出。
+
+检查更新的客户端不使用域名解析缓存，也不读取系统的代理环境变量，和原来的 `requests.Session(trust_env=False)` 一致。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import importlib.util
+import logging
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import anyio
+import httpcore
+import httpx
+
+from .settings import DNS_CACHE_TTL, HTTP2_ENABLED, HTTP_KEEPALIVE_EXPIRY, HTTP_POOL_SIZE, REQUEST_HEAD
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Tuple[Optional[str], bool, bool], httpx.Client] = {}
+_client_lock = threading.Lock()
+
+
+class DnsCache:
+    """
+    域名解析缓存类。
+
+    该类保存域名和端口对应的地址，过期后重新解析，可以被多个线程同时使用。
+    """
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL):
+        """
+        :param ttl: 缓存有效期，单位是秒
+        :type ttl: float
+        """
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    def lookup(self, host: str, port: int) -> Optional[List[str]]:
+        """
+        查询缓存中的地址。
+
+        :param host: 域名
+        :type host: str
+        :param port: 端口
+        :type port: int
+        :rtype: Optional[List[str]]
+        :return: 未过期的地址列表，没有缓存时返回 None
+        """
+        with self.lock:
+            entry = self.entries.get((host, port))
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """
+        解析域名，优先使用缓存。
+
+        :param host: 域名
+        :type host: str
+        :param port: 端口
+        :type port: int
+        :rtype: List[str]
+        :return: 地址列表
+        :raise OSError: 解析失败
+        """
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            with self.lock:
+                self.entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        """
+        删除缓存，用于连接失败之后。
+
+        :param host: 域名
+        :type host: str
+        :param port: 端口
+        :type port: int
+        :rtype: None
+        """
+        with self.lock:
+            self.entries.pop((host, port), None)
+
+
+_dns_cache = DnsCache()
+
+
+class _CachedDnsBackend(httpcore.NetworkBackend):
+    """
+    同步连接层，连接前通过 DnsCache 解析域名，依次尝试解析出的地址，其余操作交给原来的连接层。
+    """
+
+    def __init__(self, backend: httpcore.NetworkBackend):
+        self.backend = backend
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = _dns_cache.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        for index, address in enumerate(addresses):
+            try:
+                return self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                _dns_cache.invalidate(host, port)
+                if index == len(addresses) - 1:
+                    raise
+                logger.debug(f'Unable to connect to {address}:{port} for {host}, trying the next address')
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds):
+        self.backend.sleep(seconds)
+
+
+class _AsyncCachedDnsBackend(httpcore.AsyncNetworkBackend):
+    """
+    异步连接层，未命中缓存时在工作线程中解析域名，不阻塞事件循环。
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self.backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = _dns_cache.lookup(host, port) or await anyio.to_thread.run_sync(_dns_cache.resolve, host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        for index, address in enumerate(addresses):
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                _dns_cache.invalidate(host, port)
+                if index == len(addresses) - 1:
+                    raise
+                logger.debug(f'Unable to connect to {address}:{port} for {host}, trying the next address')
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+
+def _use_dns_cache(client: Union[httpx.Client, httpx.AsyncClient]) -> None:
+    """
+    给客户端的所有连接池装上域名解析缓存，包括从环境变量读取的代理。
+
+    :param client: 同步或异步客户端
+    :type client: Union[httpx.Client, httpx.AsyncClient]
+    :rtype: None
+    """
+    # httpx 没有公开连接层的参数，只能替换连接池的 _network_backend
+    for transport in (client._transport, *client._mounts.values()):
+        pool = getattr(transport, '_pool', None)
+        if pool is None:
+            continue
+        if not hasattr(pool, '_network_backend'):
+            logger.warning(f'Unsupported httpcore {httpcore.__version__}, DNS cache disabled')
+            return
+        if isinstance(pool._network_backend, httpcore.AsyncNetworkBackend):
+            pool._network_backend = _AsyncCachedDnsBackend(pool._network_backend)
+        else:
+            pool._network_backend = _CachedDnsBackend(pool._network_backend)
+
+
+def _client_options(pool_size: int, proxy: Optional[str]) -> dict:
+    """
+    生成同步和异步客户端共用的配置。
+
+    :param pool_size: 连接池大小
+    :type pool_size: int
+    :param proxy: 出口代理地址，为 None 时直接连接
+    :type proxy: Optional[str]
+    :rtype: dict
+    :return: 客户端构造参数
+    """
+    http2 = HTTP2_ENABLED and importlib.util.find_spec('h2') is not None
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size, keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+    return dict(headers=REQUEST_HEAD, verify=False, timeout=15, follow_redirects=True, limits=limits, http2=http2, proxy=proxy)
+
+
+def get_http_client(proxy: Optional[str] = None, cache_dns: bool = True, trust_env: bool = True) -> httpx.Client:
+    """
+    获取共享的同步 HTTP 客户端。
+
+    :param proxy: 出口代理地址，为 None 时直接连接
+    :type proxy: Optional[str]
+    :param cache_dns: 是否使用域名解析缓存，访问城通服务器时使用，检查更新时不使用
+    :type cache_dns: bool
+    :param trust_env: 是否读取 HTTP_PROXY 等环境变量，检查更新时不读取
+    :type trust_env: bool
+    :rtype: httpx.Client
+    :return: 该配置对应的进程内唯一的客户端实例
+    """
+    key = (proxy, cache_dns, trust_env)
+    client = _clients.get(key)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(key)
+            if client is None:
+                options = _client_options(HTTP_POOL_SIZE, proxy)
+                client = httpx.Client(**options, trust_env=trust_env)
+                if cache_dns:
+                    _use_dns_cache(client)
+                _clients[key] = client
+                logger.debug(f"Created shared HTTP client, proxy: {proxy}, http2: {options['http2']}, dns cache: {cache_dns}")
+    return client
+
+
+def create_async_client(pool_size: int = HTTP_POOL_SIZE, proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    使用共享配置创建异步 HTTP 客户端，由调用方负责关闭。客户端使用域名解析缓存。
+
+    :param pool_size: 连接池大小
+    :type pool_size: int
+    :param proxy: 出口代理地址，为 None 时直接连接
+    :type proxy: Optional[str]
+    :rtype: httpx.AsyncClient
+    :return: 异步客户端实例
+    """
+    client = httpx.AsyncClient(**_client_options(pool_size, proxy))
+    _use_dns_cache(client)
+    return client
@@ -0,0 +1,73 @@
+"""
+这是一个Python文件，其中包含两个函数：`iter_links` 和 `count_lines`。
+
+函数 `iter_links` 用于逐行读取链接，它接受文件路径或已经打开的文本流。函数每次只读取一行，去除首尾空白后跳过空行和重复行，再把链接交给调用方，因此可以在内存占用有限的情况下处理上百万行的链接文件。判断重复时只保存最近 `DEDUP_CACHE_SIZE` 个不同行的 8 字节摘要，而不是整行文本，内存占用不随行数增长；相隔更远的重复行由解析引擎按 `canonical_key` 合并，不会重复请求。
+
+函数 `count_lines` 以二进制块的方式快速统计文件行数，用于在解析开始前估算进度条的总数。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Iterator, TextIO, Union
+
+from .settings import DEDUP_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+def iter_links(source: Union[str, os.PathLike, TextIO]) -> Iterator[str]:
+    """
+    逐行读取链接，跳过空行和最近 DEDUP_CACHE_SIZE 个不同行中出现过的重复行。
+
+    :param source: 文本文件的路径，或者已经打开的文本流
+    :type source: Union[str, os.PathLike, TextIO]
+    :rtype: Iterator[str]
+    :return: 去除首尾空白后的链接
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8', errors='replace', buffering=1024 * 1024) as file:
+            yield from iter_links(file)
+        return
+
+    # 最近出现过的行的摘要，超出 DEDUP_CACHE_SIZE 条时删除最久未出现的记录
+    seen = OrderedDict()
+    for line in source:
+        line = line.strip()
+        if not line:
+            continue
+        digest = hashlib.blake2b(line.encode('utf-8', errors='replace'), digest_size=8).digest()
+        if digest in seen:
+            seen.move_to_end(digest)
+            continue
+        seen[digest] = None
+        if len(seen) > DEDUP_CACHE_SIZE:
+            seen.popitem(last=False)
+        yield line
+
+
+def count_lines(target_path: Union[str, os.PathLike]) -> int:
+    """
+    统计文件行数。
+
+    :param target_path: 文本文件的路径
+    :type target_path: Union[str, os.PathLike]
+    :rtype: int
+    :return: 文件行数，出错时返回 0
+    """
+    try:
+        count = 0
+        last = b'\n'
+        with open(target_path, 'rb') as file:
+            while chunk := file.read(1024 * 1024):
+                count += chunk.count(b'\n')
+                last = chunk[-1:]
+        return count + (last != b'\n')
+    except OSError as e:
+        logger.error(f"An error occurred while counting lines in '{target_path}': {e}")
+        return 0
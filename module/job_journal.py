@@ -0,0 +1,135 @@
+"""
+这是一个Python文件，其中包含一个类：`JobJournal`。
+
+类 `JobJournal` 是任务日志，用于让中断的批量解析任务可以继续运行。每条链接解析完成时，日志以 JSON 行的形式把链接和结果追加到文件末尾，并立即刷新到操作系统。每写入 `JOURNAL_FSYNC_RECORDS` 条记录或距离上次同步超过 `JOURNAL_FSYNC_INTERVAL` 秒时调用 `os.fsync` 同步到磁盘，断电或系统崩溃时最多丢失最近一小段记录，关闭日志时再同步一次。程序崩溃、窗口关闭或中途停止后，以继续模式打开日志会先读取已有记录，再次解析这些链接时直接返回记录的结果，只请求尚未完成的链接。重试部分链接时以追加模式打开日志，不读取也不清空已有记录，新的结果写在后面，继续运行时同一链接以最后一条记录为准。
+
+只有确定的结果会被记录，包括下载链接、错误代码和不支持的链接。请求失败、需要重新登录和限流时的结果不会记录，继续运行时会重新请求。进程崩溃时最后一行可能不完整，读取时会跳过无法解析的行，并在追加新记录前补上换行。
+
+该类可以被多个线程同时使用，所有文件操作都由同一把锁保护。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from .settings import JOURNAL_FSYNC_INTERVAL, JOURNAL_FSYNC_RECORDS, RESULT_THROTTLED
+
+logger = logging.getLogger(__name__)
+
+
+class JobJournal:
+    """
+    任务日志类。
+
+    该类把每条链接的解析结果追加到日志文件，并在继续运行时返回已经完成的结果。
+    """
+
+    def __init__(self, target_path: Union[str, os.PathLike], resume: bool = False, append: bool = False):
+        """
+        打开任务日志。
+
+        :param target_path: 日志文件的路径，可以是字符串或 os.PathLike 对象。
+        :type target_path: Union[str, os.PathLike]
+        :param resume: 为 True 时读取已有记录并在末尾追加，为 False 时清空日志开始新任务
+        :type resume: bool
+        :param append: 为 True 时在末尾追加但不读取已有记录，用于重试部分链接，新的结果在继续任务时覆盖旧的记录
+        :type append: bool
+        """
+        self.lock = threading.Lock()
+        self.done: Dict[str, str] = self.load(target_path) if resume else {}
+        self.file = open(target_path, 'a' if resume or append else 'w', encoding='utf-8')
+        self.unsynced = 0
+        self.synced_at = time.monotonic()
+        if (resume or append) and self.file.tell() > 0:
+            with open(target_path, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    self.file.write('\n')
+        if self.done:
+            logger.info(f'Resuming job with {len(self.done)} finished links from {target_path}')
+
+    @staticmethod
+    def load(target_path: Union[str, os.PathLike]) -> Dict[str, str]:
+        """
+        读取日志中的已完成记录。
+
+        :param target_path: 日志文件的路径
+        :type target_path: Union[str, os.PathLike]
+        :rtype: Dict[str, str]
+        :return: 以链接为键、解析结果为值的字典，日志不存在时返回空字典
+        """
+        done = {}
+        if not os.path.exists(target_path):
+            return done
+        try:
+            with open(target_path, 'r', encoding='utf-8', errors='replace') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                        done[record['link']] = record['result']
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f'Skipping broken journal line: {line.strip()}')
+        except OSError as e:
+            logger.error(f"An error occurred while reading the job journal: {e}")
+        return done
+
+    def get(self, link: str) -> Optional[str]:
+        """
+        查询链接在本任务中已经完成的结果。
+
+        :param link: 城通网盘链接
+        :type link: str
+        :rtype: Optional[str]
+        :return: 记录的解析结果，没有记录时返回 None
+        """
+        with self.lock:
+            return self.done.get(link)
+
+    def put(self, link: str, result: Optional[str]) -> None:
+        """
+        追加一条解析结果，定期同步到磁盘。请求失败、需要重新登录和限流的结果不会记录。
+
+        :param link: 城通网盘链接
+        :type link: str
+        :param result: 解析结果
+        :type result: Optional[str]
+        :rtype: None
+        """
+        if result in (None, '-1', RESULT_THROTTLED):
+            return
+        try:
+            with self.lock:
+                if self.file.closed:
+                    return
+                self.done[link] = result
+                self.file.write(json.dumps({'link': link, 'result': result}, ensure_ascii=False) + '\n')
+                self.file.flush()
+                self.unsynced += 1
+                now = time.monotonic()
+                if self.unsynced >= JOURNAL_FSYNC_RECORDS or now - self.synced_at >= JOURNAL_FSYNC_INTERVAL:
+                    os.fsync(self.file.fileno())
+                    self.unsynced = 0
+                    self.synced_at = now
+        except OSError as e:
+            logger.error(f"An error occurred while writing the job journal: {e}")
+
+    def close(self) -> None:
+        """
+        同步并关闭日志文件。
+
+        :rtype: None
+        """
+        try:
+            with self.lock:
+                if not self.file.closed:
+                    os.fsync(self.file.fileno())
+                    self.file.close()
+        except OSError as e:
+            logger.error(f"An error occurred while closing the job journal: {e}")
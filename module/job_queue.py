@@ -0,0 +1,266 @@
+"""
+这是一个Python文件，其中包含两个类：`ResolveJob` 和 `JobQueue`。
+
+类 `ResolveJob` 表示一个批量解析任务，保存任务编号、待解析的链接、按输入顺序排列的解析结果和任务状态。任务状态依次为排队中（queued）、运行中（running），最后变为已完成（done）或已取消（cancelled）。新结果到达或状态改变时会通知所有等待的线程，方便调用方以流的方式实时读取结果。
+
+类 `JobQueue` 是任务队列，所有任务共用同一个 `LinkResolver` 解析引擎，因此共享同一组连接池、令牌限速器、限流检测器和下载链接缓存。提交的任务按先后顺序由后台线程逐个执行，同一时间只有一个任务在请求服务器，不会因为任务数量增加而超出账号的请求限制。已结束的任务最多保留 `SERVER_MAX_JOBS` 个，超出时删除最早结束的任务。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+from .format_result import format_result
+from .link_resolver import LinkResolver
+from .settings import SERVER_MAX_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+class ResolveJob:
+    """
+    批量解析任务类。
+
+    该类保存一个任务的链接、结果和状态，并在结果更新时通知等待的线程。
+    """
+
+    def __init__(self, links: List[str]):
+        """
+        创建任务。
+
+        :param links: 待解析的城通网盘链接
+        :type links: List[str]
+        """
+        self.id = uuid.uuid4().hex
+        self.links = links
+        self.results: List[Tuple[str, Optional[str]]] = []
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.condition = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        """
+        任务是否已经结束。
+
+        :rtype: bool
+        :return: 任务已完成或已取消时返回 True
+        """
+        return self.status in ('done', 'cancelled')
+
+    def is_running(self) -> bool:
+        """
+        任务是否应当继续运行，传给解析引擎使用。
+
+        :rtype: bool
+        :return: 任务未被取消时返回 True
+        """
+        return self.status != 'cancelled'
+
+    def add_result(self, link: str, result: Optional[str]) -> None:
+        """
+        追加一条解析结果并通知等待的线程。
+
+        :param link: 城通网盘链接
+        :type link: str
+        :param result: 解析结果
+        :type result: Optional[str]
+        :rtype: None
+        """
+        with self.condition:
+            self.results.append((link, result))
+            self.condition.notify_all()
+
+    def set_status(self, status: str) -> None:
+        """
+        设置任务状态并通知等待的线程。已取消的任务不会再变为已完成。
+
+        :param status: 新的任务状态
+        :type status: str
+        :rtype: None
+        """
+        with self.condition:
+            if self.status == 'cancelled':
+                return
+            self.status = status
+            if self.finished:
+                self.finished_at = time.time()
+            self.condition.notify_all()
+
+    def wait(self, offset: int, timeout: float) -> bool:
+        """
+        等待新结果到达或任务结束。
+
+        :param offset: 调用方已经读取的结果数量
+        :type offset: int
+        :param timeout: 最长等待时间，单位是秒
+        :type timeout: float
+        :rtype: bool
+        :return: 有新结果或任务已结束时返回 True，超时返回 False
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: len(self.results) > offset or self.finished, timeout)
+
+    def result_items(self, offset: int = 0) -> List[Dict[str, Optional[str]]]:
+        """
+        读取指定位置之后的结果。
+
+        :param offset: 起始位置
+        :type offset: int
+        :rtype: List[Dict[str, Optional[str]]]
+        :return: 由链接、解析结果和提示信息组成的字典列表
+        """
+        with self.condition:
+            results = self.results[offset:]
+        return [{'link': link, 'result': result, 'message': format_result(result, link)} for link, result in results]
+
+    def summary(self) -> Dict[str, object]:
+        """
+        获取任务概况。
+
+        :rtype: Dict[str, object]
+        :return: 任务编号、状态、链接总数、已完成数量和时间
+        """
+        with self.condition:
+            return {'id': self.id, 'status': self.status, 'total': len(self.links), 'completed': len(self.results),
+                    'created_at': self.created_at, 'finished_at': self.finished_at}
+
+
+class JobQueue:
+    """
+    任务队列类。
+
+    该类在后台线程中按提交顺序执行任务，所有任务共用同一个解析引擎。
+    """
+
+    def __init__(self, resolver: LinkResolver, max_jobs: int = SERVER_MAX_JOBS):
+        """
+        创建任务队列并启动后台线程。
+
+        :param resolver: 所有任务共用的解析引擎
+        :type resolver: LinkResolver
+        :param max_jobs: 最多保留的已结束任务数量
+        :type max_jobs: int
+        """
+        self.resolver = resolver
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, ResolveJob] = OrderedDict()
+        self.queue = deque()
+        self.lock = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name='JobQueue', daemon=True)
+        self.thread.start()
+
+    def submit(self, links: List[str]) -> ResolveJob:
+        """
+        提交任务。
+
+        :param links: 待解析的城通网盘链接
+        :type links: List[str]
+        :rtype: ResolveJob
+        :return: 新建的任务
+        """
+        job = ResolveJob(links)
+        with self.lock:
+            self.jobs[job.id] = job
+            self.queue.append(job)
+            self.prune()
+            self.lock.notify()
+        logger.info(f'Job {job.id} submitted with {len(links)} links')
+        return job
+
+    def get(self, job_id: str) -> Optional[ResolveJob]:
+        """
+        查询任务。
+
+        :param job_id: 任务编号
+        :type job_id: str
+        :rtype: Optional[ResolveJob]
+        :return: 对应的任务，不存在时返回 None
+        """
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def all_jobs(self) -> List[ResolveJob]:
+        """
+        列出所有保留的任务。
+
+        :rtype: List[ResolveJob]
+        :return: 按提交顺序排列的任务
+        """
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[ResolveJob]:
+        """
+        取消任务。排队中的任务不会再运行，运行中的任务在途请求完成后停止。
+
+        :param job_id: 任务编号
+        :type job_id: str
+        :rtype: Optional[ResolveJob]
+        :return: 被取消的任务，不存在时返回 None
+        """
+        job = self.get(job_id)
+        if job and not job.finished:
+            job.set_status('cancelled')
+            logger.info(f'Job {job.id} cancelled')
+        return job
+
+    def prune(self) -> None:
+        """
+        删除超出数量限制的已结束任务，调用方需要持有锁。
+
+        :rtype: None
+        """
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda item: item.finished_at)[:max(len(finished) - self.max_jobs, 0)]:
+            del self.jobs[job.id]
+
+    def run(self) -> None:
+        """
+        后台线程的主函数，按提交顺序逐个执行任务。
+
+        :rtype: None
+        """
+        while True:
+            with self.lock:
+                self.lock.wait_for(lambda: self.queue or self.closed)
+                if self.closed:
+                    return
+                job = self.queue.popleft()
+            if job.finished:
+                continue
+
+            job.set_status('running')
+            try:
+                for link, result in self.resolver.resolve_links(job.links, job.is_running):
+                    job.add_result(link, result)
+            except Exception as e:
+                logger.error(f"An error occurred while running job {job.id}: {e}")
+            job.set_status('done')
+            logger.info(f'Job {job.id} finished with status {job.status}')
+            with self.lock:
+                self.prune()
+
+    def close(self) -> None:
+        """
+        停止后台线程并取消所有未结束的任务。
+
+        :rtype: None
+        """
+        with self.lock:
+            self.closed = True
+            jobs = list(self.jobs.values())
+            self.lock.notify_all()
+        for job in jobs:
+            if not job.finished:
+                job.set_status('cancelled')
+        self.thread.join(timeout=5)
@@ -0,0 +1,159 @@
+"""
+这是一个Python文件，其中包含两个函数：`parse_response` 和 `settle_request`，以及一个类：`LinkAttempt`。
+
+同步的 `request_download_link` 和异步的 `resolve_many` 只在发送请求的方式上不同，解析响应和请求前后的记账都由本模块完成，两个引擎的行为因此保持一致：
+
+- 函数 `parse_response` 检查 HTTP 状态码并解析 getfile.php 返回的 JSON，代码为 200 时返回下载链接，否则返回错误代码。
+- 函数 `settle_request` 在一次请求结束后调用，负责记录错误日志和运行指标，通知限速器提速或减速，把结果交给限流检测器，并返回这次请求的结果。无法解析的响应不调整速率，也不会让限流检测器解除暂停。
+- 类 `LinkAttempt` 保存一条链接在多次请求之间的状态，负责选择请求路径（token 和出口代理的组合），请求结束后报告 token 池和代理池，并决定是否需要重试。连接不上服务器或代理时换一条路径重试，这类失败只影响代理的健康状况，不算限流。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import time
+from typing import Optional
+
+import httpx
+
+from .metrics import get_metrics
+from .proxy_pool import ProxyPool
+from .rate_limiter import RateLimiter
+from .settings import RESULT_THROTTLED, RESULT_UNREACHABLE, THROTTLE_LINK_RETRIES
+from .throttle_detector import ThrottleDetector, is_connect_error, is_throttle_signal
+from .token_pool import TokenPool
+
+logger = logging.getLogger(__name__)
+
+
+def parse_response(response: httpx.Response) -> str:
+    """
+    解析 getfile.php 的响应。
+
+    :param response: 服务器的响应
+    :type response: httpx.Response
+    :rtype: str
+    :return: 代码为 200 时返回下载链接，否则返回错误代码
+    :raises httpx.HTTPStatusError: HTTP 状态码表示错误
+    :raises KeyError: 响应中缺少需要的字段
+    :raises ValueError: 响应不是合法的 JSON
+    """
+    response.raise_for_status()
+    response_json = response.json()
+    logger.debug(f'response_json: {response_json}')
+    response_json_code = response_json['code']
+    return response_json['file']['vip_dx_url'] if response_json_code == 200 else str(response_json_code)
+
+
+def settle_request(url: str, status: Optional[int], latency: float, limiter: Optional[RateLimiter], detector: Optional[ThrottleDetector],
+                   result: Optional[str] = None, error: Optional[Exception] = None) -> Optional[str]:
+    """
+    记录一次请求的结果，并返回请求结果。
+
+    :param url: 请求的地址
+    :type url: str
+    :param status: HTTP 状态码，没有收到响应时为 None
+    :type status: Optional[int]
+    :param latency: 请求耗时，单位是秒
+    :type latency: float
+    :param limiter: 限速器，为 None 时不调整速率
+    :type limiter: Optional[RateLimiter]
+    :param detector: 限流检测器，为 None 时不检测
+    :type detector: Optional[ThrottleDetector]
+    :param result: parse_response 返回的结果
+    :type result: Optional[str]
+    :param error: 请求或解析时发生的异常，没有异常时为 None
+    :type error: Optional[Exception]
+    :rtype: Optional[str]
+    :return: 服务器返回的下载链接或错误代码；无法解析的响应和网络请求失败返回 None，连接不上服务器或代理时返回 RESULT_UNREACHABLE，需要重试时返回 RESULT_THROTTLED
+    """
+    get_metrics().observe_request(status, latency)
+    if error is None:
+        if limiter:
+            limiter.on_success()
+        if detector:
+            detector.record(False, status, latency)
+        return result
+
+    if isinstance(error, (KeyError, ValueError)):
+        # 无法解析的响应既不说明服务器已经恢复，也不说明被限流，不调整速率，也不解除暂停
+        logger.error(f"Unable to find link {url}: {error}")
+        if detector:
+            detector.skip()
+        return None
+
+    logger.error(f"Unable to send network request to {url}: {error}")
+    if is_connect_error(error):
+        # 连接不上服务器或代理是出口线路的问题，由代理池处理，不调整这条路径的速率和限流状态
+        if detector:
+            detector.skip()
+        return RESULT_UNREACHABLE
+    if limiter:
+        limiter.on_throttle()
+    if detector and detector.record(is_throttle_signal(status, error), status, latency):
+        return RESULT_THROTTLED
+    return None
+
+
+class LinkAttempt:
+    """
+    单条链接的解析过程类。
+
+    该类在一条链接的多次请求之间保存已经换过的 token 和重试次数，本身不发送网络请求。
+    """
+
+    def __init__(self, pool: TokenPool, proxies: ProxyPool):
+        """
+        初始化解析过程。
+
+        :param pool: 共享的 token 池
+        :type pool: TokenPool
+        :param proxies: 共享的出口代理池
+        :type proxies: ProxyPool
+        """
+        self.pool = pool
+        self.proxies = proxies
+        self.tried = set()
+        self.retries = 0
+        self.route = None
+        self.started_at = 0.0
+
+    def begin(self) -> float:
+        """
+        为下一次请求选择请求路径。选中的路径保存在 route 属性中，所有 token 都已换过或被移除时 route 为 None。
+
+        :rtype: float
+        :return: 需要等待的秒数，大于 0 时所有路径都在限流暂停，调用方等待后重新调用
+        """
+        self.route, wait = self.pool.acquire(self.tried, self.proxies.candidates())
+        if self.route is None or wait > 0:
+            return wait
+        self.proxies.acquire(self.route.proxy)
+        self.started_at = time.monotonic()
+        return 0.0
+
+    def finish(self, result: Optional[str]) -> bool:
+        """
+        报告一次请求的结果。返回 -1 时换用其他 token 重试；连接失败和需要重试的请求在路径未处于限流状态时最多重试 THROTTLE_LINK_RETRIES 次。
+
+        :param result: 请求结果
+        :type result: Optional[str]
+        :rtype: bool
+        :return: 需要重试时返回 True
+        """
+        self.proxies.release(self.route.proxy, result != RESULT_UNREACHABLE, time.monotonic() - self.started_at)
+        self.pool.report(self.route.token, result)
+        if result == '-1':
+            self.tried.add(self.route.token)
+            get_metrics().inc('ctfile_retries_total', 'reason="token"')
+            return True
+        if result not in (RESULT_THROTTLED, RESULT_UNREACHABLE):
+            return False
+        if result == RESULT_UNREACHABLE or not self.route.detector.parked:
+            self.retries += 1
+            if self.retries > THROTTLE_LINK_RETRIES:
+                return False
+        get_metrics().inc('ctfile_retries_total', 'reason="throttled"' if result == RESULT_THROTTLED else 'reason="unreachable"')
+        return True
@@ -0,0 +1,196 @@
+"""
+这是一个Python文件，其中包含一个类：`LinkCache`。
+
+类 `LinkCache` 是保存在磁盘上的下载链接缓存，使用 SQLite 存储。解析成功的下载链接以文件名、访问密码和用户 token 作为键，连同解析时间一起保存。城通的下载链接有效期为 12 个小时，缓存只保留 `CACHE_TTL` 秒（默认 11 个小时），过期的记录在读取时视为不存在，并在打开缓存时清理。解析前先查询缓存，重新运行部分失败的任务时只需要请求缺失的链接。
+
+同一个数据库中还保存失效链接：服务器返回 `NEGATIVE_CACHE_TTL` 中列出的错误代码（401 密码错误、404 文件已删除、503 文件已失效）时，以文件名和访问密码作为键记录错误代码，各代码的有效时间分别设置。有效期内再次解析这些链接时直接返回错误代码，不会发出网络请求。
+
+该类可以被多个线程同时使用，所有数据库操作都由同一把锁保护。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Sequence, Union
+
+from .metrics import get_metrics
+from .settings import CACHE_TTL, NEGATIVE_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class LinkCache:
+    """
+    下载链接缓存类。
+
+    该类把解析成功的下载链接保存到 SQLite 数据库，并在有效期内返回缓存结果。
+    """
+
+    def __init__(self, target_path: Union[str, os.PathLike], ttl: float = CACHE_TTL):
+        """
+        打开或创建缓存数据库。
+
+        :param target_path: 数据库文件的路径，可以是字符串或 os.PathLike 对象。
+        :type target_path: Union[str, os.PathLike]
+        :param ttl: 缓存有效时间，单位是秒
+        :type ttl: float
+        """
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(target_path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS links (file TEXT, passwd TEXT, token TEXT, url TEXT, resolved_at REAL, '
+                                    'PRIMARY KEY (file, passwd, token))')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS dead_links (file TEXT, passwd TEXT, code TEXT, checked_at REAL, '
+                                    'PRIMARY KEY (file, passwd))')
+            self.connection.execute('DELETE FROM links WHERE resolved_at < ?', (time.time() - self.ttl,))
+            for code, code_ttl in NEGATIVE_CACHE_TTL.items():
+                self.connection.execute('DELETE FROM dead_links WHERE code = ? AND checked_at < ?', (code, time.time() - code_ttl))
+
+    def get(self, file: str, passwd: str, tokens: Sequence[str]) -> Optional[str]:
+        """
+        查询有效期内的下载链接，任意一个 token 解析过的链接都可以使用。
+
+        :param file: 文件名
+        :type file: str
+        :param passwd: 访问密码
+        :type passwd: str
+        :param tokens: 用户 token
+        :type tokens: Sequence[str]
+        :rtype: Optional[str]
+        :return: 缓存的下载链接，没有缓存或已过期时返回 None
+        """
+        if not tokens:
+            return None
+        try:
+            placeholders = ', '.join('?' * len(tokens))
+            with self.lock:
+                row = self.connection.execute(f'SELECT url FROM links WHERE file = ? AND passwd = ? AND token IN ({placeholders}) AND resolved_at >= ? '
+                                              f'ORDER BY resolved_at DESC', (file, passwd, *tokens, time.time() - self.ttl)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"An error occurred while reading the link cache: {e}")
+            return None
+
+    def put(self, file: str, passwd: str, token: str, url: str) -> None:
+        """
+        保存下载链接，同时删除该链接的失效记录，避免下载链接过期后又返回旧的错误代码。
+
+        :param file: 文件名
+        :type file: str
+        :param passwd: 访问密码
+        :type passwd: str
+        :param token: 用户 token
+        :type token: str
+        :param url: 下载链接
+        :type url: str
+        :rtype: None
+        """
+        try:
+            with self.lock, self.connection:
+                self.connection.execute('INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?, ?)', (file, passwd, token, url, time.time()))
+                self.connection.execute('DELETE FROM dead_links WHERE file = ? AND passwd = ?', (file, passwd))
+        except sqlite3.Error as e:
+            logger.error(f"An error occurred while writing the link cache: {e}")
+
+    def get_dead(self, file: str, passwd: str) -> Optional[str]:
+        """
+        查询有效期内的失效链接记录。
+
+        :param file: 文件名
+        :type file: str
+        :param passwd: 访问密码
+        :type passwd: str
+        :rtype: Optional[str]
+        :return: 缓存的错误代码，没有记录或已过期时返回 None
+        """
+        try:
+            with self.lock:
+                row = self.connection.execute('SELECT code, checked_at FROM dead_links WHERE file = ? AND passwd = ?', (file, passwd)).fetchone()
+            if row and row[1] >= time.time() - NEGATIVE_CACHE_TTL.get(row[0], 0):
+                return row[0]
+            return None
+        except sqlite3.Error as e:
+            logger.error(f"An error occurred while reading the link cache: {e}")
+            return None
+
+    def put_dead(self, file: str, passwd: str, code: str) -> None:
+        """
+        记录失效链接，不在 NEGATIVE_CACHE_TTL 中的错误代码不会记录。
+
+        :param file: 文件名
+        :type file: str
+        :param passwd: 访问密码
+        :type passwd: str
+        :param code: 服务器返回的错误代码
+        :type code: str
+        :rtype: None
+        """
+        if code not in NEGATIVE_CACHE_TTL:
+            return
+        try:
+            with self.lock, self.connection:
+                self.connection.execute('INSERT OR REPLACE INTO dead_links VALUES (?, ?, ?, ?)', (file, passwd, code, time.time()))
+        except sqlite3.Error as e:
+            logger.error(f"An error occurred while writing the link cache: {e}")
+
+    def lookup(self, file: str, passwd: str, tokens: Sequence[str], recheck: bool = False) -> Optional[str]:
+        """
+        依次查询下载链接和失效链接记录。
+
+        :param file: 文件名
+        :type file: str
+        :param passwd: 访问密码
+        :type passwd: str
+        :param tokens: 用户 token
+        :type tokens: Sequence[str]
+        :param recheck: 为 True 时忽略失效链接记录，强制重新请求
+        :type recheck: bool
+        :rtype: Optional[str]
+        :return: 缓存的下载链接或错误代码，没有缓存时返回 None
+        """
+        metrics = get_metrics()
+        url = self.get(file, passwd, tokens)
+        if url or recheck:
+            metrics.inc('ctfile_cache_total', 'kind="link"' if url else 'kind="miss"')
+            return url
+        dead = self.get_dead(file, passwd)
+        metrics.inc('ctfile_cache_total', 'kind="dead"' if dead else 'kind="miss"')
+        return dead
+
+    def store(self, file: str, passwd: str, token: str, result: Optional[str]) -> None:
+        """
+        根据解析结果保存下载链接或失效链接记录。
+
+        :param file: 文件名
+        :type file: str
+        :param passwd: 访问密码
+        :type passwd: str
+        :param token: 用户 token
+        :type token: str
+        :param result: 解析结果
+        :type result: Optional[str]
+        :rtype: None
+        """
+        if not result:
+            return
+        if result.startswith('https://'):
+            self.put(file, passwd, token, result)
+        else:
+            self.put_dead(file, passwd, result)
+
+    def close(self) -> None:
+        """
+        关闭数据库连接。
+
+        :rtype: None
+        """
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,224 @@
+"""
+这是一个Python文件，其中包含一个类：`LinkResolver`。
+
+类 `LinkResolver` 是链接解析引擎，负责把用户输入的城通网盘链接转换成下载地址。它接受用户 token、请求延迟和并发数三个参数。token 可以是用英文逗号分隔的多个会员账号 token，由 `TokenPool` 在健康的 token 之间调度请求，请求延迟用来换算每条请求路径限速器的初始速率。如果配置了出口代理，请求由 `ProxyPool` 分散到负载最低的可用代理上。每条请求路径（token 和出口代理的组合）都有自己的限速器和限流检测器，某条路径被限流时只暂停这条路径，限流期间失败的链接换用其他路径或在该路径恢复后重新请求；连接不上代理只影响代理的健康状况。如果提供了下载链接缓存，请求前会先查询缓存中的下载链接和失效链接记录，解析结果也会写入缓存。如果提供了任务日志，每条链接完成时把结果追加到日志，继续运行中断的任务时直接返回日志中已完成的结果。`resolve` 方法对单条链接依次执行解析链接和请求下载链接两个步骤，返回服务器结果。`resolve_links` 方法使用线程池同时处理多条链接，在途请求数量不超过并发数，并按输入顺序逐条产出结果，方便调用方实时显示进度。文件名和访问密码相同的链接只请求一次，结果分发给每一行输入。
+
+这个模块主要用于批量解析链接，包括控制并发数量和保持结果顺序。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from .canonical_key import canonical_key
+from .job_journal import JobJournal
+from .link_attempt import LinkAttempt
+from .link_cache import LinkCache
+from .metrics import get_metrics
+from .parse_link import LinkRecord, parse_link
+from .proxy_pool import ProxyPool
+from .request_download_link import request_download_link
+from .settings import DEDUP_CACHE_SIZE, DEFAULT_CONCURRENCY, MAX_CONCURRENCY, RESULT_THROTTLED, RESULT_UNREACHABLE, RESULT_UNSUPPORTED
+from .token_pool import TokenPool
+
+logger = logging.getLogger(__name__)
+
+
+class LinkResolver:
+    """
+    链接解析引擎类。
+
+    该类在固定大小的线程池中并发请求下载链接，并按输入顺序返回结果。
+    """
+
+    def __init__(self, token: str, delay: str = '0', concurrency: int = DEFAULT_CONCURRENCY, cache: Optional[LinkCache] = None,
+                 recheck: bool = False, proxies: str = '', journal: Optional[JobJournal] = None):
+        """
+        初始化解析引擎。
+
+        :param token: 用户 token，多个 token 用英文逗号分隔
+        :type token: str
+        :param delay: 每条请求路径的初始请求间隔，单位是毫秒，为 0 时使用默认初始速率
+        :type delay: str
+        :param concurrency: 同时进行的请求数量，范围为 1 到 MAX_CONCURRENCY
+        :type concurrency: int
+        :param cache: 下载链接缓存，为 None 时不使用缓存
+        :type cache: Optional[LinkCache]
+        :param recheck: 为 True 时忽略缓存中的失效链接记录，强制重新请求
+        :type recheck: bool
+        :param proxies: 出口代理地址，多个代理用英文逗号分隔，为空时直接连接
+        :type proxies: str
+        :param journal: 任务日志，为 None 时不记录进度
+        :type journal: Optional[JobJournal]
+        """
+        self.pool = TokenPool.from_string(token, delay)
+        self.proxies = ProxyPool.from_string(proxies)
+        self.cache = cache
+        self.recheck = recheck
+        self.journal = journal
+        self.concurrency = min(max(int(concurrency), 1), MAX_CONCURRENCY)
+
+    def wait_for_admission(self, attempt: LinkAttempt, is_running: Callable[[], bool]) -> bool:
+        """
+        等待可以发送请求的请求路径，所有路径都被限流暂停时等待探测或恢复。
+
+        :param attempt: 链接的解析过程，选中的路径保存在其 route 属性中
+        :type attempt: LinkAttempt
+        :param is_running: 返回是否继续运行的函数
+        :type is_running: Callable[[], bool]
+        :rtype: bool
+        :return: 选中路径或没有可用 token 时返回 True，等待期间被停止时返回 False
+        """
+        while is_running():
+            wait = attempt.begin()
+            if wait <= 0:
+                return True
+            time.sleep(min(wait, 1.0))
+        return False
+
+    def resolve(self, link: str, is_running: Optional[Callable[[], bool]] = None) -> Optional[str]:
+        """
+        解析单条链接，并把结果追加到任务日志。任务日志中已经完成的链接直接返回记录的结果。
+
+        :param link: 待解析的城通网盘链接
+        :type link: str
+        :param is_running: 返回是否继续运行的函数，返回 False 时放弃等待
+        :type is_running: Optional[Callable[[], bool]]
+        :rtype: Optional[str]
+        :return: 下载链接或错误代码；不支持的链接返回 RESULT_UNSUPPORTED；请求失败返回 None
+        """
+        if self.journal is None:
+            result = self.resolve_link(link, is_running)
+            get_metrics().observe_result(result)
+            return result
+
+        recorded = self.journal.get(link)
+        if recorded:
+            logger.debug(f'跳过已完成链接：{link}，记录结果：{recorded}')
+            get_metrics().inc('ctfile_cache_total', 'kind="journal"')
+            get_metrics().observe_result(recorded)
+            return recorded
+
+        result = self.resolve_link(link, is_running)
+        self.journal.put(link, result)
+        get_metrics().observe_result(result)
+        return result
+
+    def resolve_link(self, link: str, is_running: Optional[Callable[[], bool]] = None) -> Optional[str]:
+        """
+        解析单条链接。限流期间失败的请求会在该路径恢复后或换用其他路径重试，连接失败和未处于限流状态的路径最多重试 THROTTLE_LINK_RETRIES 次。返回 -1 时换用其他 token 重试。
+
+        :param link: 待解析的城通网盘链接
+        :type link: str
+        :param is_running: 返回是否继续运行的函数，返回 False 时放弃等待
+        :type is_running: Optional[Callable[[], bool]]
+        :rtype: Optional[str]
+        :return: 下载链接或错误代码；不支持的链接返回 RESULT_UNSUPPORTED；请求失败返回 None
+        """
+        is_running = is_running or (lambda: True)
+        try:
+            record = parse_link(link)
+            if not isinstance(record, LinkRecord):
+                logger.debug(f'筛选链接：{link}，拒绝原因：{record.reason.value}')
+                return RESULT_UNSUPPORTED
+
+            file_name, passwd = record.file, record.passwd
+            logger.debug(f'处理链接：{link}，得到文件名：{file_name}，得到密码：{passwd}')
+
+            cached = self.cache.lookup(file_name, passwd, self.pool.tokens, self.recheck) if self.cache else None
+            if cached:
+                logger.info(f'请求链接：{file_name}，缓存结果：{cached}')
+                return cached
+
+            attempt = LinkAttempt(self.pool, self.proxies)
+            while self.wait_for_admission(attempt, is_running):
+                route = attempt.route
+                if route is None:
+                    return '-1'
+
+                result = None
+                try:
+                    result = request_download_link(file_name, passwd, route.token, route.limiter, route.detector, route.proxy)
+                finally:
+                    retry = attempt.finish(result)
+                if retry:
+                    continue
+                if result in (RESULT_THROTTLED, RESULT_UNREACHABLE):
+                    break
+                logger.info(f'请求链接：{file_name}，返回结果：{result}')
+                if self.cache:
+                    self.cache.store(file_name, passwd, route.token, result)
+                return result
+            return None
+        except Exception as e:
+            logger.error(f"An error occurred while resolving link {link}: {e}")
+            return None
+
+    def resolve_links(self, links: Iterable[str], is_running: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        并发解析多条链接，按输入顺序逐条产出结果。
+
+        已提交但尚未产出的任务最多为并发数的两倍，超出时先等待最早的任务完成，避免一次性提交全部链接。
+
+        链接按 `canonical_key` 合并：不同子域名、多余空白或不同密码写法的同一个文件只提交一次，后续重复的输入行共用第一次提交的结果，仍按各自的输入位置产出。只有窗口内的任务和最近 DEDUP_CACHE_SIZE 个已完成的结果参与合并，流式读取上百万行的文件时内存占用不会随行数增长。
+
+        :param links: 待解析的城通网盘链接
+        :type links: Iterable[str]
+        :param is_running: 返回是否继续运行的函数，返回 False 时停止提交新任务并取消排队中的任务
+        :type is_running: Optional[Callable[[], bool]]
+        :rtype: Iterator[Tuple[str, Optional[str]]]
+        :return: 由链接和解析结果组成的元组
+        """
+        is_running = is_running or (lambda: True)
+        window = self.concurrency * 2
+        pending = deque()
+        # 窗口内的规范键对应的任务和引用次数，最后一个引用产出后移入 finished
+        in_flight = {}
+        # 已完成的规范键和结果，最多保留 DEDUP_CACHE_SIZE 条，超出时删除最久未使用的记录
+        finished = OrderedDict()
+
+        def take() -> Tuple[str, Optional[str]]:
+            done_link, done_key, done_future = pending.popleft()
+            result = done_future.result()
+            entry = in_flight.get(done_key) if done_key else None
+            if entry and entry[0] is done_future:
+                entry[1] -= 1
+                if not entry[1]:
+                    del in_flight[done_key]
+                    finished[done_key] = result
+                    if len(finished) > DEDUP_CACHE_SIZE:
+                        finished.popitem(last=False)
+            return done_link, result
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                for link in links:
+                    if not is_running():
+                        return
+                    key = canonical_key(link)
+                    if key in finished:
+                        finished.move_to_end(key)
+                        future = Future()
+                        future.set_result(finished[key])
+                    elif key in in_flight:
+                        future = in_flight[key][0]
+                        in_flight[key][1] += 1
+                    else:
+                        future = executor.submit(self.resolve, link, is_running)
+                        if key:
+                            in_flight[key] = [future, 1]
+                    pending.append((link, key, future))
+                    if len(pending) >= window:
+                        yield take()
+
+                while pending and is_running():
+                    yield take()
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
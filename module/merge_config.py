@@ -0,0 +1,42 @@
+"""
+这是一个Python文件，其中包含一个函数：`merge_config`。
+
+函数 `merge_config` 用于合并命令行参数和配置文件中的用户配置，供命令行程序和本地 HTTP 服务共用。它接受 token、请求间隔、并发数和出口代理四个参数，为 None 的参数表示命令行没有指定，使用配置文件中的值；四个参数都已指定时不读取配置文件。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from .init_config import init_config
+from .settings import DEFAULT_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+
+def merge_config(token: Optional[str], delay: Optional[str], concurrency: Optional[int], proxies: Optional[str]) -> Tuple[str, str, int, str]:
+    """
+    合并命令行参数和配置文件中的用户配置。
+
+    :param token: 命令行指定的 token，为 None 时使用配置文件中的值
+    :type token: Optional[str]
+    :param delay: 命令行指定的请求间隔，为 None 时使用配置文件中的值
+    :type delay: Optional[str]
+    :param concurrency: 命令行指定的并发数，为 None 时使用配置文件中的值
+    :type concurrency: Optional[int]
+    :param proxies: 命令行指定的出口代理，为 None 时使用配置文件中的值
+    :type proxies: Optional[str]
+    :rtype: Tuple[str, str, int, str]
+    :return: 包含 token、请求间隔、并发数和出口代理的元组，没有配置 token 时 token 为 '0'
+    """
+    if None in (token, delay, concurrency, proxies):
+        user_token, user_delay, user_concurrency, user_proxies = init_config()
+    else:
+        user_token, user_delay, user_concurrency, user_proxies = '0', '0', str(DEFAULT_CONCURRENCY), ''
+    return (token if token is not None else user_token,
+            delay if delay is not None else user_delay,
+            concurrency if concurrency is not None else int(user_concurrency),
+            proxies if proxies is not None else user_proxies)
@@ -0,0 +1,249 @@
+"""
+这是一个Python文件，其中包含一个类 `Metrics` 和三个函数 `get_metrics`、`count_retry`、`write_metrics_file`。
+
+类 `Metrics` 用于统计解析过程中的运行指标，包括计数器和直方图两种类型，所有操作都由同一把锁保护，可以被多个线程同时使用。统计的指标有：
+- `ctfile_requests_total`：发往城通服务器的请求数，按 HTTP 状态码分类，没有收到响应时为 error。
+- `ctfile_request_latency_seconds`：请求耗时的直方图。
+- `ctfile_results_total`：每条链接的最终结果，按 ok、错误代码、unsupported、failed 分类。
+- `ctfile_retries_total`：重试次数，按原因分类：exception 为 `@retry` 装饰器在请求抛出未处理的异常后的重试（不含第一次请求），throttled 为限流后的重试，unreachable 为连接不上服务器或代理后的重试，token 为换用其他 token 的重试。
+- `ctfile_cache_total`：缓存查询次数，按下载链接命中（link）、失效链接命中（dead）、任务日志命中（journal）和未命中（miss）分类。
+- `ctfile_throttle_events_total`：限流检测器暂停（park）和恢复（resume）的次数。
+
+方法 `render` 把指标输出为 Prometheus 文本格式，方法 `summary` 返回供图形界面显示的概况。
+
+函数 `get_metrics` 返回进程内共享的指标实例，函数 `count_retry` 作为 `@retry` 装饰器的 `before_attempts` 参数统计实际发生的重试次数，函数 `write_metrics_file` 把指标写到文件，供无界面运行时让监控程序读取。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .settings import METRICS_LATENCY_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+METRIC_HELP = {
+    'ctfile_requests_total': ('counter', 'Requests sent to getfile.php by HTTP status.'),
+    'ctfile_request_latency_seconds': ('histogram', 'Latency of requests sent to getfile.php.'),
+    'ctfile_results_total': ('counter', 'Final result of each resolved link.'),
+    'ctfile_retries_total': ('counter', 'Retries by reason.'),
+    'ctfile_cache_total': ('counter', 'Cache lookups by outcome.'),
+    'ctfile_throttle_events_total': ('counter', 'Throttle detector state changes.'),
+}
+
+
+class Metrics:
+    """
+    运行指标类。
+
+    该类保存计数器和直方图，并可以输出为 Prometheus 文本格式。
+    """
+
+    def __init__(self, buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        """
+        初始化指标。
+
+        :param buckets: 直方图的桶上限，单位是秒
+        :type buckets: Sequence[float]
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.lock = threading.Lock()
+        self.counters: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.histograms: Dict[str, list] = {}
+
+    def inc(self, name: str, label: str = '', value: float = 1) -> None:
+        """
+        增加计数器。
+
+        :param name: 指标名称
+        :type name: str
+        :param label: 分类标签，格式为 key="value"，为空时没有标签
+        :type label: str
+        :param value: 增加的数量
+        :type value: float
+        :rtype: None
+        """
+        with self.lock:
+            self.counters[(name, label)] += value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        向直方图添加一个观测值。
+
+        :param name: 指标名称
+        :type name: str
+        :param value: 观测值
+        :type value: float
+        :rtype: None
+        """
+        with self.lock:
+            # 依次为各个桶的计数、总和、总数
+            histogram = self.histograms.setdefault(name, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def observe_request(self, status: Optional[int], latency: float) -> None:
+        """
+        记录一次请求的状态码和耗时。
+
+        :param status: HTTP 状态码，没有收到响应时为 None
+        :type status: Optional[int]
+        :param latency: 请求耗时，单位是秒
+        :type latency: float
+        :rtype: None
+        """
+        self.inc('ctfile_requests_total', f'status="{status if status is not None else "error"}"')
+        self.observe('ctfile_request_latency_seconds', latency)
+
+    def observe_result(self, result: Optional[str]) -> None:
+        """
+        记录一条链接的最终结果。
+
+        :param result: 解析结果
+        :type result: Optional[str]
+        :rtype: None
+        """
+        if result is None:
+            label = 'failed'
+        elif result.startswith('https://'):
+            label = 'ok'
+        else:
+            label = result
+        self.inc('ctfile_results_total', f'result="{label}"')
+
+    def total(self, name: str, label: Optional[str] = None) -> float:
+        """
+        读取计数器的值。
+
+        :param name: 指标名称
+        :type name: str
+        :param label: 分类标签，为 None 时返回所有标签的总和
+        :type label: Optional[str]
+        :rtype: float
+        :return: 计数器的值
+        """
+        with self.lock:
+            return sum(value for (key, key_label), value in self.counters.items() if key == name and (label is None or key_label == label))
+
+    def quantile(self, name: str, q: float) -> float:
+        """
+        根据直方图估算分位数，在所在的桶内线性插值。
+
+        :param name: 指标名称
+        :type name: str
+        :param q: 分位，范围为 0 到 1
+        :type q: float
+        :rtype: float
+        :return: 估算的分位数，没有观测值时返回 0；落在最后一个桶之外时返回最大的桶上限
+        """
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if not histogram or not histogram[2]:
+                return 0.0
+            rank = q * histogram[2]
+            previous_bound, previous_count = 0.0, 0
+            for bound, count in zip(self.buckets, histogram[0]):
+                if count >= rank:
+                    share = (rank - previous_count) / (count - previous_count) if count > previous_count else 1.0
+                    return previous_bound + (bound - previous_bound) * share
+                previous_bound, previous_count = bound, count
+            return self.buckets[-1]
+
+    def summary(self) -> Dict[str, float]:
+        """
+        获取供图形界面显示的概况。
+
+        :rtype: Dict[str, float]
+        :return: 请求数、成功数、失败数、缓存命中数、重试数、限流次数和 p95 耗时（秒）
+        """
+        results = self.total('ctfile_results_total')
+        ok = self.total('ctfile_results_total', 'result="ok"')
+        return {
+            'requests': self.total('ctfile_requests_total'),
+            'ok': ok,
+            'failed': results - ok,
+            'cache_hits': self.total('ctfile_cache_total') - self.total('ctfile_cache_total', 'kind="miss"'),
+            'retries': self.total('ctfile_retries_total'),
+            'throttles': self.total('ctfile_throttle_events_total', 'event="park"'),
+            'p95': self.quantile('ctfile_request_latency_seconds', 0.95),
+        }
+
+    def render(self) -> str:
+        """
+        把指标输出为 Prometheus 文本格式。
+
+        :rtype: str
+        :return: 文本格式的指标
+        """
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = {name: ([*counts], total, count) for name, (counts, total, count) in self.histograms.items()}
+
+        lines = []
+        for name, (kind, text) in METRIC_HELP.items():
+            lines.append(f'# HELP {name} {text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'histogram':
+                counts, total, count = histograms.get(name, ([0] * len(self.buckets), 0.0, 0))
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {bucket_count}')
+                lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+                lines.append(f'{name}_sum {total}')
+                lines.append(f'{name}_count {count}')
+                continue
+            for (key, label), value in counters:
+                if key == name:
+                    lines.append(f'{name}{{{label}}} {value:g}' if label else f'{name} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """
+    获取进程内共享的指标实例。
+
+    :rtype: Metrics
+    :return: 指标实例
+    """
+    return _metrics
+
+
+def count_retry(attempt_number: int) -> None:
+    """
+    统计 `@retry` 装饰器的重试次数，作为 before_attempts 参数使用。第一次请求不是重试，不计入次数。
+
+    :param attempt_number: 即将进行的第几次尝试，从 1 开始
+    :type attempt_number: int
+    :rtype: None
+    """
+    if attempt_number > 1:
+        logger.debug(f'Retrying, attempt {attempt_number}')
+        _metrics.inc('ctfile_retries_total', 'reason="exception"')
+
+
+def write_metrics_file(target_path: Union[str, os.PathLike]) -> None:
+    """
+    把指标写到文件。先写入临时文件再替换，读取方不会读到写了一半的内容。
+
+    :param target_path: 文件路径
+    :type target_path: Union[str, os.PathLike]
+    :rtype: None
+    """
+    try:
+        temp_path = f'{target_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(_metrics.render())
+        os.replace(temp_path, target_path)
+    except OSError as e:
+        logger.error(f"An error occurred while writing metrics to '{target_path}': {e}")
@@ -0,0 +1,80 @@
+"""
+这是一个Python文件，其中包含链接解析器：`LinkRecord`、`RejectReason`、`LinkRejection` 三个类，以及 `parse_link` 和 `parse_many` 两个函数。
+
+函数 `parse_link` 使用一个预先编译的正则表达式，一次匹配就从输入行中取出域名、文件名和访问密码，代替 `filter_correct_link` 和 `get_file_info` 中的多次正则和字符串处理。匹配成功时返回 `LinkRecord`，否则返回带有拒绝原因的 `LinkRejection`。函数 `parse_many` 是批量版本，适合预处理上百万行的输入。
+
+解析规则与原来的两个函数一致：链接必须以 `https://` 开头，域名以 `.ctfile.com` 结尾，路径为 `/f/` 加上文件名。文件名到第一个 `?p=` 或空白为止，之后的内容作为访问密码，删除其中的非 ASCII 字符并去除首尾空白。
+
+只有三种原来的函数本身处理错误的输入结果不同：文件名后面是制表符等非空格的空白时，原来的函数把空白和密码都算进文件名；密码中还有 `?p=` 时，原来的函数把它替换成空格；密码中含有 `/f/` 时，原来的函数从最后一个 `/f/` 开始截取文件名。`tests/test_parse_link.py` 逐条对比了两种实现的结果。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import re
+from enum import Enum
+from typing import Iterable, Iterator, NamedTuple, Union
+
+logger = logging.getLogger(__name__)
+
+LINK_PATTERN = re.compile(r'https://(.+\.ctfile\.com)/f/(\d+-\d+-\w+\S*?)(?:\?p=|\s|$)(.*)')
+
+
+class LinkRecord(NamedTuple):
+    """
+    解析成功的链接记录，包括域名、文件名、访问密码和原始输入行。
+    """
+    host: str
+    file: str
+    passwd: str
+    line: str
+
+
+class RejectReason(str, Enum):
+    """
+    链接被拒绝的原因。
+    """
+    EMPTY = 'empty'
+    UNSUPPORTED = 'unsupported'
+
+
+class LinkRejection(NamedTuple):
+    """
+    解析失败的链接，包括拒绝原因和原始输入行。
+    """
+    reason: RejectReason
+    line: str
+
+
+def parse_link(line: str) -> Union[LinkRecord, LinkRejection]:
+    """
+    解析一行输入。
+
+    :param line: 输入行
+    :type line: str
+    :rtype: Union[LinkRecord, LinkRejection]
+    :return: 解析成功时返回链接记录，否则返回拒绝原因
+    """
+    text = line.strip()
+    if not text:
+        return LinkRejection(RejectReason.EMPTY, line)
+    match = LINK_PATTERN.match(text)
+    if match is None:
+        return LinkRejection(RejectReason.UNSUPPORTED, line)
+    host, file, rest = match.groups()
+    passwd = rest.encode('ascii', 'ignore').decode('ascii').strip()
+    return LinkRecord(host, file, passwd, line)
+
+
+def parse_many(lines: Iterable[str]) -> Iterator[Union[LinkRecord, LinkRejection]]:
+    """
+    批量解析输入行。
+
+    :param lines: 输入行
+    :type lines: Iterable[str]
+    :rtype: Iterator[Union[LinkRecord, LinkRejection]]
+    :return: 按输入顺序逐个产出链接记录或拒绝原因
+    """
+    return map(parse_link, lines)
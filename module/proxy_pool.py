@@ -0,0 +1,116 @@
+"""
+这是一个Python文件，其中包含一个类：`ProxyPool`。
+
+类 `ProxyPool` 用于把解析请求分散到多个出口代理。它为每个代理记录在途请求数、平均耗时和连续失败次数。`candidates` 方法返回可用的代理，按负载从低到高排列，负载按 (在途请求数 + 1) × 平均耗时 计算，由 `TokenPool` 结合各条请求路径的限速器选出代理后调用 `acquire` 占用；请求完成后调用 `release` 报告代理是否可用和耗时。只有连接不上代理或目标服务器才算代理失败，服务器返回的限流状态码和错误代码说明代理工作正常。某个代理连续失败 `PROXY_MAX_FAILURES` 次会被暂时剔除，`PROXY_EJECT_TIME` 秒后重新加入，再次被剔除时剔除时间翻倍，最长 `PROXY_EJECT_MAX` 秒；重新加入后第一次请求成功即恢复正常，失败则立即再次剔除。如果所有代理都被剔除，会提前放回最早到期的代理，保证任务不会停止。
+
+没有配置代理时 `candidates` 只返回 None，请求直接发出。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from .settings import PROXY_EJECT_MAX, PROXY_EJECT_TIME, PROXY_MAX_FAILURES
+
+logger = logging.getLogger(__name__)
+
+
+class ProxyPool:
+    """
+    出口代理池类。
+
+    该类跟踪每个代理的负载和健康状况，在可用代理之间分配请求，并自动剔除和恢复代理。
+    """
+
+    def __init__(self, proxies: Iterable[str]):
+        """
+        初始化代理池。
+
+        :param proxies: 代理地址，例如 http://127.0.0.1:8080，重复和空白的地址会被忽略
+        :type proxies: Iterable[str]
+        """
+        self.proxies = [proxy for proxy in dict.fromkeys(proxy.strip() for proxy in proxies) if proxy]
+        self.inflight = {proxy: 0 for proxy in self.proxies}
+        self.latency = {proxy: 1.0 for proxy in self.proxies}
+        self.failures = {proxy: 0 for proxy in self.proxies}
+        self.eject_time = {proxy: PROXY_EJECT_TIME for proxy in self.proxies}
+        self.ejected_until = {proxy: 0.0 for proxy in self.proxies}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_string(cls, proxies: str) -> 'ProxyPool':
+        """
+        从设置中的代理字符串创建代理池，多个代理用英文逗号分隔。
+
+        :param proxies: 代理字符串
+        :type proxies: str
+        :rtype: ProxyPool
+        :return: 代理池实例
+        """
+        return cls(proxies.split(','))
+
+    def candidates(self) -> List[Optional[str]]:
+        """
+        获取可用的代理，按负载从低到高排列。
+
+        :rtype: List[Optional[str]]
+        :return: 可用的代理地址，没有配置代理时返回只包含 None 的列表
+        """
+        if not self.proxies:
+            return [None]
+        with self.lock:
+            now = time.monotonic()
+            candidates = [proxy for proxy in self.proxies if self.ejected_until[proxy] <= now]
+            if not candidates:
+                candidates = [min(self.proxies, key=lambda proxy: self.ejected_until[proxy])]
+            return sorted(candidates, key=lambda proxy: (self.inflight[proxy] + 1) * self.latency[proxy])
+
+    def acquire(self, proxy: Optional[str]) -> None:
+        """
+        占用一个代理，把它的在途请求数加一。
+
+        :param proxy: candidates 返回的代理地址，为 None 时忽略
+        :type proxy: Optional[str]
+        :rtype: None
+        """
+        if proxy is None:
+            return
+        with self.lock:
+            self.inflight[proxy] += 1
+
+    def release(self, proxy: Optional[str], ok: bool, latency: float) -> None:
+        """
+        报告一次请求的结果，并把代理的在途请求数减一。
+
+        :param proxy: acquire 占用的代理地址，为 None 时忽略
+        :type proxy: Optional[str]
+        :param ok: 是否连接上了目标服务器，收到任何 HTTP 响应都算成功
+        :type ok: bool
+        :param latency: 请求耗时，单位是秒
+        :type latency: float
+        :rtype: None
+        """
+        if proxy is None:
+            return
+        with self.lock:
+            self.inflight[proxy] -= 1
+            if ok:
+                self.failures[proxy] = 0
+                self.eject_time[proxy] = PROXY_EJECT_TIME
+                self.latency[proxy] += (latency - self.latency[proxy]) * 0.2
+                return
+
+            now = time.monotonic()
+            if self.ejected_until[proxy] > now:
+                return
+            self.failures[proxy] += 1
+            if self.failures[proxy] >= PROXY_MAX_FAILURES:
+                self.ejected_until[proxy] = now + self.eject_time[proxy]
+                logger.warning(f'Proxy {proxy} ejected for {self.eject_time[proxy]:.0f} seconds after {self.failures[proxy]} consecutive failures')
+                self.eject_time[proxy] = min(self.eject_time[proxy] * 2, PROXY_EJECT_MAX)
+                self.failures[proxy] = PROXY_MAX_FAILURES - 1
@@ -0,0 +1,129 @@
+"""
+这是一个Python文件，其中包含一个类：`RateLimiter`。
+
+类 `RateLimiter` 是一个线程安全的令牌桶限速器，所有在途请求共享同一个实例。每次发送请求之前调用 `acquire`（同步）或者先调用 `reserve` 再自行等待（异步），令牌不足时需要等待。速率按照加性增、乘性减（AIMD）的方式自动调整：请求成功时调用 `on_success`，速率小幅上升；遇到疑似限流时调用 `on_throttle`，速率减半并清空桶内令牌。短时间内的多次限流只会触发一次减速，避免并发请求同时失败时把速率降到最低。
+
+这个模块主要用于控制请求速率，让程序以服务器可以承受的最高速率运行。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+import time
+
+from .settings import (RATE_LIMIT_BURST, RATE_LIMIT_COOLDOWN, RATE_LIMIT_DECREASE, RATE_LIMIT_INCREASE,
+                       RATE_LIMIT_MAX, RATE_LIMIT_MIN, RATE_LIMIT_START)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    自适应令牌桶限速器类。
+
+    该类按当前速率发放令牌，并根据请求结果自动调整速率。
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT_START, min_rate: float = RATE_LIMIT_MIN, max_rate: float = RATE_LIMIT_MAX):
+        """
+        初始化限速器。
+
+        :param rate: 初始速率，单位是每秒请求数
+        :type rate: float
+        :param min_rate: 最低速率
+        :type min_rate: float
+        :param max_rate: 最高速率
+        :type max_rate: float
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.tokens = 1.0
+        self.updated_at = time.monotonic()
+        self.throttled_at = 0.0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: str) -> 'RateLimiter':
+        """
+        根据用户设置的请求延迟创建限速器，延迟换算成初始速率，延迟为 0 时使用默认初始速率。
+
+        :param delay: 请求之间的延迟，单位是毫秒
+        :type delay: str
+        :rtype: RateLimiter
+        :return: 限速器实例
+        """
+        delay = int(delay) if str(delay).isdigit() else 0
+        return cls(1000.0 / delay) if delay > 0 else cls()
+
+    def _refill(self, now: float) -> None:
+        """
+        按流逝的时间补充令牌，调用方需持有锁。
+
+        :param now: 当前时间
+        :type now: float
+        """
+        self.tokens = min(RATE_LIMIT_BURST, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """
+        预订一个令牌，返回调用方需要等待的秒数。
+
+        :rtype: float
+        :return: 等待秒数，0 表示可以立即发送请求
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def available_in(self) -> float:
+        """
+        估算下一个令牌可用前需要等待的秒数，不会预订令牌。
+
+        :rtype: float
+        :return: 等待秒数，0 表示可以立即发送请求
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def acquire(self) -> None:
+        """
+        阻塞直到获得一个令牌。
+
+        :rtype: None
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """
+        请求成功，加性提高速率。
+
+        :rtype: None
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + RATE_LIMIT_INCREASE)
+
+    def on_throttle(self) -> None:
+        """
+        疑似被限流，乘性降低速率并清空令牌。
+
+        :rtype: None
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now - self.throttled_at < RATE_LIMIT_COOLDOWN:
+                return
+            self._refill(now)
+            self.throttled_at = now
+            self.rate = max(self.min_rate, self.rate * RATE_LIMIT_DECREASE)
+            self.tokens = min(self.tokens, 0.0)
+            logger.warning(f'Request rate lowered to {self.rate:.2f}/s')
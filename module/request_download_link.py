@@ -1,7 +1,7 @@
 """
 这是一个Python文件，其中包含一个函数：`request_download_link`。
 
-函数 `request_download_link` 用于向城通服务器请求下载链接。它接受四个参数，分别是需要下载的文件名 `file`，访问密码 `passwd`，用户token `token` 以及请求之间的延迟时间 `delay`。首先，函数构建了一个URL，包含了这四个参数以及一个随机数。然后，它发送了一个GET请求到这个URL，并把响应解析为JSON。如果响应的代码是200，函数返回下载链接，否则返回错误代码。在发生错误时，如找不到链接或网络请求失败，函数将返回相应的错误信息或 `None`。无论是否成功，函数在最后都会根据 `delay` 参数进行暂停。
+函数 `request_download_link` 用于向城通服务器请求下载链接。它接受六个参数，分别是需要下载的文件名 `file`，访问密码 `passwd`，用户token `token`，请求路径的限速器 `limiter`、限流检测器 `detector` 以及出口代理 `proxy`。首先，函数从限速器获取令牌，并构建了一个URL，包含了文件名、密码、token以及一个随机数。然后，它通过共享的 HTTP 客户端发送了一个GET请求到这个URL，连接会在多次调用之间复用。响应由 `parse_response` 解析：如果响应的代码是200，函数返回下载链接，否则返回错误代码。请求结束后由 `settle_request` 通知限速器和限流检测器并记录运行指标，这两个函数和异步的 `resolve_many` 共用，两个引擎对各种错误的处理完全一致：无法解析的响应和网络请求失败返回 `None`，只有服务器在 JSON 中返回的代码 -1 才会原样返回 `-1`，避免 token 因为响应损坏被误判为失效；连接不上服务器或代理时返回 `RESULT_UNREACHABLE`，由调用方换一条路径重试；限流检测器认为该请求需要重试时返回 `RESULT_THROTTLED`。网络错误和无法解析的响应都在函数内部处理，`@retry` 装饰器只在发生其他未预料的异常时重试，实际发生的重试次数（不含第一次请求）记录到共享的运行指标中。
 
 此模块主要用于与城通服务器进行交互，包括请求下载链接并处理可能的错误。
 
@@ -15,17 +15,22 @@ import random
 import time
 from typing import Optional
 
-import requests
+import httpx
 from retrying import retry
 
-from .settings import REQUEST_HEAD
+from .http_client import get_http_client
+from .link_attempt import parse_response, settle_request
+from .metrics import count_retry
+from .rate_limiter import RateLimiter
+from .settings import GETFILE_URL
+from .throttle_detector import ThrottleDetector
 
-requests.packages.urllib3.disable_warnings()
 logger = logging.getLogger(__name__)
 
 
-@retry(stop_max_attempt_number=5, wait_random_min=100, wait_random_max=1200)
-def request_download_link(file: str, passwd: str, token: str, delay: str) -> Optional[str]:
+@retry(stop_max_attempt_number=5, wait_random_min=100, wait_random_max=1200, before_attempts=count_retry)
+def request_download_link(file: str, passwd: str, token: str, limiter: Optional[RateLimiter] = None,
+                          detector: Optional[ThrottleDetector] = None, proxy: Optional[str] = None) -> Optional[str]:
     """
     向城通服务器请求下载链接。
 
@@ -35,30 +40,24 @@ def request_download_link(file: str, passwd: str, token: str, delay: str) -> Opt
     :param passwd: 访问密码
     :type token: str
     :param token: 用户 token
-    :type delay: str
-    :param delay: 请求之间的延迟，单位是毫秒
+    :type limiter: Optional[RateLimiter]
+    :param limiter: 请求路径的限速器，为 None 时不限速
+    :type detector: Optional[ThrottleDetector]
+    :param detector: 请求路径的限流检测器，为 None 时不检测
+    :type proxy: Optional[str]
+    :param proxy: 出口代理地址，为 None 时直接连接
     :rtype: Optional[str]
-    :return: 服务器返回的下载链接，或者在发生错误时返回 None
+    :return: 服务器返回的下载链接，或者在发生错误时返回 None，连接失败时返回 RESULT_UNREACHABLE，需要重试时返回 RESULT_THROTTLED
     """
-    url = f'https://webapi.ctfile.com/getfile.php?path=f&f={file}&passcode={passwd}&token={token}&r={str(random.random())}&ref='
+    if limiter:
+        limiter.acquire()
+    url = f'{GETFILE_URL}?path=f&f={file}&passcode={passwd}&token={token}&r={str(random.random())}&ref='
+    start = time.monotonic()
+    status = None
     try:
-        response = requests.get(url=url, headers=REQUEST_HEAD, timeout=15, verify=False, allow_redirects=True)
-        response.raise_for_status()
-
-        response_json = response.json()
-        logger.debug(f'response_json: {response_json}')
-        response_json_code = response_json['code']
-
-        if response_json_code == 200:
-            download_link = response_json['file']['vip_dx_url']
-            return download_link
-        else:
-            return str(response_json_code)
-    except (KeyError, ValueError) as e:
-        logger.error(f"Unable to find link {url}: {e}")
-        return '-1'
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Unable to send network request to {url}: {e}")
-        return None
-    finally:
-        time.sleep(int(delay) / 1000.0)
+        response = get_http_client(proxy).get(url)
+        status = response.status_code
+        result = parse_response(response)
+    except (KeyError, ValueError, httpx.HTTPError) as e:
+        return settle_request(url, status, time.monotonic() - start, limiter, detector, error=e)
+    return settle_request(url, status, time.monotonic() - start, limiter, detector, result)
@@ -0,0 +1,205 @@
+"""
+这是一个Python文件，其中包含一个异步函数：`resolve_many`。
+
+函数 `resolve_many` 是 `request_download_link` 的异步版本，用于在图形界面之外批量解析城通网盘链接。它接受三个参数，分别是待解析的链接 `links`，用户token `token` 以及同时进行的请求数量 `concurrency`。函数内部只通过 `create_async_client` 创建一个带连接池的异步客户端（配置了出口代理时每个代理一个），由固定数量的协程从有界队列中领取链接并发请求，所有协程共享同一个 token 池，token 可以是用英文逗号分隔的多个 token，每条请求路径（token 和出口代理的组合）都有自己的限速器和限流检测器，某条路径被限流时只暂停这条路径，失败的链接换用其他路径或在该路径恢复后重试，如果提供了下载链接缓存，请求前会先查询缓存中的下载链接和失效链接记录，SQLite 的读写放到线程中执行，不会阻塞事件循环。解析响应、调整速率和决定是否重试都由 `link_attempt` 模块完成，和同步引擎共用同一套逻辑。每完成一条链接就产出一次结果，因此结果顺序为完成顺序而不是输入顺序。输入可以是任意可迭代对象，不会一次性读入内存；链接队列和结果队列都有长度上限，调用方处理结果较慢时协程会暂停等待，而不是把结果堆积在内存中。
+
+使用示例：
+
+```python
+import asyncio
+from module import resolve_many
+
+async def main():
+    async for link, result in resolve_many(links, token, concurrency=64):
+        print(link, result)
+
+asyncio.run(main())
+```
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from .http_client import create_async_client
+from .link_attempt import LinkAttempt, parse_response, settle_request
+from .link_cache import LinkCache
+from .metrics import get_metrics
+from .parse_link import LinkRecord, parse_link
+from .proxy_pool import ProxyPool
+from .rate_limiter import RateLimiter
+from .settings import DEFAULT_CONCURRENCY, GETFILE_URL, RESULT_THROTTLED, RESULT_UNREACHABLE, RESULT_UNSUPPORTED
+from .throttle_detector import ThrottleDetector
+from .token_pool import TokenPool
+
+logger = logging.getLogger(__name__)
+
+
+async def _request_download_link(client: httpx.AsyncClient, file: str, passwd: str, token: str,
+                                 limiter: RateLimiter, detector: ThrottleDetector) -> Optional[str]:
+    """
+    使用异步客户端向城通服务器请求下载链接。
+
+    :type client: httpx.AsyncClient
+    :param client: 共享的异步 HTTP 客户端
+    :type file: str
+    :param file: 需要下载的文件名
+    :type passwd: str
+    :param passwd: 访问密码
+    :type token: str
+    :param token: 用户 token
+    :type limiter: RateLimiter
+    :param limiter: 请求路径的限速器
+    :type detector: ThrottleDetector
+    :param detector: 请求路径的限流检测器
+    :rtype: Optional[str]
+    :return: 服务器返回的下载链接或错误代码，或者在网络请求失败时返回 None，需要重试时返回 RESULT_THROTTLED
+    """
+    await asyncio.sleep(limiter.reserve())
+    url = f'{GETFILE_URL}?path=f&f={file}&passcode={passwd}&token={token}&r={str(random.random())}&ref='
+    start = time.monotonic()
+    status = None
+    try:
+        response = await client.get(url)
+        status = response.status_code
+        result = parse_response(response)
+    except (KeyError, ValueError, httpx.HTTPError) as e:
+        return settle_request(url, status, time.monotonic() - start, limiter, detector, error=e)
+    return settle_request(url, status, time.monotonic() - start, limiter, detector, result)
+
+
+async def _resolve_link(clients: Dict[Optional[str], httpx.AsyncClient], proxy_pool: ProxyPool, link: str, pool: TokenPool,
+                        cache: Optional[LinkCache], recheck: bool) -> Optional[str]:
+    """
+    异步解析单条链接。
+
+    :type clients: Dict[Optional[str], httpx.AsyncClient]
+    :param clients: 以代理地址为键的共享异步 HTTP 客户端
+    :type proxy_pool: ProxyPool
+    :param proxy_pool: 共享的出口代理池
+    :type link: str
+    :param link: 待解析的城通网盘链接
+    :type pool: TokenPool
+    :param pool: 共享的 token 池
+    :type cache: Optional[LinkCache]
+    :param cache: 下载链接缓存，为 None 时不使用缓存
+    :type recheck: bool
+    :param recheck: 为 True 时忽略缓存中的失效链接记录
+    :rtype: Optional[str]
+    :return: 下载链接或错误代码；不支持的链接返回 RESULT_UNSUPPORTED；请求失败返回 None
+    """
+    try:
+        record = parse_link(link)
+        if not isinstance(record, LinkRecord):
+            return RESULT_UNSUPPORTED
+
+        file_name, passwd = record.file, record.passwd
+        cached = await asyncio.to_thread(cache.lookup, file_name, passwd, pool.tokens, recheck) if cache else None
+        if cached:
+            return cached
+
+        attempt = LinkAttempt(pool, proxy_pool)
+        while True:
+            wait = attempt.begin()
+            if wait > 0:
+                await asyncio.sleep(min(wait, 1.0))
+                continue
+            route = attempt.route
+            if route is None:
+                return '-1'
+
+            result = None
+            try:
+                result = await _request_download_link(clients[route.proxy], file_name, passwd, route.token, route.limiter, route.detector)
+            finally:
+                retry = attempt.finish(result)
+            if retry:
+                continue
+            if result in (RESULT_THROTTLED, RESULT_UNREACHABLE):
+                return None
+            if cache:
+                await asyncio.to_thread(cache.store, file_name, passwd, route.token, result)
+            return result
+    except Exception as e:
+        logger.error(f"An error occurred while resolving link {link}: {e}")
+        return None
+
+
+async def resolve_many(links: Iterable[str], token: str, concurrency: int = DEFAULT_CONCURRENCY,
+                       pool: Optional[TokenPool] = None, cache: Optional[LinkCache] = None, recheck: bool = False,
+                       proxy_pool: Optional[ProxyPool] = None) -> AsyncIterator[Tuple[str, Optional[str]]]:
+    """
+    异步并发解析多条链接，按完成顺序逐条产出结果。
+
+    :type links: Iterable[str]
+    :param links: 待解析的城通网盘链接
+    :type token: str
+    :param token: 用户 token，多个 token 用英文逗号分隔，提供 pool 时忽略
+    :type concurrency: int
+    :param concurrency: 同时进行的请求数量
+    :type pool: Optional[TokenPool]
+    :param pool: 共享的 token 池，为 None 时根据 token 新建
+    :type cache: Optional[LinkCache]
+    :param cache: 下载链接缓存，为 None 时不使用缓存
+    :type recheck: bool
+    :param recheck: 为 True 时忽略缓存中的失效链接记录，强制重新请求
+    :type proxy_pool: Optional[ProxyPool]
+    :param proxy_pool: 共享的出口代理池，为 None 时直接连接
+    :rtype: AsyncIterator[Tuple[str, Optional[str]]]
+    :return: 由链接和解析结果组成的元组
+    """
+    concurrency = max(int(concurrency), 1)
+    pool = pool or TokenPool.from_string(token)
+    proxy_pool = proxy_pool or ProxyPool([])
+    link_queue = asyncio.Queue(maxsize=concurrency * 2)
+    result_queue = asyncio.Queue(maxsize=concurrency * 2)
+    done = object()
+
+    async def produce():
+        try:
+            for link in links:
+                await link_queue.put(link)
+        except asyncio.CancelledError:
+            # 调用方提前停止时消费者也已经取消，不再放入结束标记，否则会在已满的队列上一直等待
+            raise
+        except Exception as e:
+            logger.error(f"An error occurred while reading links: {e}")
+        for _ in range(concurrency):
+            await link_queue.put(done)
+
+    async def consume(clients: Dict[Optional[str], httpx.AsyncClient]):
+        while True:
+            link = await link_queue.get()
+            if link is done:
+                await result_queue.put(done)
+                return
+            result = await _resolve_link(clients, proxy_pool, link, pool, cache, recheck)
+            get_metrics().observe_result(result)
+            await result_queue.put((link, result))
+
+    async with AsyncExitStack() as stack:
+        clients = {}
+        for proxy in proxy_pool.proxies or [None]:
+            clients[proxy] = await stack.enter_async_context(create_async_client(concurrency, proxy))
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(consume(clients)) for _ in range(concurrency)]
+        try:
+            finished = 0
+            while finished < concurrency:
+                item = await result_queue.get()
+                if item is done:
+                    finished += 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
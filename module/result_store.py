@@ -0,0 +1,256 @@
+"""
+这是一个Python文件，其中包含一个枚举 `ResultStatus` 和两个类 `ResultRecord`、`ResultStore`。
+
+枚举 `ResultStatus` 用整数表示解析结果的状态：成功、请求失败、不支持的链接、token 失效（-1）、密码错误（401）、文件已删除（404）、文件已失效（503）和其他错误代码。函数 `ResultStatus.classify` 把解析引擎返回的字符串转换成状态，其他代码只判断这一次，之后筛选和统计都直接比较整数。
+
+类 `ResultStore` 是按列保存的解析结果，适合保存几十万条结果：
+- `links`：输入链接的列表。
+- `statuses`：状态的 `bytearray`，每条结果占一个字节。
+- `details`：成功时为下载地址，状态为其他错误代码时为该代码，其余情况为 None。
+- `times`：完成时间的 `array('d')`。
+
+文件编号不单独保存，需要时从输入链接解析。追加结果时同时累计各状态的数量，统计不需要遍历。筛选、保存和重试都按行号操作：`indices` 返回指定状态的行号，`lines` 返回指定行的提示信息，`links_at` 返回指定行的输入链接。
+
+类 `ResultRecord` 是使用 `__slots__` 的单条结果，由 `ResultStore` 按行号临时生成，不会为每一行长期保存一个对象。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import time
+from array import array
+from enum import IntEnum
+from typing import Iterable, List, Optional, Tuple
+
+from .format_result import format_result
+from .parse_link import LinkRecord, parse_link
+from .settings import RESULT_UNSUPPORTED
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStatus(IntEnum):
+    """
+    解析结果状态枚举。
+    """
+
+    OK = 0
+    FAILED = 1
+    UNSUPPORTED = 2
+    TOKEN_INVALID = 3
+    PASSWORD_WRONG = 4
+    FILE_DELETED = 5
+    FILE_EXPIRED = 6
+    OTHER_ERROR = 7
+
+    @classmethod
+    def classify(cls, result: Optional[str]) -> 'ResultStatus':
+        """
+        把解析结果转换成状态。
+
+        :param result: 解析结果
+        :type result: Optional[str]
+        :rtype: ResultStatus
+        :return: 对应的状态
+        """
+        if not result:
+            return cls.FAILED
+        if result.startswith('https://'):
+            return cls.OK
+        return _CODE_STATUSES.get(result, cls.OTHER_ERROR)
+
+    @property
+    def code(self) -> Optional[str]:
+        """
+        获取状态对应的解析结果，成功和其他错误代码没有固定的结果，返回 None。
+
+        :rtype: Optional[str]
+        """
+        return _STATUS_CODES.get(self)
+
+
+_CODE_STATUSES = {
+    RESULT_UNSUPPORTED: ResultStatus.UNSUPPORTED,
+    '-1': ResultStatus.TOKEN_INVALID,
+    '401': ResultStatus.PASSWORD_WRONG,
+    '404': ResultStatus.FILE_DELETED,
+    '503': ResultStatus.FILE_EXPIRED,
+}
+_STATUS_CODES = {status: code for code, status in _CODE_STATUSES.items()}
+
+
+class ResultRecord:
+    """
+    单条解析结果类。
+    """
+
+    __slots__ = ('link', 'status', 'detail', 'finished_at')
+
+    def __init__(self, link: str, status: ResultStatus, detail: Optional[str], finished_at: float):
+        """
+        :param link: 输入链接
+        :type link: str
+        :param status: 结果状态
+        :type status: ResultStatus
+        :param detail: 成功时为下载地址，其他错误代码时为该代码
+        :type detail: Optional[str]
+        :param finished_at: 完成时间
+        :type finished_at: float
+        """
+        self.link = link
+        self.status = status
+        self.detail = detail
+        self.finished_at = finished_at
+
+    @property
+    def url(self) -> Optional[str]:
+        """
+        获取下载地址，失败时为 None。
+
+        :rtype: Optional[str]
+        """
+        return self.detail if self.status == ResultStatus.OK else None
+
+    @property
+    def result(self) -> Optional[str]:
+        """
+        还原解析引擎返回的解析结果。
+
+        :rtype: Optional[str]
+        """
+        return self.detail if self.detail is not None else self.status.code
+
+    @property
+    def file(self) -> str:
+        """
+        获取文件编号，不支持的链接返回空字符串。
+
+        :rtype: str
+        """
+        record = parse_link(self.link)
+        return record.file if isinstance(record, LinkRecord) else ''
+
+
+class ResultStore:
+    """
+    按列保存的解析结果类。
+    """
+
+    def __init__(self):
+        """
+        初始化空的结果集。
+        """
+        self.links: List[str] = []
+        self.statuses = bytearray()
+        self.details: List[Optional[str]] = []
+        self.times = array('d')
+        self.counts = [0] * len(ResultStatus)
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    def __getitem__(self, index: int) -> ResultRecord:
+        return ResultRecord(self.links[index], ResultStatus(self.statuses[index]), self.details[index], self.times[index])
+
+    def append(self, link: str, result: Optional[str], finished_at: Optional[float] = None) -> None:
+        """
+        追加一条结果。
+
+        :param link: 输入链接
+        :type link: str
+        :param result: 解析结果
+        :type result: Optional[str]
+        :param finished_at: 完成时间，为 None 时使用当前时间
+        :type finished_at: Optional[float]
+        :rtype: None
+        """
+        status = ResultStatus.classify(result)
+        self.links.append(link)
+        self.statuses.append(status)
+        self.details.append(result if status in (ResultStatus.OK, ResultStatus.OTHER_ERROR) else None)
+        self.times.append(time.time() if finished_at is None else finished_at)
+        self.counts[status] += 1
+
+    def extend(self, rows: Iterable[Tuple[str, Optional[str], float]]) -> None:
+        """
+        批量追加结果。
+
+        :param rows: 由输入链接、解析结果和完成时间组成的元组
+        :type rows: Iterable[Tuple[str, Optional[str], float]]
+        :rtype: None
+        """
+        for link, result, finished_at in rows:
+            self.append(link, result, finished_at)
+
+    def status(self, index: int) -> ResultStatus:
+        """
+        获取指定行的状态。
+
+        :param index: 行号
+        :type index: int
+        :rtype: ResultStatus
+        """
+        return ResultStatus(self.statuses[index])
+
+    def indices(self, statuses: Iterable[ResultStatus]) -> List[int]:
+        """
+        获取指定状态的全部行号。
+
+        :param statuses: 需要的状态
+        :type statuses: Iterable[ResultStatus]
+        :rtype: List[int]
+        :return: 按顺序排列的行号
+        """
+        wanted = bytes(statuses)
+        if len(wanted) == 1:
+            # 只有一种状态时用 bytearray.find 跳过不需要的行
+            result, value, index = [], wanted[0], self.statuses.find(wanted)
+            while index != -1:
+                result.append(index)
+                index = self.statuses.find(value, index + 1)
+            return result
+        return [index for index, status in enumerate(self.statuses) if status in wanted]
+
+    def select(self, indices: Iterable[int]) -> 'ResultStore':
+        """
+        按行号生成新的结果集。
+
+        :param indices: 行号
+        :type indices: Iterable[int]
+        :rtype: ResultStore
+        :return: 只包含指定行的新结果集
+        """
+        store = ResultStore()
+        for index in indices:
+            status = self.statuses[index]
+            store.links.append(self.links[index])
+            store.statuses.append(status)
+            store.details.append(self.details[index])
+            store.times.append(self.times[index])
+            store.counts[status] += 1
+        return store
+
+    def lines(self, indices: Optional[Iterable[int]] = None) -> List[str]:
+        """
+        获取提示信息，格式与命令行的 text 格式相同。
+
+        :param indices: 行号，为 None 时返回全部行
+        :type indices: Optional[Iterable[int]]
+        :rtype: List[str]
+        :return: 提示信息列表
+        """
+        indices = range(len(self.links)) if indices is None else indices
+        return [format_result(self[index].result, self.links[index]) for index in indices]
+
+    def links_at(self, indices: Iterable[int]) -> List[str]:
+        """
+        获取指定行的输入链接。
+
+        :param indices: 行号
+        :type indices: Iterable[int]
+        :rtype: List[str]
+        :return: 输入链接列表
+        """
+        return [self.links[index] for index in indices]
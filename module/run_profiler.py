@@ -0,0 +1,240 @@
+"""
+这是一个Python文件，其中包含一个类 `RunProfiler` 和一个函数 `classify_stack`。
+
+类 `RunProfiler` 用于对一次解析任务做性能分析，同时使用两种方式：
+- 确定性分析：Python 3.12 以下每个参与解析的线程各有一个 `cProfile.Profile`。调用 `start` 的线程立即开始分析，之后新建的 `threading.Thread`（例如解析引擎的线程池）通过 `threading.setprofile` 自动开始分析，`QThread` 等不经过 `threading` 模块创建的线程需要在线程内调用 `profile_current_thread`。结束后合并为一个 pstats 文件。Python 3.12 起 cProfile 改用进程级的 `sys.monitoring`，同一时间只能启用一个分析器，它会同时分析所有线程，因此只在 `start` 中创建一个 `cProfile.Profile`，`profile_current_thread` 不做任何事。
+- 采样分析：后台线程每隔 `PROFILE_INTERVAL` 秒读取所有线程的调用栈，按阶段分类后计数，输出为火焰图工具（例如 flamegraph.pl、speedscope）可以直接读取的折叠栈文件，每行的第一层是阶段名称。
+
+阶段由函数 `classify_stack` 根据调用栈判断，从最内层的帧向外查找第一个匹配的规则：
+- `logging`：日志模块，用于确认 DEBUG 日志的开销。
+- `json`：解析服务器返回的 JSON。
+- `network`：httpx、socket、ssl 等网络请求。
+- `gui`：图形界面的信号处理和界面更新。
+- `parse`：读取、筛选和分割链接。
+- `wait`：限速器和限流检测器的主动等待。
+- `idle`：线程池和事件循环的空闲等待。
+- `other`：其他代码。
+
+调用 `stop` 后，`write` 方法在指定目录下生成同名的三个文件：`.pstats`（确定性分析结果）、`.collapsed`（折叠栈）和 `.txt`（各阶段的采样占比和累计耗时最高的 `PROFILE_TOP_FUNCTIONS` 个函数）。
+
+使用示例：
+
+```python
+profiler = RunProfiler()
+profiler.start()
+try:
+    run()
+finally:
+    profiler.stop()
+    profiler.write('profile')
+```
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import List, Optional, Union
+
+from .settings import PROFILE_INTERVAL, PROFILE_TOP_FUNCTIONS
+
+logger = logging.getLogger(__name__)
+
+# Python 3.12 起 cProfile 基于 sys.monitoring，启用第二个分析器会抛出 ValueError
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+# 按顺序匹配，每条规则为阶段名称、路径片段和函数名称
+STAGE_RULES = (
+    ('logging', ('/logging/',), ()),
+    ('json', ('/json/',), ()),
+    ('network', ('/httpx/', '/httpcore/', '/h11/', '/h2/', '/anyio/', '/ssl.py', '/socket.py'), ()),
+    ('gui', ('/ui/', '/PyQt5/'), ('flush_results', 'update_progress_bar_and_label', 'update_progress_label', 'update_progress_total',
+                                  'update_metrics_label')),
+    ('parse', ('/parse_link.py', '/extract_links.py', '/iter_links.py', '/process_input.py', '/canonical_key.py', '/re/'), ()),
+    ('wait', ('/rate_limiter.py', '/throttle_detector.py'), ('wait_for_admission',)),
+)
+IDLE_PATHS = ('/threading.py', '/queue.py', '/selectors.py', '/concurrent/futures/')
+
+
+def classify_stack(frame: FrameType) -> str:
+    """
+    根据调用栈判断所处的阶段。
+
+    :param frame: 最内层的帧
+    :type frame: FrameType
+    :rtype: str
+    :return: 阶段名称
+    """
+    innermost = frame
+    while frame is not None:
+        path = frame.f_code.co_filename.replace('\\', '/')
+        name = frame.f_code.co_name
+        for stage, paths, names in STAGE_RULES:
+            if name in names or any(part in path for part in paths):
+                return stage
+        frame = frame.f_back
+
+    # 主线程停在 Qt 事件循环时，最内层的 Python 帧就是入口函数
+    path = innermost.f_code.co_filename.replace('\\', '/')
+    if any(part in path for part in IDLE_PATHS) or innermost.f_code.co_name in ('main', '<module>'):
+        return 'idle'
+    return 'other'
+
+
+class RunProfiler:
+    """
+    解析任务性能分析类。
+
+    该类同时进行确定性分析和采样分析，并按阶段输出报告。
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        """
+        初始化性能分析器。
+
+        :param interval: 采样间隔，单位是秒
+        :type interval: float
+        """
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.profiles: List[cProfile.Profile] = []
+        self.stacks = Counter()
+        self.stages = Counter()
+        self.stopped = threading.Event()
+        self.sampler: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        """
+        开始分析当前线程和之后新建的线程，并启动采样线程。
+
+        :rtype: None
+        """
+        self.started_at = time.perf_counter()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self._profile_new_thread)
+            self.profile_current_thread()
+        else:
+            self._enable_profile()
+        self.sampler = threading.Thread(target=self._sample, name='RunProfilerSampler', daemon=True)
+        self.sampler.start()
+
+    def profile_current_thread(self) -> None:
+        """
+        开始分析当前线程，用于不经过 threading 模块创建的线程，例如 QThread。Python 3.12 起所有线程已经由同一个分析器分析，不做任何事。
+
+        :rtype: None
+        """
+        if PER_THREAD_PROFILES:
+            self._enable_profile()
+
+    def _enable_profile(self) -> None:
+        """
+        创建并启用一个 cProfile.Profile。
+
+        :rtype: None
+        """
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    def _profile_new_thread(self, frame: FrameType, event: str, arg: object) -> None:
+        """
+        新线程的第一个分析回调，在其中换成该线程自己的 cProfile.Profile。
+
+        :rtype: None
+        """
+        sys.setprofile(None)
+        if threading.current_thread() is not self.sampler:
+            self.profile_current_thread()
+
+    def _sample(self) -> None:
+        """
+        采样线程的主函数，定时读取所有线程的调用栈并计数。
+
+        :rtype: None
+        """
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stage = classify_stack(frame)
+                calls = []
+                while frame is not None:
+                    calls.append(f'{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}')
+                    frame = frame.f_back
+                calls.reverse()
+                thread_name = names.get(thread_id, 'QThread').split('_')[0]
+                self.stacks[';'.join([stage, thread_name, *calls])] += 1
+                self.stages[stage] += 1
+
+    def stop(self) -> None:
+        """
+        停止分析。调用方所在线程的分析同时停止，已经结束的线程不受影响。
+
+        :rtype: None
+        """
+        self.elapsed = time.perf_counter() - self.started_at
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)
+        self.stopped.set()
+        if self.sampler:
+            self.sampler.join()
+        with self.lock:
+            for profile in self.profiles:
+                profile.disable()
+
+    def write(self, target_dir: Union[str, os.PathLike]) -> Optional[str]:
+        """
+        把分析结果写到目录中，文件名为当前时间。
+
+        :param target_dir: 报告目录
+        :type target_dir: Union[str, os.PathLike]
+        :rtype: Optional[str]
+        :return: 不含扩展名的报告路径，写入失败时返回 None
+        """
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            base_path = os.path.join(target_dir, f'profile-{time.strftime("%Y%m%d-%H%M%S")}')
+            with self.lock:
+                profiles = list(self.profiles)
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f'{base_path}.pstats')
+
+            with open(f'{base_path}.collapsed', 'w', encoding='utf-8') as file:
+                for stack, count in self.stacks.most_common():
+                    file.write(f'{stack} {count}\n')
+
+            total = sum(self.stages.values()) or 1
+            busy = sum(count for stage, count in self.stages.items() if stage != 'idle') or 1
+            stream = io.StringIO()
+            stream.write(f'耗时：{self.elapsed:.2f} 秒，采样：{total} 次，分析线程：{len(profiles)} 个\n\n')
+            stream.write(f'{"阶段":<10}{"采样":>10}{"全部占比":>10}{"非空闲占比":>10}\n')
+            for stage, count in self.stages.most_common():
+                busy_share = '-' if stage == 'idle' else f'{count / busy:.1%}'
+                stream.write(f'{stage:<12}{count:>10}{count / total:>14.1%}{busy_share:>15}\n')
+            stream.write('\n')
+            stats.stream = stream
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+            with open(f'{base_path}.txt', 'w', encoding='utf-8') as file:
+                file.write(stream.getvalue())
+            return base_path
+        except Exception as e:
+            logger.error(f"An error occurred while writing profile report to '{target_dir}': {e}")
+            return None
@@ -3,7 +3,62 @@
 """
 
 CONFIG_PATH = r'config.txt'
+CACHE_PATH = r'cache.db'
+JOURNAL_PATH = r'journal.jsonl'
+CLI_JOURNAL_PATH = r'journal-cli.jsonl'
+JOURNAL_FSYNC_RECORDS = 100
+JOURNAL_FSYNC_INTERVAL = 1.0
+CACHE_TTL = 11 * 60 * 60
+NEGATIVE_CACHE_TTL = {
+    '401': 24 * 60 * 60,
+    '404': 30 * 24 * 60 * 60,
+    '503': 7 * 24 * 60 * 60,
+}
 MAX_FILE_SIZE = 5 * 1024 * 1024
+EXTRACT_PASSCODE_WINDOW = 200
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+RESULT_UNSUPPORTED = 'unsupported'
+RESULT_THROTTLED = 'throttled'
+RESULT_UNREACHABLE = 'unreachable'
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_MAX_JOBS = 100
+HTTP_POOL_SIZE = 32
+HTTP_KEEPALIVE_EXPIRY = 60
+HTTP2_ENABLED = True
+DNS_CACHE_TTL = 300
+RATE_LIMIT_START = 5.0
+RATE_LIMIT_MIN = 0.2
+RATE_LIMIT_MAX = 50.0
+RATE_LIMIT_BURST = 4.0
+RATE_LIMIT_INCREASE = 0.1
+RATE_LIMIT_DECREASE = 0.5
+RATE_LIMIT_COOLDOWN = 2.0
+THROTTLE_STATUS_CODES = (429, 503)
+THROTTLE_ERROR_STREAK = 5
+THROTTLE_LATENCY_FACTOR = 5.0
+THROTTLE_LATENCY_MIN = 3.0
+THROTTLE_LATENCY_STREAK = 3
+THROTTLE_PROBE_INITIAL = 30.0
+THROTTLE_PROBE_MAX = 300.0
+THROTTLE_PARK_LIMIT = 300.0
+THROTTLE_LINK_RETRIES = 3
+DEDUP_CACHE_SIZE = 50000
+TOKEN_MAX_STRIKES = 3
+PROXY_MAX_FAILURES = 3
+PROXY_EJECT_TIME = 30.0
+PROXY_EJECT_MAX = 600.0
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_INTERVAL = 5.0
+RESULT_FLUSH_INTERVAL = 80
+LARGE_DOCUMENT_LINES = 50000
+LARGE_DOCUMENT_DIGITS = 7
+SCROLL_SYNC_INTERVAL = 30
+PROFILE_DIR = r'profile'
+PROFILE_INTERVAL = 0.005
+PROFILE_TOP_FUNCTIONS = 30
+GETFILE_URL = "https://webapi.ctfile.com/getfile.php"
 CHECK_UPDATE_URL = "https://blog.x2b.net/ver/ctfileurldecoderversion.txt"
 REQUEST_HEAD = {
     'accept': 'application/json, text/javascript, */*; q=0.01',
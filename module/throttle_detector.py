@@ -0,0 +1,221 @@
+"""
+这是一个Python文件，其中包含一个类：`ThrottleDetector`，以及两个函数：`is_throttle_signal` 和 `is_connect_error`。
+
+类 `ThrottleDetector` 用于判断城通服务器是否开始限流。城通按账号和来源地址限流，所以每条请求路径（token 和出口代理的组合）都有自己的检测器，经过同一条路径的在途请求共享同一个实例，一条路径被限流不会暂停其他路径。每个请求完成后调用 `record` 记录结果，由函数 `is_throttle_signal` 判断该请求是否属于限流信号：服务器返回 `THROTTLE_STATUS_CODES` 中的 HTTP 状态码、读写超时或连接中断。连接不上服务器或代理（函数 `is_connect_error`）说明的是出口线路的健康状况，由代理池处理，不是限流信号；无法解析的响应和其他 HTTP 错误也不是限流信号。以下三种情况会被判定为限流：收到 `THROTTLE_STATUS_CODES` 中的 HTTP 状态码；连续 `THROTTLE_ERROR_STREAK` 次超时或连接中断；连续 `THROTTLE_LATENCY_STREAK` 次响应耗时超过平均耗时的 `THROTTLE_LATENCY_FACTOR` 倍。
+
+判定限流后该路径进入暂停状态，经过该路径的请求在发送前调用 `admit` 排队等待，`available_in` 可以在不占用探测名额的情况下查询等待时间。暂停期间每隔一段时间只放行一个探测请求，探测失败则等待时间翻倍（最长 `THROTTLE_PROBE_MAX` 秒），任意请求收到正常响应即视为服务器恢复，解除暂停，队列继续运行。无法解析的响应通过 `skip` 记录，既不算恢复也不算限流，只释放探测名额。限流期间失败的链接由调用方重新排队，而不是直接记为失败。
+
+连续暂停超过 `THROTTLE_PARK_LIMIT` 秒仍未恢复时放弃等待：解除暂停，之后的限流信号不再要求重试，链接直接记为失败，直到再次收到正常响应。服务器长时间不可用时任务因此可以结束，不会一直等待。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from .metrics import get_metrics
+from .settings import (THROTTLE_ERROR_STREAK, THROTTLE_LATENCY_FACTOR, THROTTLE_LATENCY_MIN, THROTTLE_LATENCY_STREAK,
+                       THROTTLE_PARK_LIMIT, THROTTLE_PROBE_INITIAL, THROTTLE_PROBE_MAX, THROTTLE_STATUS_CODES)
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttle_signal(status: Optional[int], error: Optional[Exception] = None) -> bool:
+    """
+    判断一次请求的结果是否属于限流信号。
+
+    :param status: HTTP 状态码，没有收到响应时为 None
+    :type status: Optional[int]
+    :param error: 请求时发生的异常，没有异常时为 None
+    :type error: Optional[Exception]
+    :rtype: bool
+    :return: 状态码属于 THROTTLE_STATUS_CODES，或者连接建立后发生超时、连接中断时返回 True
+    """
+    if status in THROTTLE_STATUS_CODES:
+        return True
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)) and not is_connect_error(error)
+
+
+def is_connect_error(error: Optional[Exception]) -> bool:
+    """
+    判断一次请求是否因为连接不上服务器或出口代理而失败。
+
+    :param error: 请求时发生的异常，没有异常时为 None
+    :type error: Optional[Exception]
+    :rtype: bool
+    :return: 连接失败、连接超时或代理错误时返回 True
+    """
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.ProxyError))
+
+
+class ThrottleDetector:
+    """
+    限流检测类。
+
+    该类根据一条请求路径的响应状态码、连续失败次数和响应耗时判断是否被限流，并控制暂停和探测恢复。
+    """
+
+    def __init__(self):
+        """
+        初始化限流检测器。
+        """
+        self.parked = False
+        self.parked_at = 0.0
+        self.gave_up = False
+        self.probing = False
+        self.backoff = THROTTLE_PROBE_INITIAL
+        self.next_probe_at = 0.0
+        self.error_streak = 0
+        self.latency_streak = 0
+        self.latency_average = 0.0
+        self.latency_samples = 0
+        self.lock = threading.Lock()
+
+    def admit(self) -> float:
+        """
+        询问当前是否可以发送请求。暂停期间到达探测时间时，只有第一个调用方会被放行作为探测请求。暂停时间超过 THROTTLE_PARK_LIMIT 秒时放弃等待，放行所有请求。
+
+        :rtype: float
+        :return: 需要等待的秒数，0 表示可以立即发送请求
+        """
+        with self.lock:
+            if not self.parked:
+                return 0.0
+            now = time.monotonic()
+            if now - self.parked_at >= THROTTLE_PARK_LIMIT:
+                self._give_up()
+                return 0.0
+            if not self.probing and now >= self.next_probe_at:
+                self.probing = True
+                logger.info('Sending canary request to check whether the server has recovered')
+                return 0.0
+            return 1.0 if self.probing else self.next_probe_at - now
+
+    def available_in(self) -> float:
+        """
+        估算下一次被放行前需要等待的秒数，不会占用探测名额。
+
+        :rtype: float
+        :return: 等待秒数，0 表示可以立即发送请求
+        """
+        with self.lock:
+            if not self.parked:
+                return 0.0
+            now = time.monotonic()
+            if now - self.parked_at >= THROTTLE_PARK_LIMIT:
+                return 0.0
+            if self.probing:
+                return 1.0
+            return max(self.next_probe_at - now, 0.0)
+
+    def record(self, throttled: bool, status: Optional[int], latency: float) -> bool:
+        """
+        记录一次请求的结果。
+
+        :param throttled: 是否为限流信号，由 is_throttle_signal 判断
+        :type throttled: bool
+        :param status: HTTP 状态码，没有收到响应时为 None
+        :type status: Optional[int]
+        :param latency: 请求耗时，单位是秒
+        :type latency: float
+        :rtype: bool
+        :return: 该请求是否应当在恢复后重试
+        """
+        with self.lock:
+            if not throttled:
+                if self.parked or self.gave_up:
+                    self._resume()
+                else:
+                    self.error_streak = 0
+                    self._record_latency(latency)
+                return False
+
+            if self.gave_up:
+                return False
+
+            if self.parked:
+                if self.probing:
+                    self.probing = False
+                    self.backoff = min(self.backoff * 2, THROTTLE_PROBE_MAX)
+                    self.next_probe_at = time.monotonic() + self.backoff
+                    logger.warning(f'Server is still throttling, next probe in {self.backoff:.0f} seconds')
+                return True
+
+            if status in THROTTLE_STATUS_CODES:
+                self._park(f'HTTP status {status}')
+            else:
+                self.error_streak += 1
+                if self.error_streak >= THROTTLE_ERROR_STREAK:
+                    self._park(f'{self.error_streak} consecutive failures')
+            return True
+
+    def skip(self) -> None:
+        """
+        记录一次无法判断服务器状态的请求，例如响应无法解析。不解除暂停，也不计入连续失败次数；如果该请求是探测请求，释放探测名额，由下一个请求重新探测。
+
+        :rtype: None
+        """
+        with self.lock:
+            if self.parked:
+                self.probing = False
+
+    def _record_latency(self, latency: float) -> None:
+        """
+        更新平均耗时并检查耗时突增，调用方需持有锁。
+
+        :param latency: 请求耗时，单位是秒
+        :type latency: float
+        """
+        if self.latency_samples >= 20 and latency >= THROTTLE_LATENCY_MIN and latency > self.latency_average * THROTTLE_LATENCY_FACTOR:
+            self.latency_streak += 1
+            if self.latency_streak >= THROTTLE_LATENCY_STREAK:
+                self._park(f'latency spike {latency:.2f}s, average {self.latency_average:.2f}s')
+            return
+
+        self.latency_streak = 0
+        self.latency_samples += 1
+        self.latency_average += (latency - self.latency_average) / min(self.latency_samples, 20)
+
+    def _park(self, reason: str) -> None:
+        """
+        进入暂停状态，调用方需持有锁。
+
+        :param reason: 判定限流的原因
+        :type reason: str
+        """
+        self.parked = True
+        self.parked_at = time.monotonic()
+        self.probing = False
+        self.backoff = THROTTLE_PROBE_INITIAL
+        self.next_probe_at = time.monotonic() + self.backoff
+        logger.warning(f'Throttling detected ({reason}), pausing for {self.backoff:.0f} seconds')
+        get_metrics().inc('ctfile_throttle_events_total', 'event="park"')
+
+    def _resume(self) -> None:
+        """
+        解除暂停状态，调用方需持有锁。
+        """
+        self.parked = False
+        self.parked_at = 0.0
+        self.gave_up = False
+        self.probing = False
+        self.error_streak = 0
+        self.latency_streak = 0
+        logger.info('Server has recovered, resuming')
+        get_metrics().inc('ctfile_throttle_events_total', 'event="resume"')
+
+    def _give_up(self) -> None:
+        """
+        暂停时间过长，放弃等待并解除暂停，调用方需持有锁。
+        """
+        self.parked = False
+        self.gave_up = True
+        self.probing = False
+        logger.error(f'Server has not recovered within {THROTTLE_PARK_LIMIT:.0f} seconds, failing throttled links until it responds')
+        get_metrics().inc('ctfile_throttle_events_total', 'event="give_up"')
@@ -0,0 +1,138 @@
+"""
+这是一个Python文件，其中包含两个类：`Route` 和 `TokenPool`。
+
+类 `TokenPool` 用于同时使用多个会员账号的 token 解析链接。城通按账号和来源地址限制请求速度，因此每条请求路径（token 和出口代理的组合）都有自己的限速器和限流检测器，由类 `Route` 表示。`acquire` 方法在健康的 token 和可用的出口代理中选择最快可以发出请求的路径，从而把请求分摊到各个账号和代理上；某条路径被限流暂停时，其他路径照常运行，增加代理可以直接提高吞吐量。每次请求完成后调用 `report` 报告结果：某个 token 连续 `TOKEN_MAX_STRIKES` 次返回 `-1`（服务器在 JSON 中返回代码 -1，需要重新登录）时，该 token 会被移出池子，不再参与调度。无法解析的响应和网络错误的结果不是 `-1`，不会计入失败次数。
+
+这个模块主要用于管理多个 token 和请求路径，包括调度、限速和健康检查。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import itertools
+import logging
+import threading
+from typing import Collection, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .rate_limiter import RateLimiter
+from .settings import RESULT_THROTTLED, TOKEN_MAX_STRIKES
+from .throttle_detector import ThrottleDetector
+
+logger = logging.getLogger(__name__)
+
+
+class Route(NamedTuple):
+    """
+    请求路径，包括 token、出口代理以及该路径专用的限速器和限流检测器。
+    """
+    token: str
+    proxy: Optional[str]
+    limiter: RateLimiter
+    detector: ThrottleDetector
+
+
+class TokenPool:
+    """
+    token 池类。
+
+    该类为每个 token 维护失败计数，为每条请求路径维护独立的限速器和限流检测器，并在健康的路径之间调度请求。
+    """
+
+    def __init__(self, tokens: Iterable[str], delay: str = '0'):
+        """
+        初始化 token 池。
+
+        :param tokens: 用户 token，重复和空白的 token 会被忽略
+        :type tokens: Iterable[str]
+        :param delay: 每条请求路径的初始请求间隔，单位是毫秒
+        :type delay: str
+        """
+        self.tokens = [token for token in dict.fromkeys(token.strip() for token in tokens) if token]
+        self.delay = delay
+        self.routes = {}
+        self.strikes = {token: 0 for token in self.tokens}
+        self.removed = set()
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_string(cls, tokens: str, delay: str = '0') -> 'TokenPool':
+        """
+        从设置中的 token 字符串创建 token 池，多个 token 用英文逗号分隔。
+
+        :param tokens: token 字符串
+        :type tokens: str
+        :param delay: 每条请求路径的初始请求间隔，单位是毫秒
+        :type delay: str
+        :rtype: TokenPool
+        :return: token 池实例
+        """
+        return cls(tokens.split(','), delay)
+
+    def healthy(self) -> List[str]:
+        """
+        获取所有健康的 token。
+
+        :rtype: List[str]
+        :return: 尚未被移除的 token
+        """
+        with self.lock:
+            return [token for token in self.tokens if token not in self.removed]
+
+    def route(self, token: str, proxy: Optional[str]) -> Route:
+        """
+        获取 token 和出口代理对应的请求路径，第一次使用时创建限速器和限流检测器。
+
+        :param token: 用户 token
+        :type token: str
+        :param proxy: 出口代理地址，为 None 表示直接连接
+        :type proxy: Optional[str]
+        :rtype: Route
+        :return: 请求路径
+        """
+        with self.lock:
+            route = self.routes.get((token, proxy))
+            if route is None:
+                route = self.routes[(token, proxy)] = Route(token, proxy, RateLimiter.from_delay(self.delay), ThrottleDetector())
+            return route
+
+    def acquire(self, exclude: Collection[str] = (), proxies: Sequence[Optional[str]] = (None,)) -> Tuple[Optional[Route], float]:
+        """
+        选择最快可以发出请求的请求路径。优先选择没有被限流暂停、限速器等待时间最短的路径，等待时间相同时 token 轮流选择，代理按 proxies 中的顺序选择。
+
+        :param exclude: 本次不参与选择的 token
+        :type exclude: Collection[str]
+        :param proxies: 可用的出口代理，按优先顺序排列，None 表示直接连接
+        :type proxies: Sequence[Optional[str]]
+        :rtype: Tuple[Optional[Route], float]
+        :return: 选中的请求路径和需要等待的秒数，等待时间大于 0 时所有路径都在暂停，调用方需要等待后重新选择；没有可用 token 时路径为 None
+        """
+        candidates = [token for token in self.healthy() if token not in exclude]
+        if not candidates:
+            return None, 0.0
+        offset = next(self.counter) % len(candidates)
+        candidates = candidates[offset:] + candidates[:offset]
+        routes = [(rank, self.route(token, proxy)) for rank, proxy in enumerate(proxies) for token in candidates]
+        _, route = min(routes, key=lambda item: (item[1].detector.available_in(), item[1].limiter.available_in(), item[0]))
+        return route, route.detector.admit()
+
+    def report(self, token: str, result: Optional[str]) -> None:
+        """
+        报告一次请求的结果，连续多次返回 -1 的 token 会被移除。
+
+        :param token: 发出请求使用的 token
+        :type token: str
+        :param result: 请求结果
+        :type result: Optional[str]
+        :rtype: None
+        """
+        with self.lock:
+            if result == '-1':
+                self.strikes[token] += 1
+                if self.strikes[token] >= TOKEN_MAX_STRIKES and token not in self.removed:
+                    self.removed.add(token)
+                    logger.warning(f'Token {token} removed after {self.strikes[token]} consecutive -1 responses, '
+                                   f'{len(self.tokens) - len(self.removed)} tokens left')
+            elif result and result != RESULT_THROTTLED:
+                self.strikes[token] = 0
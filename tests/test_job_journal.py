@@ -0,0 +1,75 @@
+"""
+这是一个Python文件，包含任务日志的回归测试。
+
+测试模拟图形界面重试筛选出的失败链接：重试时以追加模式打开任务日志，确认旧的记录不会被清空，继续运行时同一链接以重试得到的新结果为准。
+
+在项目根目录运行：`python -m unittest discover tests`
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import os
+import tempfile
+import unittest
+
+from module.job_journal import JobJournal
+
+OK_LINK = 'https://url01.ctfile.com/f/13660405-1-582bbf?p=AA00'
+DEAD_LINK = 'https://url01.ctfile.com/f/13660405-2-582bbf?p=BB00'
+FAILED_LINK = 'https://url01.ctfile.com/f/13660405-3-582bbf?p=CC00'
+
+
+class JobJournalTest(unittest.TestCase):
+    """
+    任务日志的回归测试类。
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'journal.jsonl')
+
+        journal = JobJournal(self.path)
+        journal.put(OK_LINK, 'https://mock.ctfile.local/dl/1')
+        journal.put(DEAD_LINK, '503')
+        journal.put(FAILED_LINK, None)
+        journal.close()
+
+    def test_retry_keeps_older_records(self):
+        # 筛选出 503 和请求失败的链接重试，成功的链接不在重试范围内
+        journal = JobJournal(self.path, append=True)
+        self.assertIsNone(journal.get(OK_LINK))
+        journal.put(DEAD_LINK, 'https://mock.ctfile.local/dl/2')
+        journal.put(FAILED_LINK, 'https://mock.ctfile.local/dl/3')
+        journal.close()
+
+        self.assertEqual(JobJournal.load(self.path), {
+            OK_LINK: 'https://mock.ctfile.local/dl/1',
+            DEAD_LINK: 'https://mock.ctfile.local/dl/2',
+            FAILED_LINK: 'https://mock.ctfile.local/dl/3',
+        })
+        resumed = JobJournal(self.path, resume=True)
+        self.addCleanup(resumed.close)
+        self.assertEqual(resumed.get(DEAD_LINK), 'https://mock.ctfile.local/dl/2')
+
+    def test_retry_after_torn_line(self):
+        # 进程崩溃时最后一行只写了一半，重试追加的记录不能和它接在同一行
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('{"link": "https://url01.ctfile.com/f/13660405-4')
+        journal = JobJournal(self.path, append=True)
+        journal.put(DEAD_LINK, 'https://mock.ctfile.local/dl/2')
+        journal.close()
+
+        done = JobJournal.load(self.path)
+        self.assertEqual(done[DEAD_LINK], 'https://mock.ctfile.local/dl/2')
+        self.assertEqual(done[OK_LINK], 'https://mock.ctfile.local/dl/1')
+
+    def test_new_job_clears_records(self):
+        JobJournal(self.path).close()
+        self.assertEqual(JobJournal.load(self.path), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
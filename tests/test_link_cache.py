@@ -0,0 +1,41 @@
+"""
+这是一个Python文件，包含下载链接缓存的回归测试。
+
+在项目根目录运行：`python -m unittest discover tests`
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from module.link_cache import LinkCache
+
+
+class LinkCacheTest(unittest.TestCase):
+    """
+    下载链接缓存的回归测试类。
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = LinkCache(os.path.join(directory.name, 'cache.db'), ttl=0.2)
+        self.addCleanup(self.cache.close)
+
+    def test_success_clears_dead_record(self):
+        self.cache.store('13660405-878244288-582bbf', 'AA00', 'token', '404')
+        self.assertEqual(self.cache.lookup('13660405-878244288-582bbf', 'AA00', ['token']), '404')
+
+        # 重新检查时解析成功，下载链接过期后不应再返回旧的错误代码
+        self.cache.store('13660405-878244288-582bbf', 'AA00', 'token', 'https://mock.ctfile.local/dl/1')
+        time.sleep(0.3)
+        self.assertIsNone(self.cache.lookup('13660405-878244288-582bbf', 'AA00', ['token']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+这是一个Python文件，包含解析引擎按规范键合并重复链接的回归测试。
+
+测试把 `LinkResolver.resolve` 换成记录调用次数的替身，不发送网络请求，确认不同写法和不同位置的重复链接只请求一次，结果仍按输入顺序逐行产出。
+
+在项目根目录运行：`python -m unittest discover tests`
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import threading
+import time
+import unittest
+from collections import Counter
+from unittest import mock
+
+from module.canonical_key import canonical_key
+from module.link_resolver import LinkResolver
+from module.settings import RESULT_UNSUPPORTED
+
+LINKS = [
+    'https://url01.ctfile.com/f/13660405-1-582bbf?p=AA00',
+    'https://url02.ctfile.com/f/13660405-2-582bbf?p=BB00',
+    'https://url99.ctfile.com/f/13660405-1-582bbf AA00',
+    'not a link',
+    'https://url03.ctfile.com/f/13660405-3-582bbf?p=CC00',
+    '  https://url01.ctfile.com/f/13660405-2-582bbf?p=BB00  ',
+    'https://url01.ctfile.com/f/13660405-1-582bbf?p=AA01',
+    'https://url01.ctfile.com/f/13660405-3-582bbf CC00',
+    'not a link',
+    'https://url05.ctfile.com/f/13660405-1-582bbf?p=AA00',
+] + [f'https://url01.ctfile.com/f/13660405-{index % 3 + 1}-582bbf?p={"AA00 BB00 CC00".split()[index % 3]}' for index in range(20)]
+
+
+class LinkResolverTest(unittest.TestCase):
+    """
+    解析引擎合并重复链接的回归测试类。
+    """
+
+    def setUp(self):
+        self.resolver = LinkResolver('token', concurrency=2)
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        self.resolver.resolve = self.fake_resolve
+
+    def fake_resolve(self, link, is_running=None):
+        key = canonical_key(link)
+        with self.lock:
+            self.calls[key] += 1
+        # 让任务有机会在窗口内重叠，覆盖在途合并和已完成合并两种情况
+        time.sleep(0.01)
+        return f'https://mock.ctfile.local/dl/{key[0]}/{key[1]}' if key else RESULT_UNSUPPORTED
+
+    def expected(self, link):
+        key = canonical_key(link)
+        return f'https://mock.ctfile.local/dl/{key[0]}/{key[1]}' if key else RESULT_UNSUPPORTED
+
+    def test_duplicates_resolved_once_in_input_order(self):
+        results = list(self.resolver.resolve_links(LINKS))
+        self.assertEqual(results, [(link, self.expected(link)) for link in LINKS])
+
+        keys = {canonical_key(link) for link in LINKS} - {None}
+        self.assertEqual(len(keys), 4)
+        for key in keys:
+            self.assertEqual(self.calls[key], 1, key)
+        # 不支持的链接没有规范键，每一行单独处理
+        self.assertEqual(self.calls[None], LINKS.count('not a link'))
+
+    @mock.patch('module.link_resolver.DEDUP_CACHE_SIZE', 1)
+    def test_evicted_keys_are_requested_again(self):
+        # 中间的链接把第一条链接的结果挤出已完成记录，之后同一个文件需要重新请求
+        links = ['https://url01.ctfile.com/f/13660405-1-582bbf?p=AA00']
+        links += [f'https://url01.ctfile.com/f/13660405-{index}-582bbf?p=X' for index in range(2, 12)]
+        links += ['https://url02.ctfile.com/f/13660405-1-582bbf AA00']
+        results = list(self.resolver.resolve_links(links))
+        self.assertEqual([link for link, _ in results], links)
+        self.assertEqual(results[-1][1], self.expected(links[0]))
+        self.assertEqual(self.calls[canonical_key(links[0])], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+这是一个Python文件，包含链接解析器的回归测试。
+
+测试按表格逐条对比 `parse_link` 和原来的 `filter_correct_link` 加 `get_file_info` 的结果，覆盖正常链接、格式错误的链接和各种边界情况，确认单次匹配的解析器没有改变解析规则。
+
+在项目根目录运行：`python -m unittest discover tests`
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import unittest
+from typing import Optional, Tuple
+
+from module.filter_correct_link import filter_correct_link
+from module.get_file_info import get_file_info
+from module.parse_link import LinkRecord, RejectReason, parse_link
+
+# 两种实现结果相同的输入行和期望的文件名、访问密码，None 表示链接不被支持
+SAME_RESULT = [
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf?p=AA00', ('13660405-878244288-582bbf', 'AA00')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf AA00', ('13660405-878244288-582bbf', 'AA00')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf  1234', ('13660405-878244288-582bbf', '1234')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf', ('13660405-878244288-582bbf', '')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf?p=', ('13660405-878244288-582bbf', '')),
+    ('  https://url01.ctfile.com/f/13660405-878244288-582bbf?p=AA00  \n', ('13660405-878244288-582bbf', 'AA00')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf?p=提取码AA00', ('13660405-878244288-582bbf', 'AA00')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf 密码：1234', ('13660405-878244288-582bbf', '1234')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf?p=AA00 extra', ('13660405-878244288-582bbf', 'AA00 extra')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf-extra?p=AA00', ('13660405-878244288-582bbf-extra', 'AA00')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf#x?p=1', ('13660405-878244288-582bbf#x', '1')),
+    ('https://a.b.ctfile.com/f/1-2-x?p=1', ('1-2-x', '1')),
+    ('http://url01.ctfile.com/f/13660405-878244288-582bbf?p=AA00', None),
+    ('https://url01.ctfile.net/f/13660405-878244288-582bbf?p=AA00', None),
+    ('https://ctfile.com/f/1-2-x?p=1', None),
+    ('https://url01.ctfile.com/d/13660405-878244288-582bbf?p=AA00', None),
+    ('https://url01.ctfile.com/f/13660405-abc-582bbf?p=AA00', None),
+    ('xx https://url01.ctfile.com/f/1-2-x?p=1', None),
+    ('not a link', None),
+    ('', None),
+    ('   ', None),
+]
+
+# 原来的函数本身处理错误的输入行，以及 parse_link 的结果
+DIFFERENT_RESULT = [
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf\t1234', ('13660405-878244288-582bbf', '1234')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf?p=AA00?p=BB', ('13660405-878244288-582bbf', 'AA00?p=BB')),
+    ('https://url01.ctfile.com/f/13660405-878244288-582bbf?p=a/f/b', ('13660405-878244288-582bbf', 'a/f/b')),
+]
+
+
+def legacy_parse(line: str) -> Optional[Tuple[str, str]]:
+    """
+    使用原来的两个函数解析一行输入。
+    """
+    link = filter_correct_link(line)
+    return get_file_info(link) if link else None
+
+
+def new_parse(line: str) -> Optional[Tuple[str, str]]:
+    """
+    使用 parse_link 解析一行输入。
+    """
+    record = parse_link(line)
+    return (record.file, record.passwd) if isinstance(record, LinkRecord) else None
+
+
+class ParseLinkTest(unittest.TestCase):
+    """
+    链接解析器的回归测试类。
+    """
+
+    def test_matches_legacy_parser(self):
+        for line, expected in SAME_RESULT:
+            with self.subTest(line=line):
+                self.assertEqual(legacy_parse(line), expected)
+                self.assertEqual(new_parse(line), expected)
+
+    def test_fixes_legacy_edge_cases(self):
+        for line, expected in DIFFERENT_RESULT:
+            with self.subTest(line=line):
+                self.assertNotEqual(legacy_parse(line), expected)
+                self.assertEqual(new_parse(line), expected)
+
+    def test_rejection_reasons(self):
+        self.assertEqual(parse_link('  \n').reason, RejectReason.EMPTY)
+        self.assertEqual(parse_link('not a link').reason, RejectReason.UNSUPPORTED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+这是一个Python文件，包含限流检测的回归测试。
+
+测试使用 `benchmark.mock_server` 启动本地模拟的 getfile.php 接口，驱动真实的解析流程，确认无法解析的响应不会被当成限流，也不会让 token 被当成失效移除，连接不上服务器时链接直接记为失败而不会暂停，一条请求路径被限流时其他路径照常运行，真正的限流结束后链接可以继续解析。
+
+在项目根目录运行：`python -m unittest discover tests`
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import asyncio
+import socket
+import time
+import unittest
+from unittest import mock
+
+from benchmark.mock_server import FaultPlan, start_mock_server
+from module.link_resolver import LinkResolver
+from module.proxy_pool import ProxyPool
+from module.resolve_many import resolve_many
+from module.throttle_detector import ThrottleDetector
+from module.token_pool import TokenPool
+
+LINKS = [f'https://url01.ctfile.com/f/13660405-{index}-582bbf?p=AA00' for index in range(10)]
+
+
+def unused_url() -> str:
+    """
+    获取一个没有服务监听的接口地址。
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f'http://127.0.0.1:{port}/getfile.php'
+
+
+class ThrottleDetectorTest(unittest.TestCase):
+    """
+    限流检测的回归测试类。
+    """
+
+    def serve(self, plan: FaultPlan) -> str:
+        """
+        启动模拟服务，测试结束后自动关闭。
+        """
+        server, url = start_mock_server(plan=plan)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return url
+
+    def resolve(self, url: str, links: list = LINKS, concurrency: int = 4) -> list:
+        """
+        使用线程池解析引擎解析测试链接。
+        """
+        with mock.patch('module.request_download_link.GETFILE_URL', url):
+            return list(LinkResolver('token', concurrency=concurrency).resolve_links(links))
+
+    def test_malformed_responses_are_not_throttling(self):
+        url = self.serve(FaultPlan(latency=0.001, jitter=0, malformed_rate=1.0))
+        start = time.monotonic()
+        results = self.resolve(url)
+        self.assertLess(time.monotonic() - start, 20)
+        self.assertEqual([result for _, result in results], [None] * len(LINKS))
+
+    def test_malformed_responses_keep_token(self):
+        # 只有服务器返回的代码 -1 才计入 token 的失败次数，损坏的响应不应该让唯一的 token 被移除
+        url = self.serve(FaultPlan(latency=0.001, jitter=0, malformed_rate=0.5, seed=1))
+        links = [f'https://url01.ctfile.com/f/13660405-{index}-582bbf?p=AA00' for index in range(40)]
+        resolver = LinkResolver('token', concurrency=1)
+        with mock.patch('module.request_download_link.GETFILE_URL', url):
+            results = [result for _, result in resolver.resolve_links(links)]
+        self.assertEqual(resolver.pool.healthy(), ['token'])
+        self.assertNotIn('-1', results)
+        self.assertIn(None, results)
+        self.assertGreater(sum(1 for result in results if result and result.startswith('https://')), len(links) // 4)
+
+    def test_malformed_responses_are_not_throttling_async(self):
+        url = self.serve(FaultPlan(latency=0.001, jitter=0, malformed_rate=1.0))
+
+        async def collect():
+            return [item async for item in resolve_many(LINKS, 'token', concurrency=4)]
+
+        with mock.patch('module.resolve_many.GETFILE_URL', url):
+            results = asyncio.run(asyncio.wait_for(collect(), 20))
+        self.assertEqual([result for _, result in results], [None] * len(LINKS))
+
+    @mock.patch('module.throttle_detector.THROTTLE_PROBE_INITIAL', 0.0)
+    def test_malformed_probe_keeps_detector_parked(self):
+        detector = ThrottleDetector()
+        detector.record(True, 429, 0.01)
+        self.assertEqual(detector.admit(), 0.0)
+        self.assertGreater(detector.admit(), 0.0)
+
+        # 探测请求收到无法解析的响应：保持暂停，但下一个请求可以重新探测
+        detector.skip()
+        self.assertTrue(detector.parked)
+        self.assertEqual(detector.admit(), 0.0)
+
+    def test_unreachable_server_fails_without_parking(self):
+        # 连接失败是出口线路的问题，不是限流信号，链接重试几次后直接记为失败
+        resolver = LinkResolver('token', concurrency=4)
+        start = time.monotonic()
+        with mock.patch('module.request_download_link.GETFILE_URL', unused_url()):
+            results = list(resolver.resolve_links(LINKS))
+        self.assertLess(time.monotonic() - start, 20)
+        self.assertEqual([result for _, result in results], [None] * len(LINKS))
+        self.assertFalse(any(route.detector.parked for route in resolver.pool.routes.values()))
+
+    def test_parked_route_does_not_block_other_proxies(self):
+        pool = TokenPool(['token'])
+        proxies = ProxyPool(['http://127.0.0.1:1', 'http://127.0.0.1:2'])
+        pool.route('token', 'http://127.0.0.1:1').detector.record(True, 429, 0.01)
+
+        # 一个代理上的路径被限流时，同一个 token 经过另一个代理的路径照常放行
+        route, wait = pool.acquire((), proxies.candidates())
+        self.assertEqual((route.proxy, wait), ('http://127.0.0.1:2', 0.0))
+
+        # 服务器返回的限流状态码说明代理工作正常，不计入代理的失败次数
+        proxies.acquire('http://127.0.0.1:1')
+        proxies.release('http://127.0.0.1:1', True, 0.01)
+        self.assertEqual(proxies.failures['http://127.0.0.1:1'], 0)
+
+    @mock.patch('module.throttle_detector.THROTTLE_PROBE_INITIAL', 0.2)
+    def test_throttled_links_resume_after_recovery(self):
+        url = self.serve(FaultPlan(latency=0.001, jitter=0, throttle_after=3, throttle_for=0.5))
+        results = self.resolve(url, concurrency=1)
+        self.assertEqual(len(results), len(LINKS))
+        for link, result in results:
+            self.assertEqual(result, f'https://mock.ctfile.local/dl/{link.split("/")[-1].split("?")[0]}')
+
+
+if __name__ == '__main__':
+    unittest.main()
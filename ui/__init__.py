@@ -10,6 +10,8 @@ from .action_save import ActionSave
 from .action_setting import ActionSetting
 from .action_update import ActionUpdate
 from .action_filter import ActionFilter
-from .code_editor import CodeEditor
+from .action_extract import ActionExtract
+from .code_editor import CodeEditor, ScrollSync
+from .result_table import ResultTableModel, ResultTable
 from .dialog_about import DialogAbout
 from .dialog_settings import DialogSettings
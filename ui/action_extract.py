@@ -0,0 +1,71 @@
+"""
+这是一个Python文件，其中包含一个类 `ActionExtract`。
+
+类 `ActionExtract` 用于定义 "提取链接" 动作。它接受三个参数 `main_window`、`text_input` 和 `action_open`，分别代表所属的主窗口、链接文本框和打开文件动作。当动作被触发时，`extract_input` 方法会从链接文本框中粘贴的论坛网页、HTML 代码或聊天记录里提取所有城通网盘链接及其附近的提取码，整理成一行一个的标准链接，替换文本框的内容。如果当前打开的是不载入文本框的大文件，则使用内存映射扫描该文件，把提取结果写到同目录下的新文件，再打开这个新文件。
+
+这个模块主要用于定义和实现 "提取链接" 动作，包括创建动作，设置动作属性和定义动作的触发行为。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+from typing import NoReturn
+
+from PyQt5.QtWidgets import QAction, QMainWindow
+
+from module import extract_links, extract_links_to_file
+from ui.action_open import ActionOpen
+from ui.code_editor import CodeEditor
+
+logger = logging.getLogger(__name__)
+
+
+class ActionExtract:
+    """
+    提取链接动作类。
+
+    该类用于创建一个提取链接的动作，该动作可以从任意文本中提取城通网盘链接和提取码。
+    """
+
+    def __init__(self, main_window: QMainWindow, text_input: CodeEditor, action_open: ActionOpen):
+        """
+        初始化动作。
+
+        :param main_window: 所属的主窗口
+        :type main_window: QMainWindow
+        :param text_input: 链接文本框
+        :type text_input: CodeEditor
+        :param action_open: 打开文件动作，用于读取大文件的路径
+        :type action_open: ActionOpen
+        """
+        self.main_window = main_window
+        self.text_input = text_input
+        self.action_open = action_open
+
+        self.action_extract = QAction('提取链接', self.main_window)
+        self.action_extract.setStatusTip('从网页、论坛帖子或聊天记录中提取城通链接和提取码')
+        self.action_extract.setShortcut('F6')
+        self.action_extract.triggered.connect(self.extract_input)
+
+    def extract_input(self) -> NoReturn:
+        """
+        提取链接文本框或大文件中的城通网盘链接。
+
+        :rtype: NoReturn
+        """
+        try:
+            input_file = self.action_open.input_file
+            if input_file:
+                target_path = f'{input_file}.links.txt'
+                count = extract_links_to_file(input_file, target_path)
+                if count is not None:
+                    logger.info(f'Extracted {count} links to {target_path}')
+                    self.action_open.load_file(target_path)
+                return
+
+            lines = [record.line for record in extract_links(self.text_input.toPlainText())]
+            self.text_input.setPlainText('\n'.join(lines))
+        except Exception as e:
+            logger.error(f"An error occurred while extracting links: {e}")
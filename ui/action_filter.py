@@ -1,7 +1,9 @@
 """
 这是一个Python文件，其中包含一个类 `ActionFilter`。
 
-类 `ActionFilter` 用于定义 "过滤" 动作。它接受两个参数 `main_window` 和 `text_output`，分别代表所属的主窗口和输出文本框。在 `__init__` 方法中，我们定义了一个 QAction 对象 `action_filter`，并将其与 `filter_output` 方法连接。当动作被触发时，`filter_output` 方法会尝试过滤掉输出信息中不以 'https://' 开头的行。
+类 `ActionFilter` 用于定义 "过滤" 动作和 "筛选结果" 菜单。它接受两个参数 `main_window` 和 `result_table`，分别代表所属的主窗口和结果表格。在 `__init__` 方法中，我们定义了一个可勾选的 QAction 对象 `action_filter`，并将其与 `filter_output` 方法连接，勾选时只显示获取到下载地址的结果，取消勾选时恢复显示全部结果。菜单 `menu_filter` 中的选项互斥，可以只显示成功、失败或某一种错误代码的结果。
+
+筛选只改变结果表格显示哪些行，不会删除结果，切换筛选条件只需要按状态查找一次行号，十万行的结果也能立即切换。
 
 这个模块主要用于定义和实现 "过滤" 动作，包括创建动作，设置动作属性和定义动作的触发行为。
 
@@ -11,54 +13,92 @@
 """
 
 import logging
-from typing import NoReturn
+from typing import NoReturn, Optional, Tuple
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QTextCharFormat, QBrush
-from PyQt5.QtWidgets import QAction, QMainWindow
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QAction, QActionGroup, QMainWindow, QMenu
 
 from module.get_resource_path import get_resource_path
-from ui.code_editor import CodeEditor
+from module.result_store import ResultStatus
+from ui.result_table import ResultTable
 
 logger = logging.getLogger(__name__)
 
+SUCCESS_STATUSES = (ResultStatus.OK,)
+FAILURE_STATUSES = tuple(status for status in ResultStatus if status != ResultStatus.OK)
+FILTERS = (
+    ('全部结果', None),
+    ('仅成功', SUCCESS_STATUSES),
+    ('仅失败', FAILURE_STATUSES),
+    ('密码错误（401）', (ResultStatus.PASSWORD_WRONG,)),
+    ('文件已删除（404）', (ResultStatus.FILE_DELETED,)),
+    ('文件已失效（503）', (ResultStatus.FILE_EXPIRED,)),
+    ('token 失效（-1）', (ResultStatus.TOKEN_INVALID,)),
+)
+
 
 class ActionFilter:
     """
     过滤动作类。
 
-    该类用于创建一个过滤动作，该动作可以过滤输出信息中不以 'https://' 开头的行。
+    该类用于创建一个过滤动作和一个筛选结果菜单，用于切换结果表格显示的结果。
     """
 
-    def __init__(self, main_window: QMainWindow, text_output: CodeEditor):
+    def __init__(self, main_window: QMainWindow, result_table: ResultTable):
         """
         初始化动作。
 
         :param main_window: 所属的主窗口
         :type main_window: QMainWindow
-        :param text_output: 输出文本框
-        :type text_output: CodeEditor
+        :param result_table: 结果表格
+        :type result_table: ResultTable
         """
         self.main_window = main_window
-        self.text_output = text_output
+        self.result_table = result_table
 
         # 过滤动作
         self.action_filter = QAction(QIcon(get_resource_path('media/icons8-filter-26.png')), '过滤', self.main_window)
-        self.action_filter.setStatusTip('过滤掉失败链接')
+        self.action_filter.setStatusTip('只显示获取到下载地址的结果，再次点击恢复显示全部结果')
         self.action_filter.setShortcut('F7')
+        self.action_filter.setCheckable(True)
         self.action_filter.triggered.connect(self.filter_output)
 
-    def filter_output(self) -> NoReturn:
+        # 筛选结果菜单
+        self.menu_filter = QMenu('筛选结果', self.main_window)
+        self.filter_group = QActionGroup(self.main_window)
+        self.filter_actions = []
+        for text, statuses in FILTERS:
+            action = QAction(text, self.main_window)
+            action.setCheckable(True)
+            action.triggered.connect(lambda _, selected=statuses: self.apply_filter(selected))
+            self.filter_group.addAction(action)
+            self.menu_filter.addAction(action)
+            self.filter_actions.append((action, statuses))
+        self.filter_actions[0][0].setChecked(True)
+
+    def filter_output(self, checked: bool) -> NoReturn:
+        """
+        切换是否只显示成功的结果。
+
+        :param checked: 是否勾选
+        :type checked: bool
+        :rtype: NoReturn
+        """
+        self.apply_filter(SUCCESS_STATUSES if checked else None)
+
+    def apply_filter(self, statuses: Optional[Tuple[ResultStatus, ...]]) -> NoReturn:
         """
-        过滤输出信息。
+        只显示指定状态的结果，并同步过滤按钮和菜单的勾选状态。
 
+        :param statuses: 需要显示的状态，为 None 时显示全部结果
+        :type statuses: Optional[Tuple[ResultStatus, ...]]
         :rtype: NoReturn
         """
         try:
-            filtered_text = '\n'.join(line for line in self.text_output.toPlainText().split('\n') if line.startswith('https://'))
-            default_format = QTextCharFormat()
-            default_format.setForeground(QBrush(Qt.darkGreen))
-            self.text_output.setCurrentCharFormat(default_format)
-            self.text_output.setPlainText(filtered_text)
+            self.result_table.result_model.set_filter(statuses)
+            self.action_filter.setChecked(statuses == SUCCESS_STATUSES)
+            for action, action_statuses in self.filter_actions:
+                if action_statuses == statuses:
+                    action.setChecked(True)
         except Exception as e:
             logger.error(f"An error occurred while filtering output: {e}")
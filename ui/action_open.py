@@ -1,7 +1,7 @@
 """
 这是一个Python文件，包含一个类 `ActionOpen`。
 
-类 `ActionOpen` 用于定义 "打开文件" 动作。它接受两个参数，`main_window` 代表所属的主窗口，`text_input` 是链接文本框。在 `__init__` 方法中，我们定义了一个 QAction 对象 `action_open`，并将其与 `open_file` 方法连接。当动作被触发时，`open_file` 方法会尝试打开一个文件并将其内容读取到链接文本框。
+类 `ActionOpen` 用于定义 "打开文件" 动作。它接受两个参数，`main_window` 代表所属的主窗口，`text_input` 是链接文本框。在 `__init__` 方法中，我们定义了一个 QAction 对象 `action_open`，并将其与 `open_file` 方法连接。当动作被触发时，`open_file` 方法会尝试打开一个文件并将其内容读取到链接文本框。超过 `MAX_FILE_SIZE` 的大文件不会读入文本框，而是记录到 `input_file` 属性，开始运行后由后台线程逐行读取解析；用户修改文本框内容后会退出大文件模式。
 
 这个模块主要用于定义和实现 "打开文件" 动作，包括创建动作，设置动作属性和定义动作的触发行为。
 
@@ -28,7 +28,7 @@ class ActionOpen:
     """
     打开文件类。
 
-    该类用于创建一个打开文件的动作，该动作可以打开一个文件并将其内容读取到链接文本框。
+    该类用于创建一个打开文件的动作，该动作可以打开一个文件并将其内容读取到链接文本框，或者记录大文件路径供后台逐行读取。
     """
 
     def __init__(self, main_window: QMainWindow, text_input: CodeEditor):
@@ -42,6 +42,8 @@ class ActionOpen:
         """
         self.main_window = main_window
         self.text_input = text_input
+        self.input_file = None
+        self.text_input.textChanged.connect(self.clear_input_file)
 
         self.action_open = QAction(QIcon(get_resource_path('media/icons8-open-26.png')), '打开', self.main_window)
         self.action_open.setShortcut('Ctrl+O')
@@ -59,17 +61,42 @@ class ActionOpen:
         options |= QFileDialog.ReadOnly
         file_name, _ = QFileDialog.getOpenFileName(self.main_window, "打开文件", "", "文本文件 (*.txt);;所有类型 (*)", options=options)
         if file_name:
-            if os.path.getsize(file_name) > MAX_FILE_SIZE:
-                logger.error(f'The file is too large to open: {file_name}')
-                return None
-
-            try:
-                with open(file_name, 'r', encoding='utf-8') as file:
-                    self.text_input.setPlainText(file.read())
-                    return file_name
-            except IOError:
-                logger.error(f'Unable to open file: {file_name}')
-            except UnicodeDecodeError:
-                logger.error(f'Unable to read file: {file_name}')
+            return self.load_file(file_name)
 
         return None
+
+    def load_file(self, file_name: str) -> Optional[str]:
+        """
+        把文件内容读取到链接文本框，大文件只记录路径。
+
+        :param file_name: 文件路径
+        :type file_name: str
+        :rtype: Optional[str]
+        :return: 如果操作成功则返回文件的路径，如果操作失败则返回 None
+        """
+        try:
+            file_size = os.path.getsize(file_name)
+            if file_size > MAX_FILE_SIZE:
+                self.text_input.setPlainText(f'大文件：{file_name}\n大小：{file_size / 1024 / 1024:.1f} MB\n\n文件不会载入文本框，开始运行后将逐行读取解析。修改此处内容可取消。')
+                self.input_file = file_name
+                logger.info(f'The file is too large to show, it will be streamed: {file_name}')
+                return file_name
+
+            with open(file_name, 'r', encoding='utf-8') as file:
+                self.text_input.setPlainText(file.read())
+                return file_name
+        except IOError:
+            logger.error(f'Unable to open file: {file_name}')
+        except UnicodeDecodeError:
+            logger.error(f'Unable to read file: {file_name}')
+
+        return None
+
+    def clear_input_file(self) -> None:
+        """
+        链接文本框内容改变时退出大文件模式。
+
+        :rtype: None
+        :return: 无返回值
+        """
+        self.input_file = None
@@ -1,10 +1,14 @@
 """
-这是一个Python文件，包含两个类：`LineNumberArea` 和 `CodeEditor`。
+这是一个Python文件，包含三个类：`LineNumberArea`、`CodeEditor` 和 `ScrollSync`。
 
 `LineNumberArea` 是一个自定义的QWidget，用于显示行号。这个类与一个QPlainTextEdit实例（在这里是我们的代码编辑器）相关联，并将其作为一个参数传递给构造函数。它还定义了一个`paintEvent`方法，该方法在需要更新行号显示区域的内容时调用。
 
 `CodeEditor` 是一个继承自QPlainTextEdit的类，用于创建一个具有行号显示功能的代码编辑器。它包含一系列方法，用于计算行号区域的宽度，更新行号区域的大小和内容，以及在代码编辑器的大小改变时重新设置行号区域的几何形状。
 
+`CodeEditor` 缓存了行高和数字宽度，只在字体改变时重新计算；行号区域的宽度只在行号位数改变时更新，并且推迟到事件循环空闲时执行，粘贴大量文本期间不会反复调整边距和重新排版。当文档超过 `LARGE_DOCUMENT_LINES` 行时进入大文档模式：关闭撤销记录，并按至少 `LARGE_DOCUMENT_DIGITS` 位数字预留行号宽度；行数降到阈值的一半以下时恢复。设置或粘贴大段文字时，在插入之前就会进入大文档模式。
+
+`ScrollSync` 用于同步两个滚动条。一个滚动条改变后，另一个滚动条不会立即跟随，而是每隔 `SCROLL_SYNC_INTERVAL` 毫秒最多同步一次，连续滚动时两个控件不会每一步都一起重绘。
+
 这个模块主要用于在Qt应用程序中创建一个代码编辑器，该代码编辑器具有行号显示功能。
 
 :author: assassing
@@ -14,9 +18,11 @@
 
 import logging
 
-from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtCore import QEvent, QObject, QRect, Qt, QTimer
 from PyQt5.QtGui import QPainter, QColor
-from PyQt5.QtWidgets import QWidget, QSizePolicy, QPlainTextEdit
+from PyQt5.QtWidgets import QWidget, QSizePolicy, QPlainTextEdit, QScrollBar
+
+from module.settings import LARGE_DOCUMENT_DIGITS, LARGE_DOCUMENT_LINES, SCROLL_SYNC_INTERVAL
 
 logger = logging.getLogger(__name__)
 
@@ -64,11 +70,68 @@ class CodeEditor(QPlainTextEdit):
         :param parent: 父控件，默认为None。
         """
         super().__init__(parent)
+        self.large_document = False
+        self.line_number_width = 0
+        self.update_font_metrics()
         self.lineNumberArea = LineNumberArea(self)
-        self.blockCountChanged.connect(self.updateLineNumberAreaWidth)
+
+        # 合并短时间内的多次行数变化，只更新一次行号区域宽度
+        self.width_timer = QTimer(self)
+        self.width_timer.setSingleShot(True)
+        self.width_timer.timeout.connect(lambda: self.updateLineNumberAreaWidth(0))
+
+        self.blockCountChanged.connect(self.scheduleLineNumberAreaWidth)
         self.updateRequest.connect(self.updateLineNumberArea)
         self.updateLineNumberAreaWidth(0)
 
+    def update_font_metrics(self):
+        """
+        缓存当前字体的行高和数字宽度。
+        """
+        metrics = self.fontMetrics()
+        self.line_height = metrics.height()
+        self.digit_width = metrics.horizontalAdvance('9')
+
+    def changeEvent(self, event):
+        """
+        字体改变时重新缓存字体度量并更新行号区域宽度。
+        :param event: 控件状态改变事件。
+        """
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self.update_font_metrics()
+            self.line_number_width = 0
+            self.updateLineNumberAreaWidth(0)
+
+    def set_large_document(self, enabled: bool):
+        """
+        进入或退出大文档模式。大文档模式关闭撤销记录，并预留足够的行号宽度。
+        :param enabled: 是否进入大文档模式。
+        """
+        if enabled == self.large_document:
+            return
+        self.large_document = enabled
+        self.setUndoRedoEnabled(not enabled)
+        self.scheduleLineNumberAreaWidth(0)
+
+    def setPlainText(self, text: str):
+        """
+        设置全部文字。文字超过 LARGE_DOCUMENT_LINES 行时先进入大文档模式再插入。
+        :param text: 要设置的文字。
+        """
+        if text.count('\n') >= LARGE_DOCUMENT_LINES:
+            self.set_large_document(True)
+        super().setPlainText(text)
+
+    def insertFromMimeData(self, source):
+        """
+        粘贴文字。粘贴后的总行数超过 LARGE_DOCUMENT_LINES 行时先进入大文档模式再插入。
+        :param source: 剪贴板数据。
+        """
+        if source.hasText() and self.blockCount() + source.text().count('\n') >= LARGE_DOCUMENT_LINES:
+            self.set_large_document(True)
+        super().insertFromMimeData(source)
+
     def lineNumberAreaWidth(self) -> int:
         """
         计算行号显示区域的宽度。
@@ -76,14 +139,34 @@ class CodeEditor(QPlainTextEdit):
         :rtype: int
         """
         digits = len(str(max(1, self.blockCount())))
-        space = 3 + self.fontMetrics().horizontalAdvance('9') * digits
-        return space
+        if self.large_document:
+            digits = max(digits, LARGE_DOCUMENT_DIGITS)
+        return 3 + self.digit_width * digits
+
+    def scheduleLineNumberAreaWidth(self, _):
+        """
+        在事件循环空闲时更新行号区域宽度，多次调用只执行一次。
+        """
+        if not self.width_timer.isActive():
+            self.width_timer.start(0)
 
     def updateLineNumberAreaWidth(self, _):
         """
-        更新代码编辑器的视口边距以适应行号显示区域。
+        更新代码编辑器的视口边距以适应行号显示区域。宽度不变时不调整边距，避免重新排版。
         """
-        self.setViewportMargins(self.lineNumberAreaWidth(), 0, 0, 0)
+        block_count = self.blockCount()
+        if block_count >= LARGE_DOCUMENT_LINES:
+            self.set_large_document(True)
+        elif block_count < LARGE_DOCUMENT_LINES // 2:
+            self.set_large_document(False)
+
+        width = self.lineNumberAreaWidth()
+        if width == self.line_number_width:
+            return
+        self.line_number_width = width
+        self.setViewportMargins(width, 0, 0, 0)
+        cr = self.contentsRect()
+        self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), width, cr.height()))
 
     def updateLineNumberArea(self, rect, dy):
         """
@@ -92,8 +175,6 @@ class CodeEditor(QPlainTextEdit):
         :param dy: 垂直滚动距离。
         """
         self.lineNumberArea.scroll(0, dy) if dy else self.lineNumberArea.update(0, rect.y(), self.lineNumberArea.width(), rect.height())
-        if rect.contains(self.viewport().rect()):
-            self.updateLineNumberAreaWidth(0)
 
     def resizeEvent(self, event):
         """
@@ -102,7 +183,7 @@ class CodeEditor(QPlainTextEdit):
         """
         super().resizeEvent(event)
         cr = self.contentsRect()
-        self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), self.lineNumberAreaWidth(), cr.height()))
+        self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), self.line_number_width, cr.height()))
 
     def lineNumberAreaPaintEvent(self, event):
         """
@@ -111,18 +192,72 @@ class CodeEditor(QPlainTextEdit):
         """
         painter = QPainter(self.lineNumberArea)
         painter.fillRect(event.rect(), QColor(240, 240, 240))
+        painter.setPen(Qt.black)
 
         block = self.firstVisibleBlock()
         blockNumber = block.blockNumber()
         top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
         bottom = top + self.blockBoundingRect(block).height()
+        width = self.lineNumberArea.width()
+        line_height = self.line_height
+        rect_top = event.rect().top()
+        rect_bottom = event.rect().bottom()
 
-        while block.isValid() and (top <= event.rect().bottom()):
-            if block.isVisible() and (bottom >= event.rect().top()):
-                number = str(blockNumber + 1)
-                painter.setPen(Qt.black)
-                painter.drawText(0, round(top), self.lineNumberArea.width(), self.fontMetrics().height(), Qt.AlignRight, number)
+        while block.isValid() and (top <= rect_bottom):
+            if block.isVisible() and (bottom >= rect_top):
+                painter.drawText(0, round(top), width, line_height, Qt.AlignRight, str(blockNumber + 1))
             block = block.next()
             top = bottom
             bottom = top + self.blockBoundingRect(block).height()
             blockNumber += 1
+
+
+class ScrollSync(QObject):
+    """
+    滚动条同步类。
+
+    这个类继承自QObject，用于让两个滚动条保持相同的位置，并限制同步的频率。
+    """
+
+    def __init__(self, first: QScrollBar, second: QScrollBar, interval: int = SCROLL_SYNC_INTERVAL):
+        """
+        :param first: 第一个滚动条。
+        :type first: QScrollBar
+        :param second: 第二个滚动条。
+        :type second: QScrollBar
+        :param interval: 两次同步之间的最短间隔，单位是毫秒。
+        :type interval: int
+        """
+        super().__init__(first)
+        self.syncing = False
+        self.source = None
+        self.target = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.apply)
+        first.valueChanged.connect(lambda _: self.schedule(first, second))
+        second.valueChanged.connect(lambda _: self.schedule(second, first))
+
+    def schedule(self, source: QScrollBar, target: QScrollBar):
+        """
+        记录最后移动的滚动条，定时器没有运行时启动定时器。
+        :param source: 移动的滚动条。
+        :param target: 需要跟随的滚动条。
+        """
+        if self.syncing:
+            return
+        self.source = source
+        self.target = target
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def apply(self):
+        """
+        把需要跟随的滚动条移动到最后移动的滚动条的位置。
+        """
+        self.syncing = True
+        try:
+            self.target.setValue(self.source.value())
+        finally:
+            self.syncing = False
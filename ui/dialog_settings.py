@@ -1,13 +1,13 @@
 """
 这是一个Python文件，其中包含一个类 DialogSettings。
 
-类 DialogSettings 是一个设置对话框，用户可以通过这个对话框修改应用的设置，包括账号token和请求间隔时间。该对话框包含两个选项卡："基本" 和 "高级"，以及两个按钮："确定" 和 "取消"。
+类 DialogSettings 是一个设置对话框，用户可以通过这个对话框修改应用的设置，包括账号token、请求间隔时间、并发数和出口代理。该对话框包含两个选项卡："基本" 和 "高级"，以及两个按钮："确定" 和 "取消"。
 
 在 construct_widgets 函数中，构建了选项卡和按钮。
 
-在 construct_basic_tab 函数中，构建了 "基本" 选项卡，其中包含了账号token的输入框。
+在 construct_basic_tab 函数中，构建了 "基本" 选项卡，其中包含了账号token的输入框，可以填写用英文逗号分隔的多个token。
 
-在 construct_advanced_tab 函数中，构建了 "高级" 选项卡，其中包含了请求间隔时间的输入框。
+在 construct_advanced_tab 函数中，构建了 "高级" 选项卡，其中包含了请求间隔时间、并发数和出口代理的输入框。
 
 在 construct_buttons 函数中，构建了 "确定" 和 "取消" 按钮。
 
@@ -28,7 +28,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon, QIntValidator
 from PyQt5.QtWidgets import QDialog, QFormLayout, QLineEdit, QDialogButtonBox, QTabWidget, QWidget, QHBoxLayout
 
-from module import CONFIG_PATH, init_config, write_list_to_file, get_resource_path
+from module import CONFIG_PATH, MAX_CONCURRENCY, init_config, write_list_to_file, get_resource_path
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +50,7 @@ class DialogSettings(QDialog):
 
         self.config_file = CONFIG_PATH
         try:
-            self.user_token, self.user_delay = init_config()
+            self.user_token, self.user_delay, self.user_concurrency, self.user_proxies = init_config()
         except Exception as e:
             logger.error(f"Failed to initialize configuration: {e}")
             return
@@ -85,7 +85,7 @@ class DialogSettings(QDialog):
         self.tab_basic_layout = QFormLayout(self.tab_basic)
 
         self.input_token = QLineEdit(self.user_token)
-        self.input_token.setPlaceholderText("账号认证令牌")
+        self.input_token.setPlaceholderText("账号认证令牌，多个令牌用英文逗号分隔")
 
         self.tab_basic_layout.addRow("账号 token", self.input_token)
 
@@ -103,9 +103,18 @@ class DialogSettings(QDialog):
 
         self.input_delay = QLineEdit(self.user_delay)
         self.input_delay.setValidator(QIntValidator(0, 1000))
-        self.input_delay.setPlaceholderText("每次请求间隔")
+        self.input_delay.setPlaceholderText("初始请求间隔，之后自动调整")
 
-        self.tab_advanced_layout.addRow("请求间隔（毫秒）", self.input_delay)
+        self.input_concurrency = QLineEdit(self.user_concurrency)
+        self.input_concurrency.setValidator(QIntValidator(1, MAX_CONCURRENCY))
+        self.input_concurrency.setPlaceholderText("同时进行的请求数量")
+
+        self.input_proxies = QLineEdit(self.user_proxies)
+        self.input_proxies.setPlaceholderText("HTTP 代理地址，多个代理用英文逗号分隔，留空直接连接")
+
+        self.tab_advanced_layout.addRow("初始请求间隔（毫秒）", self.input_delay)
+        self.tab_advanced_layout.addRow("并发数", self.input_concurrency)
+        self.tab_advanced_layout.addRow("出口代理", self.input_proxies)
 
         self.tab_widget.addTab(self.tab_advanced, "高级")
 
@@ -134,7 +143,7 @@ class DialogSettings(QDialog):
         :rtype: None
         :return: None
         """
-        self.config = [self.input_token.text(), self.input_delay.text()]
+        self.config = [self.input_token.text(), self.input_delay.text(), self.input_concurrency.text(), self.input_proxies.text()]
         try:
             write_list_to_file(self.config_file, self.config)
         except Exception as e:
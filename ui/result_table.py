@@ -0,0 +1,250 @@
+"""
+这是一个Python文件，包含两个类：`ResultTableModel` 和 `ResultTable`。
+
+`ResultTableModel` 是一个继承自QAbstractTableModel的数据模型，解析结果按列保存在 `ResultStore` 中，状态是一个字节的整数枚举。模型有输入链接、文件编号、状态、下载地址和时间五列，显示文字、颜色和提示信息都在视图请求时按行计算，不会为每一行额外保存格式化后的文字或控件。结果由 `append_rows` 批量追加，保存和复制通过 `store.lines` 按行号生成提示信息。
+
+模型支持筛选视图：`set_filter` 指定需要显示的状态后，模型只保存一个行号列表，表格显示的第 N 行对应结果集中的第 `view[N]` 行，结果集本身不会改变，取消筛选即可恢复全部结果。筛选期间新追加的结果如果符合条件，会直接追加到行号列表末尾。
+
+`ResultTable` 是一个继承自QTableView的表格，用于显示解析结果。表格使用固定行高，只绘制可见的行，十万行以上的结果也能流畅滚动。表格按行选择，按 Ctrl+C 复制选中行的提示信息，成功的行即为下载地址，可以直接粘贴到下载软件；没有结果时显示占位提示。
+
+:author: assassing
+:contact: https://github.com/hxz393
+:copyright: Copyright 2023, hxz393. 保留所有权利。
+"""
+
+import logging
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QKeySequence, QPainter
+from PyQt5.QtWidgets import QAbstractItemView, QApplication, QHeaderView, QTableView
+
+from module.format_result import format_result
+from module.result_store import ResultRecord, ResultStatus, ResultStore
+
+logger = logging.getLogger(__name__)
+
+# 输入链接、解析结果、完成时间
+ResultRow = Tuple[str, Optional[str], float]
+
+
+class ResultTableModel(QAbstractTableModel):
+    """
+    解析结果数据模型类。
+
+    这个类继承自QAbstractTableModel，把按列保存的解析结果提供给视图，并在视图请求时计算显示内容。
+    """
+
+    COLUMNS = ('输入链接', '文件编号', '状态', '下载地址', '时间')
+    SUCCESS_BRUSH = QBrush(Qt.darkGreen)
+    FAILURE_BRUSH = QBrush(Qt.darkRed)
+
+    def __init__(self, parent=None):
+        """
+        :param parent: 父对象，默认为None。
+        """
+        super().__init__(parent)
+        self.store = ResultStore()
+        self.view_statuses: Optional[bytes] = None
+        self.view: Optional[List[int]] = None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """
+        返回行数，筛选时为符合条件的行数。
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+        return len(self.store) if self.view is None else len(self.view)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        """
+        返回列数。
+        :rtype: int
+        """
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        返回表头文字，横向为列名，纵向为行号。
+        """
+        if role != Qt.DisplayRole:
+            return None
+        return self.COLUMNS[section] if orientation == Qt.Horizontal else section + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        返回单元格的显示文字、颜色或提示信息。
+        :param index: 单元格位置。
+        :param role: 数据角色。
+        """
+        if not index.isValid():
+            return None
+        record = self.store[self.store_index(index.row())]
+        if role == Qt.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return record.link
+            if column == 1:
+                return record.file
+            if column == 2:
+                return self.status_text(record)
+            if column == 3:
+                return record.url or ''
+            return time.strftime('%H:%M:%S', time.localtime(record.finished_at))
+        if role == Qt.ForegroundRole:
+            return self.SUCCESS_BRUSH if record.status == ResultStatus.OK else self.FAILURE_BRUSH
+        if role == Qt.ToolTipRole:
+            return format_result(record.result, record.link)
+        return None
+
+    @staticmethod
+    def status_text(record: ResultRecord) -> str:
+        """
+        获取状态列的文字。
+        :param record: 单条解析结果。
+        :type record: ResultRecord
+        :return: 成功时为 200，其他情况为错误代码或简短说明。
+        :rtype: str
+        """
+        if record.status == ResultStatus.OK:
+            return '200'
+        if record.status == ResultStatus.FAILED:
+            return '失败'
+        if record.status == ResultStatus.UNSUPPORTED:
+            return '不支持'
+        return record.result
+
+    def append_rows(self, rows: List[ResultRow]) -> None:
+        """
+        在末尾批量追加结果，视图只收到一次插入通知。
+        :param rows: 待追加的结果。
+        """
+        if not rows:
+            return
+        if self.view is None:
+            first = len(self.store)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.store.extend(rows)
+            self.endInsertRows()
+            return
+
+        first = len(self.store)
+        self.store.extend(rows)
+        matched = [index for index in range(first, len(self.store)) if self.store.statuses[index] in self.view_statuses]
+        if matched:
+            self.beginInsertRows(QModelIndex(), len(self.view), len(self.view) + len(matched) - 1)
+            self.view.extend(matched)
+            self.endInsertRows()
+
+    def set_store(self, store: ResultStore) -> None:
+        """
+        替换全部结果，保留当前的筛选条件。
+        :param store: 新的结果集。
+        """
+        self.beginResetModel()
+        self.store = store
+        self.view = None if self.view_statuses is None else self.store.indices(ResultStatus(status) for status in self.view_statuses)
+        self.endResetModel()
+
+    def set_filter(self, statuses: Optional[Iterable[ResultStatus]]) -> None:
+        """
+        只显示指定状态的结果。
+        :param statuses: 需要显示的状态，为 None 时显示全部结果。
+        """
+        self.view_statuses = None if statuses is None else bytes(statuses)
+        self.set_store(self.store)
+
+    def store_index(self, row: int) -> int:
+        """
+        把表格的行号转换成结果集的行号。
+        :param row: 表格的行号。
+        :return: 结果集的行号。
+        :rtype: int
+        """
+        return row if self.view is None else self.view[row]
+
+    def visible_indices(self) -> Sequence[int]:
+        """
+        获取表格中显示的全部行在结果集中的行号。
+        :return: 结果集的行号。
+        :rtype: Sequence[int]
+        """
+        return range(len(self.store)) if self.view is None else self.view
+
+    def clear(self) -> None:
+        """
+        清空全部结果。
+        """
+        self.set_store(ResultStore())
+
+
+class ResultTable(QTableView):
+    """
+    解析结果表格类。
+
+    这个类继承自QTableView，用固定行高显示解析结果，并支持复制选中行。
+    """
+
+    def __init__(self, parent=None):
+        """
+        :param parent: 父控件，默认为None。
+        """
+        super().__init__(parent)
+        self.placeholder_text = ''
+        self.result_model = ResultTableModel(self)
+        self.setModel(self.result_model)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerItem)
+        self.setWordWrap(False)
+        self.setShowGrid(False)
+
+        # 固定行高和列宽，避免按内容计算大小时遍历所有行
+        vertical_header = self.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 4)
+        horizontal_header = self.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.Interactive)
+        horizontal_header.setStretchLastSection(True)
+        for column, width in enumerate((260, 170, 60, 360)):
+            self.setColumnWidth(column, width)
+
+    def setPlaceholderText(self, text: str) -> None:
+        """
+        设置没有结果时显示的占位提示。
+        :param text: 占位提示。
+        """
+        self.placeholder_text = text
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        """
+        绘制表格，没有结果时绘制占位提示。
+        :param event: 绘制事件。
+        """
+        super().paintEvent(event)
+        if self.placeholder_text and not self.result_model.rowCount():
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().placeholderText().color())
+            painter.drawText(self.viewport().rect().adjusted(6, 6, -6, -6), Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, self.placeholder_text)
+
+    def keyPressEvent(self, event):
+        """
+        按下复制快捷键时复制选中行的提示信息，其他按键交给QTableView处理。
+        :param event: 按键事件。
+        """
+        if event.matches(QKeySequence.Copy):
+            self.copy_selection()
+            return
+        super().keyPressEvent(event)
+
+    def copy_selection(self) -> None:
+        """
+        把选中行的提示信息复制到剪贴板，一行一条。
+        """
+        try:
+            row_numbers = [self.result_model.store_index(index.row()) for index in sorted(self.selectionModel().selectedRows())]
+            QApplication.clipboard().setText('\n'.join(self.result_model.store.lines(row_numbers)))
+        except Exception as e:
+            logger.error(f"An error occurred while copying results: {e}")